@@ -0,0 +1,70 @@
+"""Helpers to run a client against a mocked http session so benchmarks
+measure the library's own overhead and nothing of the network.
+"""
+
+import json
+
+import fortnitepy
+
+
+class MockResponse:
+    def __init__(self, status, body):
+        self.status = status
+        self._body = body
+        self.content_length = len(body)
+        self.headers = {
+            'content-type': 'application/json',
+            'content-length': str(len(body)),
+        }
+
+    async def read(self):
+        return self._body
+
+    async def text(self, encoding='utf-8'):
+        return self._body.decode(encoding)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        pass
+
+
+class MockSession:
+    """Answers every request with the result of ``handler(method, url,
+    kwargs)``, which must return a json serializable object.
+    """
+
+    connector_owner = False
+
+    def __init__(self, handler):
+        self.handler = handler
+        self.requests = 0
+
+    def request(self, method, url, **kwargs):
+        self.requests += 1
+        data = self.handler(method, url, kwargs)
+        body = data if isinstance(data, bytes) else json.dumps(data).encode()
+        return MockResponse(200, body)
+
+    async def close(self):
+        pass
+
+
+async def create_client(handler):
+    """Creates a client that is ready to send requests through a
+    :class:`MockSession`. Must be called with a running event loop.
+    """
+    client = fortnitepy.Client(
+        auth=fortnitepy.DeviceAuth(
+            device_id='0' * 32,
+            account_id='1' * 32,
+            secret='secret',
+        ),
+    )
+    await client._async_init()
+    client.auth.access_token = 'token'
+
+    session = MockSession(handler)
+    client.http._HTTPClient__session = session
+    return client, session
@@ -0,0 +1,76 @@
+"""Measures the throughput of fetching the stats of lots of users with
+:meth:`fortnitepy.Client.fetch_multiple_br_stats`.
+
+The accounts and stats services are answered instantly by a mocked
+session, so the result is the time the library itself spends chunking
+the users, sending the requests and joining users to their stats rows.
+
+Usage: ::
+
+    python benchmarks/bulk_stats.py [-n USERS] [-s STATS]
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))  # noqa
+
+from _mock_http import create_client  # noqa
+
+
+def handler(method, url, kwargs):
+    if url.endswith('/account/api/public/account'):
+        return [{'id': user_id, 'displayName': 'User' + user_id[-6:]}
+                for _, user_id in kwargs['params']]
+
+    if url.endswith('/statsproxy/api/statsv2/query'):
+        payload = kwargs['json']
+        stats = {stat: 1 for stat in payload['stats']}
+        return [{
+            'accountId': user_id,
+            'startTime': 0,
+            'endTime': 0,
+            'stats': stats,
+        } for user_id in payload['owners']]
+
+    raise RuntimeError('Unexpected request: {0} {1}'.format(method, url))
+
+
+async def bench(user_ids, stats):
+    client, session = await create_client(handler)
+
+    start = time.perf_counter()
+    result = await client.fetch_multiple_br_stats(user_ids, stats)
+    elapsed = time.perf_counter() - start
+
+    assert len(result) == len(user_ids)
+    assert all(s is not None for s in result.values())
+    return elapsed, session.requests
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('-n', '--users', type=int, default=50000)
+    parser.add_argument('-s', '--stats', type=int, default=40)
+    args = parser.parse_args()
+
+    user_ids = ['{0:032x}'.format(i) for i in range(args.users)]
+    stats = ['br_kills_keyboardmouse_m0_playlist_{0}'.format(i)
+             for i in range(args.stats)]
+
+    elapsed, requests = asyncio.run(bench(user_ids, stats))
+    print('{0} users with {1} stats: {2:.2f}s, {3:.0f} users/s, '
+          '{4} requests'.format(
+              len(user_ids),
+              len(stats),
+              elapsed,
+              len(user_ids) / elapsed,
+              requests
+          ))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,74 @@
+"""Measures the python overhead the library adds to a single http request.
+
+Routes are constructed the way the http methods construct them, and full
+requests are sent through ``HTTPClient.get`` against a mocked session
+that answers instantly. The time measured is therefore spent building
+the route, url and headers, passing the rate limiter, retry and metrics
+bookkeeping and decoding the (tiny) response; none of it is network time.
+
+Usage: ::
+
+    python benchmarks/http_request_overhead.py [-n REQUESTS]
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))  # noqa
+
+from fortnitepy.http import AccountPublicService  # noqa
+
+from _mock_http import create_client  # noqa
+
+
+def bench_routes(ids):
+    start = time.perf_counter()
+    for user_id in ids:
+        AccountPublicService(
+            '/account/api/public/account/{user_id}',
+            user_id=user_id
+        )
+    return time.perf_counter() - start
+
+
+async def bench_requests(ids):
+    client, session = await create_client(lambda *args: b'{}')
+    http = client.http
+
+    start = time.perf_counter()
+    for user_id in ids:
+        await http.get(AccountPublicService(
+            '/account/api/public/account/{user_id}',
+            user_id=user_id
+        ))
+    elapsed = time.perf_counter() - start
+
+    assert session.requests == len(ids)
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('-n', '--requests', type=int, default=20000)
+    args = parser.parse_args()
+
+    # Ids repeat like they do for a bot talking to the same users.
+    ids = ['{0:032x}'.format(i % 1000) for i in range(args.requests)]
+
+    elapsed = bench_routes(ids)
+    print('route construction: {0:.2f}us per route'.format(
+        elapsed / len(ids) * 1e6
+    ))
+
+    elapsed = asyncio.run(bench_requests(ids))
+    print('request overhead: {0:.2f}us per request ({1:.0f} requests/s)'.format(  # noqa
+        elapsed / len(ids) * 1e6,
+        len(ids) / elapsed
+    ))
+
+
+if __name__ == '__main__':
+    main()
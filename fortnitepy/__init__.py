@@ -39,7 +39,7 @@ from .party import (DefaultPartyConfig, DefaultPartyMemberConfig, PartyMember,
                     PartyJoinConfirmation, PartyJoinRequest, SquadAssignment)
 from .presence import Presence, PresenceGameplayStats, PresenceParty
 from .user import (ClientUser, User, BlockedUser, ExternalAuth,
-                   UserSearchEntry, SacSearchEntryUser)
+                   UserSearchEntry, SacSearchEntryUser, UserCache)
 from .stats import StatsV2, StatsCollection
 from .enums import *
 from .errors import *
@@ -47,6 +47,11 @@ from .store import Store, FeaturedStoreItem, DailyStoreItem
 from .news import BattleRoyaleNewsPost
 from .playlist import Playlist
 from .avatar import Avatar
-from .http import HTTPRetryConfig, Route
+from .http import (HTTPRetryConfig, HTTPConnectionPool, HTTPRateLimiter,
+                   HTTPMetrics, RouteMetrics, HTTPResponseCache,
+                   HTTPCircuitBreaker, RequestScheduler,
+                   ChunkedRequestExecutor, Route)
+from .xmpp import (XMPPConnectionSupervisor, XMPPConnectionHealth,
+                   ChatScheduler)
 from .utils import *
 from .profile import *
@@ -24,13 +24,15 @@ SOFTWARE.
 
 import datetime
 import asyncio
+import functools
 import logging
 import time
 
 import aiohttp
 from aioxmpp import JID
 from aiohttp import BaseConnector
-from typing import Iterable, Union, Optional, Any, Awaitable, Callable, Dict, List, Tuple
+from typing import (Iterable, Union, Optional, Any, Awaitable, Callable, Dict,
+                    List, Tuple, AsyncIterator)
 
 from .code import Code
 from .creative import CreativeDiscovery
@@ -39,11 +41,12 @@ from .profile import BattleRoyaleProfile, CommonCoreProfile, SaveTheWorldProfile
 from .errors import (PartyError, HTTPException, NotFound, Forbidden,
                      DuplicateFriendship, FriendshipRequestAlreadySent,
                      MaxFriendshipsExceeded, InviteeMaxFriendshipsExceeded,
-                     InviteeMaxFriendshipRequestsExceeded, PartyIsFull)
-from .xmpp import XMPPClient
-from .http import HTTPClient
+                     InviteeMaxFriendshipRequestsExceeded, PartyIsFull,
+                     ChunkedRequestError)
+from .xmpp import XMPPClient, XMPPConnectionSupervisor
+from .http import HTTPClient, HTTPConnectionPool
 from .user import (ClientUser, User, BlockedUser, SacSearchEntryUser,
-                   UserSearchEntry)
+                   UserSearchEntry, UserCache)
 from .friend import Friend, IncomingPendingFriend, OutgoingPendingFriend
 from .enums import (Platform, Region, UserSearchPlatform, AwayStatus,
                     SeasonStartTimestamp, SeasonEndTimestamp,
@@ -58,7 +61,8 @@ from .presence import Presence
 from .auth import Auth, RefreshTokenAuth
 from .avatar import Avatar
 from .typedefs import MaybeCoro, DatetimeOrTimestamp, StrOrInt
-from .utils import LockEvent, MaybeLock, from_iso, is_display_name
+from .utils import (LockEvent, MaybeLock, WireTrace, from_iso,
+                    is_display_name, JSONCodec)
 
 log = logging.getLogger(__name__)
 
@@ -193,7 +197,9 @@ async def start_multiple(clients: List['BasicClient'], *,
                          error_callback: Optional[MaybeCoro] = None,
                          all_ready_callback: Optional[MaybeCoro] = None,
                          before_start: Optional[Awaitable] = None,
-                         before_close: Optional[Awaitable] = None
+                         before_close: Optional[Awaitable] = None,
+                         http_pool: Optional[HTTPConnectionPool] = None,
+                         xmpp_supervisor: Optional[XMPPConnectionSupervisor] = None  # noqa
                          ) -> None:
     """|coro|
 
@@ -242,6 +248,14 @@ async def start_multiple(clients: List['BasicClient'], *,
         close. This must be a coroutine as all the clients wait to close until
         this callback is finished processing so you can do heavy close stuff
         like closing database connections, sessions etc.
+    http_pool: Optional[:class:`HTTPConnectionPool`]
+        A connection pool shared by all clients that has no connector or
+        pool registered already. This reuses connections across accounts
+        instead of every client opening its own.
+    xmpp_supervisor: Optional[:class:`XMPPConnectionSupervisor`]
+        A supervisor for all clients that has no supervisor or ws connector
+        registered already. Their websocket connections then share a single
+        session and reconnects after an outage are staggered.
 
     Raises
     ------
@@ -295,6 +309,15 @@ async def start_multiple(clients: List['BasicClient'], *,
 
         identifiers.append(identifier)
 
+        if (http_pool is not None and client.http.connector is None
+                and client.http.pool is None):
+            client.http.pool = http_pool
+
+        xmpp = getattr(client, 'xmpp', None)
+        if (xmpp_supervisor is not None and xmpp is not None
+                and xmpp.ws_connector is None and xmpp.supervisor is None):
+            xmpp.supervisor = xmpp_supervisor
+
     await asyncio.gather(*[client.init() for client in clients])
 
     asyncio.ensure_future(all_ready_callback_runner())
@@ -362,7 +385,9 @@ def run_multiple(clients: List['BasicClient'], *,
                  error_callback: Optional[MaybeCoro] = None,
                  all_ready_callback: Optional[MaybeCoro] = None,
                  before_start: Optional[Awaitable] = None,
-                 before_close: Optional[Awaitable] = None
+                 before_close: Optional[Awaitable] = None,
+                 http_pool: Optional[HTTPConnectionPool] = None,
+                 xmpp_supervisor: Optional[XMPPConnectionSupervisor] = None
                  ) -> None:
     """This function sets up a loop and then calls :func:`start_multiple()`
     for you. If you already have a running event loop, you should start
@@ -412,6 +437,14 @@ def run_multiple(clients: List['BasicClient'], *,
         close. This must be a coroutine as all the clients wait to close until
         this callback is finished processing so you can do heavy close stuff
         like closing database connections, sessions etc.
+    http_pool: Optional[:class:`HTTPConnectionPool`]
+        A connection pool shared by all clients that has no connector or
+        pool registered already. This reuses connections across accounts
+        instead of every client opening its own.
+    xmpp_supervisor: Optional[:class:`XMPPConnectionSupervisor`]
+        A supervisor for all clients that has no supervisor or ws connector
+        registered already. Their websocket connections then share a single
+        session and reconnects after an outage are staggered.
 
     Raises
     ------
@@ -432,6 +465,8 @@ def run_multiple(clients: List['BasicClient'], *,
                 all_ready_callback=all_ready_callback,
                 before_start=before_start,
                 before_close=before_close,
+                http_pool=http_pool,
+                xmpp_supervisor=xmpp_supervisor,
             )
         finally:
             await close_multiple(clients)
@@ -467,8 +502,41 @@ class BasicClient:
         authentication methods :ref:`here <authentication>`.
     http_connector: :class:`aiohttp.BaseConnector`
         The connector to use for http connection pooling.
+    http_pool: Optional[:class:`HTTPConnectionPool`]
+        A connection pool to share between multiple clients. Ignored if
+        ``http_connector`` is passed.
     http_retry_config: Optional[:class:`HTTPRetryConfig`]
         The config to use for http retries.
+    http_rate_limiter: Optional[:class:`HTTPRateLimiter`]
+        The rate limiter used to pace http requests. If not specified, a
+        limiter without any known limits is used which only paces
+        endpoints after they have been throttled.
+    graphql_batch_window: Optional[:class:`float`]
+        If set, graphql queries issued within this amount of seconds of
+        each other are merged into a single request. ``None`` disables
+        batching. Defaults to ``None``.
+    graphql_batch_size: :class:`int`
+        The max amount of graphql queries merged into a single request.
+        *Only matters when ``graphql_batch_window`` is set.* Defaults
+        to ``10``.
+    http_metrics: Optional[:class:`HTTPMetrics`]
+        The registry to record per route http metrics to. Pass the same
+        registry to multiple clients to collect metrics for all of them.
+        If not specified, each client gets its own registry available at
+        ``client.http.metrics``.
+    http_cache: Optional[:class:`HTTPResponseCache`]
+        The cache to store responses of slow-changing routes like the item
+        shop, news and timeline in. Pass the same cache to multiple clients
+        to share cached responses between them. ``None`` disables caching.
+        Defaults to ``None``.
+    http_scheduler: Optional[:class:`RequestScheduler`]
+        The scheduler limiting the amount of concurrent requests and
+        ordering waiting requests by their :class:`RequestPriority`.
+        Defaults to ``None`` which means requests are not limited.
+    http_chunk_executor: Optional[:class:`ChunkedRequestExecutor`]
+        The executor running bulk requests, like fetching the stats of lots
+        of users, split into chunks. If not specified, an executor with the
+        default limits is used.
     build: :class:`str`
         The build used by Fortnite.
         Defaults to a valid but maybe outdated value.
@@ -480,6 +548,18 @@ class BasicClient:
         Whether or not the library should cache :class:`User` objects. Disable
         this if you are running a program with lots of users as this could
         potentially take a big hit on the memory usage. Defaults to ``True``.
+    user_cache: Optional[:class:`UserCache`]
+        The cache to store :class:`User` objects in. If not specified, a
+        cache with the default limits is used.
+    json_codec: Optional[:class:`JSONCodec`]
+        The codec used to decode and encode json payloads from http responses,
+        xmpp events, presences and party meta. Defaults to
+        :class:`JSONCodec` which uses the standard library. Pass
+        :class:`OrjsonCodec` to use ``orjson`` instead.
+    wire_trace: Optional[:class:`WireTrace`]
+        The trace to trace sent and received traffic to. If not specified,
+        all trace categories are enabled if the ``fortnitepy.trace`` logger
+        has ``DEBUG`` enabled when the client is created.
 
     Attributes
     ----------
@@ -492,6 +572,8 @@ class BasicClient:
         self.cache_users = kwargs.get('cache_users', True)
         self.build = kwargs.get('build', '++Fortnite+Release-14.10-CL-14288110')  # noqa
         self.os = kwargs.get('os', 'Windows/10.0.17134.1.768.64bit')
+        self.json_codec = kwargs.get('json_codec') or JSONCodec()
+        self.wire_trace = kwargs.get('wire_trace') or WireTrace()
 
         self.kill_other_sessions = True
         self.accept_eula = True
@@ -506,7 +588,15 @@ class BasicClient:
         self.http = HTTPClient(
             self,
             connector=kwargs.get('http_connector'),
+            pool=kwargs.get('http_pool'),
             retry_config=kwargs.get('http_retry_config'),
+            rate_limiter=kwargs.get('http_rate_limiter'),
+            graphql_batch_window=kwargs.get('graphql_batch_window'),
+            graphql_batch_size=kwargs.get('graphql_batch_size', 10),
+            metrics=kwargs.get('http_metrics'),
+            cache=kwargs.get('http_cache'),
+            scheduler=kwargs.get('http_scheduler'),
+            chunk_executor=kwargs.get('http_chunk_executor'),
             proxy=proxy,
             proxy_auth=proxy_auth,
             proxied_endpoints=proxied_endpoints
@@ -515,7 +605,7 @@ class BasicClient:
 
         self._listeners = {}
         self._events = {}
-        self._users = {}
+        self._users = kwargs.get('user_cache') or UserCache()
         self._refresh_times = []
 
         self._exception_future = None
@@ -905,7 +995,9 @@ class BasicClient:
             self._restarting = False
             log.debug('Successully restarted the client.')
 
-    def recover_events(self) -> None:
+    def recover_events(self, *,
+                       refresh_caches: bool = False,
+                       wait_for_close: bool = True) -> None:
         pass
 
     def _set_ready(self) -> None:
@@ -989,25 +1081,68 @@ class BasicClient:
             The user requested. If not found it will return ``None``.
         """
         if cache:
-            for u in self._users.values():
-                try:
-                    if u.display_name is not None:
-                        if u.display_name.casefold() == display_name.casefold():  # noqa
-                            return u
-                except AttributeError:
-                    pass
+            user = self._users.get_by_display_name(display_name)
+            if user is not None:
+                return user
 
-        try:
-            data = await self.http.account_get_by_display_name(display_name)
-        except HTTPException as e:
-            error_code = 'errors.com.epicgames.account.account_not_found'
-            if e.message_code == error_code:
+        async for _, data in self._resolve_display_names((display_name,)):
+            if data is None:
                 return None
-            raise
 
-        if raw:
-            return data
-        return self.store_user(data, try_cache=cache)
+            if raw:
+                return data
+            return self.store_user(data, try_cache=cache)
+
+    async def _resolve_display_names(self, display_names: Iterable[str], *,
+                                     max_concurrency: Optional[int] = None,
+                                     batch_size: int = 10
+                                     ) -> AsyncIterator[Tuple[str, Optional[dict]]]:  # noqa
+        # Yields (display_name, account_data) pairs as they resolve. Names
+        # are deduplicated case-insensitively, account_data is None if no
+        # account has the display name.
+        unique = {}
+        for display_name in display_names:
+            unique.setdefault(display_name.casefold(), display_name)
+
+        if len(unique) <= 1:
+            for display_name in unique.values():
+                try:
+                    data = await self.http.account_get_by_display_name(
+                        display_name
+                    )
+                except HTTPException as e:
+                    error_code = 'errors.com.epicgames.account.account_not_found'  # noqa
+                    if e.message_code != error_code:
+                        raise
+                    data = None
+
+                yield display_name, data
+            return
+
+        # Multiple names are looked up with one graphql request per batch
+        # instead of one request per name.
+        async for batch, results in self.http.chunk_executor.run(
+                'account.display_name',
+                unique.values(),
+                self.http.account_graphql_get_multiple_by_display_name,
+                max_chunk_size=batch_size,
+                max_concurrency=max_concurrency):
+            for display_name, result in zip(batch, results):
+                if result is None:
+                    yield display_name, None
+                    continue
+
+                key = display_name.casefold()
+
+                # Accounts with a matching external display name are
+                # returned as well.
+                for account in result['account']:
+                    name = account.get('displayName')
+                    if name is not None and name.casefold() == key:
+                        yield display_name, account
+                        break
+                else:
+                    yield display_name, None
 
     async def fetch_users_by_display_name(self, display_name: str, *,
                                           raw: bool = False
@@ -1122,6 +1257,8 @@ class BasicClient:
         ------
         HTTPException
             An error occured while requesting user information.
+        ChunkedRequestError
+            Some of the chunks the request was split into failed.
 
         Returns
         -------
@@ -1129,61 +1266,105 @@ class BasicClient:
             Users requested. Only users that are found gets returned.
         """
         _users = []
-        new = []
-        tasks = []
+        try:
+            async for chunk in self.iter_users(users, cache=cache, raw=raw):
+                _users.extend(chunk)
+        except ChunkedRequestError as exc:
+            exc.result = _users
+            raise
+        return _users
 
-        def find_by_display_name(dn):
-            if cache:
-                for u in self._users.values():
-                    try:
-                        if u.display_name is not None:
-                            if u.display_name.casefold() == dn.casefold():
-                                _users.append(u)
-                                return
-                    except AttributeError:
-                        pass
+    async def iter_users(self, users: Iterable[str], *,
+                         cache: bool = False,
+                         raw: bool = False,
+                         max_concurrency: Optional[int] = None
+                         ) -> AsyncIterator[List[User]]:
+        """Fetches multiple users by the given ids/displaynames and yields
+        them in chunks as soon as each chunk has been requested.
 
-            task = self.http.account_get_by_display_name(elem)
-            tasks.append(task)
+        Unlike :meth:`fetch_users()`, not all users have to be held in
+        memory at once and processing can start before the slowest chunk
+        has been received.
+
+        Example usage: ::
+
+            async for users in client.iter_users(user_ids):
+                for user in users:
+                    print(user.display_name)
+
+        Parameters
+        ----------
+        users: Iterable[:class:`str`]
+            An iterable containing ids/displaynames.
+        cache: :class:`bool`
+            If set to True it will try to get the users from the friends or
+            user cache and fall back to an api request if not found. Users
+            found in the cache are yielded first as a single chunk.
+        raw: :class:`bool`
+            If set to True it will yield the data as you would get it from
+            the api request.
+        max_concurrency: Optional[:class:`int`]
+            The max amount of chunks requested at the same time. Defaults
+            to :attr:`ChunkedRequestExecutor.max_concurrency`.
+
+        Raises
+        ------
+        HTTPException
+            An error occured while requesting user information.
+        ChunkedRequestError
+            Some of the chunks the request was split into failed.
+
+        Yields
+        ------
+        List[:class:`User`]
+            A chunk of the users requested. Only users that are found gets
+            yielded.
+        """
+        found = []
+        new = []
+        display_names = []
 
         for elem in users:
             if is_display_name(elem):
-                find_by_display_name(elem)
+                if cache:
+                    u = self._users.get_by_display_name(elem)
+                    if u is not None:
+                        found.append(u)
+                        continue
+
+                display_names.append(elem)
             else:
                 if cache:
                     p = self.get_user(elem)
                     if p:
                         if raw:
-                            _users.append(p.get_raw())
+                            found.append(p.get_raw())
                         else:
-                            _users.append(p)
+                            found.append(p)
                         continue
                 new.append(elem)
 
-        if not _users and not new and not tasks:
-            return []
+        if found:
+            yield found
 
-        if len(tasks) > 0:
-            pfs = await asyncio.gather(*tasks)
-            for account_data in pfs:
+        async for _, account_data in self._resolve_display_names(
+                display_names):
+            if account_data is not None:
                 new.append(account_data['id'])
 
-        chunk_tasks = []
-        chunks = (new[i:i + 100] for i in range(0, len(new), 100))
-        for chunk in chunks:
-            task = self.http.account_get_multiple_by_user_id(chunk)  # noqa
-            chunk_tasks.append(task)
-
-        if len(chunk_tasks) > 0:
-            d = await asyncio.gather(*chunk_tasks)
-            for results in d:
-                for result in results:
-                    if raw:
-                        _users.append(result)
-                    else:
-                        u = self.store_user(result, try_cache=cache)
-                        _users.append(u)
-        return _users
+        async for _, results in self.http.chunk_executor.run(
+                'account',
+                new,
+                self.http.account_get_multiple_by_user_id,
+                max_chunk_size=100,
+                max_concurrency=max_concurrency):
+            if not results:
+                continue
+
+            if raw:
+                yield results
+            else:
+                yield [self.store_user(r, try_cache=cache) for r in results]
 
     async def fetch_user_by_email(self, email, *,
                                   cache: bool = False,
@@ -1320,27 +1501,62 @@ class BasicClient:
         ------
         HTTPException
             An error occured while requesting.
+        ChunkedRequestError
+            Some of the chunks the request was split into failed.
 
         Returns
         -------
         Dict[:class:`str`, :class:`Avatar`]
             A dict containing avatars mapped to their user id.
         """
-        chunk_tasks = []
-        chunks = (users[i:i + 100] for i in range(0, len(users), 100))
-        for chunk in chunks:
-            task = self.http.avatar_get_multiple_by_user_id(chunk)
-            chunk_tasks.append(task)
-
         results = {}
-        if len(chunk_tasks) > 0:
-            d = await asyncio.gather(*chunk_tasks)
-            for chunk_results in d:
-                for avatar_data in chunk_results:
-                    results[avatar_data['accountId']] = Avatar(avatar_data)
-
+        try:
+            async for avatars in self.iter_avatars(users):
+                results.update(avatars)
+        except ChunkedRequestError as exc:
+            exc.result = results
+            raise
         return results
 
+    async def iter_avatars(self, users: List[str], *,
+                           max_concurrency: Optional[int] = None
+                           ) -> AsyncIterator[Dict[str, Avatar]]:
+        """Fetches the avatars of the provided user ids and yields them in
+        chunks as soon as each chunk has been requested.
+
+        .. warning::
+            You can only fetch avatars of friends. That means that the bot has
+            to be friends with the users you are requesting the avatars of.
+
+        Parameters
+        ----------
+        users: List[:class:`str`]
+            A list containing user ids.
+        max_concurrency: Optional[:class:`int`]
+            The max amount of chunks requested at the same time. Defaults
+            to :attr:`ChunkedRequestExecutor.max_concurrency`.
+
+        Raises
+        ------
+        HTTPException
+            An error occured while requesting.
+        ChunkedRequestError
+            Some of the chunks the request was split into failed.
+
+        Yields
+        ------
+        Dict[:class:`str`, :class:`Avatar`]
+            A chunk of avatars mapped to their user id.
+        """
+        async for _, chunk_results in self.http.chunk_executor.run(
+                'avatar',
+                users,
+                self.http.avatar_get_multiple_by_user_id,
+                max_chunk_size=100,
+                max_concurrency=max_concurrency):
+            yield {avatar_data['accountId']: Avatar(avatar_data)
+                   for avatar_data in chunk_results}
+
     async def search_sac_by_slug(self, slug: str) -> List[SacSearchEntryUser]:
         """|coro|
 
@@ -1916,62 +2132,101 @@ class BasicClient:
 
         return StatsV2(*results) if results[0] is not None else None
 
-    async def _multiple_stats_chunk_requester(self, user_ids: List[str], stats: List[str], *,  # noqa
-                                              collection: Optional[str] = None,
-                                              start_time: Optional[DatetimeOrTimestamp] = None,  # noqa
-                                              end_time: Optional[DatetimeOrTimestamp] = None  # noqa
-                                              ) -> List[dict]:
-        chunks = [user_ids[i:i+51] for i in range(0, len(user_ids), 51)]
-        stats_chunks = [stats[i:i+20] for i in range(0, len(stats), 20)]
+    async def _fetch_stats_chunk(self, user_ids: List[str],
+                                 stats: List[str], *,
+                                 collection: Optional[str] = None,
+                                 start_time: Optional[int] = None,
+                                 end_time: Optional[int] = None
+                                 ) -> List[dict]:
+        # A collection is requested without any explicit stats.
+        stats_chunks = ([stats[i:i+20] for i in range(0, len(stats), 20)]
+                        or [stats])
+
+        results = await asyncio.gather(*(
+            self.http.stats_get_multiple_v2(
+                user_ids,
+                stats_chunk,
+                category=collection,
+                start_time=start_time,
+                end_time=end_time
+            )
+            for stats_chunk in stats_chunks
+        ))
+        return [item for sub in results for item in sub]
 
-        tasks = []
-        for chunk in chunks:
-            for stats_chunk in stats_chunks:
-                tasks.append(self.http.stats_get_multiple_v2(
-                    chunk,
-                    stats_chunk,
-                    category=collection,
-                    start_time=start_time,
-                    end_time=end_time
-                ))
+    async def _iter_stats_chunks(self, chunk_requester: Callable[..., Awaitable],  # noqa
+                                 user_ids: List[str],
+                                 max_concurrency: Optional[int],
+                                 **kwargs: Any) -> AsyncIterator[Any]:
+        async for _, result in self.http.chunk_executor.run(
+                'stats',
+                user_ids,
+                functools.partial(chunk_requester, **kwargs),
+                max_chunk_size=51,
+                max_concurrency=max_concurrency):
+            yield result
+
+    async def _fetch_br_stats_chunk(self, user_ids: List[str],
+                                    stats: List[str], *,
+                                    cls: _StatsBase,
+                                    **kwargs: Any
+                                    ) -> Dict[str, Optional[_StatsBase]]:
+        users, data = await asyncio.gather(
+            self.fetch_users(user_ids, cache=True),
+            self._fetch_stats_chunk(user_ids, stats, **kwargs),
+        )
 
-        results = await asyncio.gather(*tasks)
-        return [item for sub in results for item in sub]
+        users_by_id = {user.id: user for user in users}
 
-    async def _fetch_multiple_br_stats(self, cls: _StatsBase,
-                                       user_ids: List[str],
-                                       stats: List[str],
-                                       *,
-                                       collection: Optional[str] = None,  # noqa
-                                       start_time: Optional[DatetimeOrTimestamp] = None,  # noqa
-                                       end_time: Optional[DatetimeOrTimestamp] = None,  # noqa
-                                       ) -> Dict[str, StatsV2]:
+        res = {}
+        for udata in data:
+            user_id = udata['accountId']
+
+            # Rows of the same user from different stat chunks are merged.
+            existing = res.get(user_id)
+            if existing is not None:
+                existing.raw['stats'].update(udata['stats'])
+                continue
+
+            user = users_by_id.get(user_id)
+            res[user_id] = cls(user, udata) if user is not None else None
+        return res
+
+    async def _iter_multiple_br_stats(self, cls: _StatsBase,
+                                      user_ids: List[str],
+                                      stats: List[str],
+                                      *,
+                                      collection: Optional[str] = None,  # noqa
+                                      start_time: Optional[DatetimeOrTimestamp] = None,  # noqa
+                                      end_time: Optional[DatetimeOrTimestamp] = None,  # noqa
+                                      max_concurrency: Optional[int] = None
+                                      ) -> AsyncIterator[Dict[str, Optional[_StatsBase]]]:  # noqa
         start_time, end_time = self._process_stats_times(start_time, end_time)
 
-        tasks = [
-            self.fetch_users(user_ids, cache=True),
-            self._multiple_stats_chunk_requester(
+        async for res in self._iter_stats_chunks(
+                self._fetch_br_stats_chunk,
                 user_ids,
-                stats,
+                max_concurrency,
+                stats=stats,
+                cls=cls,
                 collection=collection,
                 start_time=start_time,
-                end_time=end_time
-            )
-        ]
-        results = await asyncio.gather(*tasks)
-        if len(results[0]) > 0 and isinstance(results[0][0], dict):
-            results = results[::-1]
+                end_time=end_time):
+            yield res
 
+    async def _fetch_multiple_br_stats(self, cls: _StatsBase,
+                                       user_ids: List[str],
+                                       stats: List[str],
+                                       **kwargs: Any
+                                       ) -> Dict[str, Optional[_StatsBase]]:
         res = {}
-        for udata in results[1]:
-            if udata['accountId'] in res and res[udata['accountId']] is not None:  # noqa
-                res[udata['accountId']].raw['stats'].update(udata['stats'])
-                continue
-
-            r = [x for x in results[0] if x.id == udata['accountId']]
-            user = r[0] if len(r) != 0 else None
-            res[udata['accountId']] = (cls(user, udata)
-                                       if user is not None else None)
+        try:
+            async for chunk in self._iter_multiple_br_stats(cls, user_ids,
+                                                            stats, **kwargs):
+                res.update(chunk)
+        except ChunkedRequestError as exc:
+            exc.result = res
+            raise
         return res
 
     async def fetch_multiple_br_stats(self, user_ids: List[str],
@@ -2046,6 +2301,8 @@ class BasicClient:
         ------
         HTTPException
             An error occured while requesting.
+        ChunkedRequestError
+            Some of the chunks the request was split into failed.
 
         Returns
         -------
@@ -2070,6 +2327,65 @@ class BasicClient:
         )
         return res
 
+    async def iter_multiple_br_stats(self, user_ids: List[str],
+                                     stats: List[str],
+                                     *,
+                                     start_time: Optional[DatetimeOrTimestamp] = None,  # noqa
+                                     end_time: Optional[DatetimeOrTimestamp] = None,  # noqa
+                                     max_concurrency: Optional[int] = None
+                                     ) -> AsyncIterator[Dict[str, Optional[StatsV2]]]:  # noqa
+        """Same as :meth:`fetch_multiple_br_stats()` but yields the stats
+        in chunks as soon as each chunk has been requested. Use this when
+        requesting the stats of lots of users so they don't all have to be
+        held in memory at once.
+
+        Example usage: ::
+
+            async for chunk in client.iter_multiple_br_stats(user_ids, stats):
+                for user_id, res in chunk.items():
+                    print(user_id, res)
+
+        Parameters
+        ----------
+        user_ids: List[:class:`str`]
+            A list of ids you are requesting the stats for.
+        stats: List[:class:`str`]
+            A list of stats to get for the users. Use
+            :meth:`StatsV2.create_stat` to create the stats.
+        start_time: Optional[Union[:class:`int`, :class:`datetime.datetime`, :class:`SeasonStartTimestamp`]]
+            The UTC start time of the time period to get stats from.
+            *Must be seconds since epoch, :class:`datetime.datetime` or a constant from SeasonEndTimestamp*
+            *Defaults to None*
+        end_time: Optional[Union[:class:`int`, :class:`datetime.datetime`, :class:`SeasonEndTimestamp`]]
+            The UTC end time of the time period to get stats from.
+            *Must be seconds since epoch, :class:`datetime.datetime` or a constant from SeasonEndTimestamp*
+            *Defaults to None*
+        max_concurrency: Optional[:class:`int`]
+            The max amount of chunks requested at the same time. Defaults
+            to :attr:`ChunkedRequestExecutor.max_concurrency`.
+
+        Raises
+        ------
+        HTTPException
+            An error occured while requesting.
+        ChunkedRequestError
+            Some of the chunks the request was split into failed.
+
+        Yields
+        ------
+        Dict[:class:`str`, Optional[:class:`StatsV2`]]
+            A chunk of the mapping described in
+            :meth:`fetch_multiple_br_stats()`.
+        """  # noqa
+        async for chunk in self._iter_multiple_br_stats(
+                cls=StatsV2,
+                user_ids=user_ids,
+                stats=stats,
+                start_time=start_time,
+                end_time=end_time,
+                max_concurrency=max_concurrency):
+            yield chunk
+
     async def fetch_multiple_br_stats_collections(self, user_ids: List[str],
                                                   collection: Optional[StatsCollectionType] = None,  # noqa
                                                   *,
@@ -2100,6 +2416,8 @@ class BasicClient:
         ------
         HTTPException
             An error occured while requesting.
+        ChunkedRequestError
+            Some of the chunks the request was split into failed.
 
         Returns
         -------
@@ -2125,6 +2443,59 @@ class BasicClient:
         )
         return res
 
+    async def iter_multiple_br_stats_collections(self, user_ids: List[str],
+                                                 collection: Optional[StatsCollectionType] = None,  # noqa
+                                                 *,
+                                                 start_time: Optional[DatetimeOrTimestamp] = None,  # noqa
+                                                 end_time: Optional[DatetimeOrTimestamp] = None,  # noqa
+                                                 max_concurrency: Optional[int] = None
+                                                 ) -> AsyncIterator[Dict[str, Optional[StatsCollection]]]:  # noqa
+        """Same as :meth:`fetch_multiple_br_stats_collections()` but yields
+        the stats collections in chunks as soon as each chunk has been
+        requested.
+
+        Parameters
+        ----------
+        user_ids: List[:class:`str`]
+            A list of ids you are requesting the stats for.
+        collection: :class:`StatsCollectionType`
+            The collection to receive. Collections are predefined
+            stats that it attempts to request.
+        start_time: Optional[Union[:class:`int`, :class:`datetime.datetime`, :class:`SeasonStartTimestamp`]]
+            The UTC start time of the time period to get stats from.
+            *Must be seconds since epoch, :class:`datetime.datetime` or a constant from SeasonEndTimestamp*
+            *Defaults to None*
+        end_time: Optional[Union[:class:`int`, :class:`datetime.datetime`, :class:`SeasonEndTimestamp`]]
+            The UTC end time of the time period to get stats from.
+            *Must be seconds since epoch, :class:`datetime.datetime` or a constant from SeasonEndTimestamp*
+            *Defaults to None*
+        max_concurrency: Optional[:class:`int`]
+            The max amount of chunks requested at the same time. Defaults
+            to :attr:`ChunkedRequestExecutor.max_concurrency`.
+
+        Raises
+        ------
+        HTTPException
+            An error occured while requesting.
+        ChunkedRequestError
+            Some of the chunks the request was split into failed.
+
+        Yields
+        ------
+        Dict[:class:`str`, Optional[:class:`StatsCollection`]]
+            A chunk of the mapping described in
+            :meth:`fetch_multiple_br_stats_collections()`.
+        """  # noqa
+        async for chunk in self._iter_multiple_br_stats(
+                cls=StatsCollection,
+                user_ids=user_ids,
+                stats=[],
+                collection=collection.value,
+                start_time=start_time,
+                end_time=end_time,
+                max_concurrency=max_concurrency):
+            yield chunk
+
     async def fetch_multiple_battlepass_levels(self,
                                                users: List[str],
                                                season: int,
@@ -2161,6 +2532,8 @@ class BasicClient:
         ------
         HTTPException
             An error occured while requesting.
+        ChunkedRequestError
+            Some of the chunks the request was split into failed.
 
         Returns
         -------
@@ -2182,6 +2555,62 @@ class BasicClient:
                 the client therefore does not have permissions to requests
                 their stats.
         """  # noqa
+        results = {}
+        try:
+            async for chunk in self.iter_multiple_battlepass_levels(
+                    users,
+                    season,
+                    start_time=start_time,
+                    end_time=end_time):
+                results.update(chunk)
+        except ChunkedRequestError as exc:
+            exc.result = results
+            raise
+        return results
+
+    async def iter_multiple_battlepass_levels(self,
+                                              users: List[str],
+                                              season: int,
+                                              *,
+                                              start_time: Optional[DatetimeOrTimestamp] = None,  # noqa
+                                              end_time: Optional[DatetimeOrTimestamp] = None,  # noqa
+                                              max_concurrency: Optional[int] = None
+                                              ) -> AsyncIterator[Dict[str, float]]:  # noqa
+        """Same as :meth:`fetch_multiple_battlepass_levels()` but yields the
+        battlepass levels in chunks as soon as each chunk has been
+        requested.
+
+        Parameters
+        ----------
+        users: List[:class:`str`]
+            List of user ids.
+        season: :class:`int`
+            The season number to request the battlepass levels for.
+        start_time: Optional[Union[:class:`int`, :class:`datetime.datetime`, :class:`SeasonStartTimestamp`]]
+            The UTC start time of the window to get the battlepass level from.
+            *Must be seconds since epoch, :class:`datetime.datetime` or a constant from SeasonEndTimestamp*
+            *Defaults to None*
+        end_time: Optional[Union[:class:`int`, :class:`datetime.datetime`, :class:`SeasonEndTimestamp`]]
+            The UTC end time of the window to get the battlepass level from.
+            *Must be seconds since epoch, :class:`datetime.datetime` or a constant from SeasonEndTimestamp*
+            *Defaults to None*
+        max_concurrency: Optional[:class:`int`]
+            The max amount of chunks requested at the same time. Defaults
+            to :attr:`ChunkedRequestExecutor.max_concurrency`.
+
+        Raises
+        ------
+        HTTPException
+            An error occured while requesting.
+        ChunkedRequestError
+            Some of the chunks the request was split into failed.
+
+        Yields
+        ------
+        Dict[:class:`str`, Optional[:class:`float`]]
+            A chunk of the mapping described in
+            :meth:`fetch_multiple_battlepass_levels()`.
+        """  # noqa
         start_time, end_time = self._process_stats_times(start_time, end_time)
 
         if end_time is not None:
@@ -2199,20 +2628,20 @@ class BasicClient:
         else:
             stats = ('s{0}_social_bp_level'.format(season),)
 
-        data = await self._multiple_stats_chunk_requester(
-            users,
-            stats,
-            start_time=start_time,
-            end_time=end_time
-        )
-
         def get_stat(user_data):
             for stat in stats:
                 value = user_data.get(stat)
                 if value is not None:
                     return value / 100
 
-        return {e['accountId']: get_stat(e['stats']) for e in data}
+        async for data in self._iter_stats_chunks(
+                self._fetch_stats_chunk,
+                users,
+                max_concurrency,
+                stats=stats,
+                start_time=start_time,
+                end_time=end_time):
+            yield {e['accountId']: get_stat(e['stats']) for e in data}
 
     async def fetch_battlepass_level(self, user_id: str, *,
                                      season: int,
@@ -2622,9 +3051,28 @@ class Client(BasicClient):
         :ref:`here <authentication>`.
     http_connector: :class:`aiohttp.BaseConnector`
         The connector to use for http connection pooling.
+    http_pool: Optional[:class:`HTTPConnectionPool`]
+        A connection pool to share between multiple clients. Ignored if
+        ``http_connector`` is passed.
     ws_connector: :class:`aiohttp.BaseConnector`
         The connector to use for websocket connection pooling. This could be
         the same as the above connector.
+    xmpp_supervisor: Optional[:class:`XMPPConnectionSupervisor`]
+        A supervisor to share between multiple clients. Their websocket
+        connections then share a single session and reconnects after an
+        outage are staggered. Ignored if ``ws_connector`` is passed.
+    xmpp_keepalive_interval: :class:`float`
+        The amount of seconds the xmpp connection can be idle before a
+        keepalive ping is sent. No pings are sent while data is received.
+        Defaults to ``30``.
+    xmpp_keepalive_timeout: :class:`float`
+        The amount of seconds to wait for a keepalive ping reply. If no
+        reply or any other data is received in this time, the connection
+        is considered dead and the client reconnects. Defaults to ``10``.
+    chat_scheduler: Optional[:class:`ChatScheduler`]
+        The scheduler pacing the party and friend messages sent by the
+        client. If not specified, a scheduler with the default rates is
+        used.
     status: :class:`str`
         The status you want the client to send with its presence to friends.
         Defaults to: ``Battle Royale Lobby - {party playercount} / {party max playercount}``
@@ -2655,6 +3103,36 @@ class Client(BasicClient):
         the client will use the default values specified in the data class.
     http_retry_config: Optional[:class:`HTTPRetryConfig`]
         The config to use for http retries.
+    http_rate_limiter: Optional[:class:`HTTPRateLimiter`]
+        The rate limiter used to pace http requests. If not specified, a
+        limiter without any known limits is used which only paces
+        endpoints after they have been throttled.
+    graphql_batch_window: Optional[:class:`float`]
+        If set, graphql queries issued within this amount of seconds of
+        each other are merged into a single request. ``None`` disables
+        batching. Defaults to ``None``.
+    graphql_batch_size: :class:`int`
+        The max amount of graphql queries merged into a single request.
+        *Only matters when ``graphql_batch_window`` is set.* Defaults
+        to ``10``.
+    http_metrics: Optional[:class:`HTTPMetrics`]
+        The registry to record per route http metrics to. Pass the same
+        registry to multiple clients to collect metrics for all of them.
+        If not specified, each client gets its own registry available at
+        ``client.http.metrics``.
+    http_cache: Optional[:class:`HTTPResponseCache`]
+        The cache to store responses of slow-changing routes like the item
+        shop, news and timeline in. Pass the same cache to multiple clients
+        to share cached responses between them. ``None`` disables caching.
+        Defaults to ``None``.
+    http_scheduler: Optional[:class:`RequestScheduler`]
+        The scheduler limiting the amount of concurrent requests and
+        ordering waiting requests by their :class:`RequestPriority`.
+        Defaults to ``None`` which means requests are not limited.
+    http_chunk_executor: Optional[:class:`ChunkedRequestExecutor`]
+        The executor running bulk requests, like fetching the stats of lots
+        of users, split into chunks. If not specified, an executor with the
+        default limits is used.
     build: :class:`str`
         The build used by Fortnite.
         Defaults to a valid but maybe outdated value.
@@ -2672,6 +3150,18 @@ class Client(BasicClient):
         Whether or not the library should cache :class:`User` objects. Disable
         this if you are running a program with lots of users as this could
         potentially take a big hit on the memory usage. Defaults to ``True``.
+    user_cache: Optional[:class:`UserCache`]
+        The cache to store :class:`User` objects in. If not specified, a
+        cache with the default limits is used.
+    json_codec: Optional[:class:`JSONCodec`]
+        The codec used to decode and encode json payloads from http responses,
+        xmpp events, presences and party meta. Defaults to
+        :class:`JSONCodec` which uses the standard library. Pass
+        :class:`OrjsonCodec` to use ``orjson`` instead.
+    wire_trace: Optional[:class:`WireTrace`]
+        The trace to trace sent and received traffic to. If not specified,
+        all trace categories are enabled if the ``fortnitepy.trace`` logger
+        has ``DEBUG`` enabled when the client is created.
     fetch_user_data_in_events: :class:`bool`
         Whether or not user data should be fetched in event processing. Disabling
         this might be useful for larger applications that deals with
@@ -2724,7 +3214,18 @@ class Client(BasicClient):
 
         proxy: Optional[str] = kwargs.pop('proxy', None)
         proxy_auth: Optional[aiohttp.BasicAuth] = kwargs.pop('proxy_auth', None)
-        self.xmpp = XMPPClient(self, proxy=proxy, proxy_auth=proxy_auth, ws_connector=kwargs.get('ws_connector'))
+        ws_connector = kwargs.get('ws_connector')
+        self.xmpp = XMPPClient(
+            self,
+            proxy=proxy,
+            proxy_auth=proxy_auth,
+            ws_connector=ws_connector,
+            supervisor=(kwargs.get('xmpp_supervisor')
+                        if ws_connector is None else None),
+            keepalive_interval=kwargs.get('xmpp_keepalive_interval', 30),
+            keepalive_timeout=kwargs.get('xmpp_keepalive_timeout', 10),
+            chat_scheduler=kwargs.get('chat_scheduler')
+        )
         self.party = None
 
         self._listeners = {}
@@ -2880,7 +3381,7 @@ class Client(BasicClient):
         """List[:class:`Presence`]: A list of the last presences from
         currently online friends.
         """
-        return list(self._presences.values())
+        return [self.get_presence(user_id) for user_id in self._presences]
 
     def _check_party_confirmation(self) -> None:
         k = 'party_member_confirm'
@@ -2959,8 +3460,13 @@ class Client(BasicClient):
             priority=priority,
         )
 
-    def recover_events(self) -> asyncio.Task:
-        return asyncio.create_task(self._recover_events())
+    def recover_events(self, *,
+                       refresh_caches: bool = False,
+                       wait_for_close: bool = True) -> asyncio.Task:
+        return asyncio.create_task(self._recover_events(
+            refresh_caches=refresh_caches,
+            wait_for_close=wait_for_close,
+        ))
 
     async def _recover_events(self, *,
                               refresh_caches: bool = False,
@@ -2968,32 +3474,150 @@ class Client(BasicClient):
         if wait_for_close:
             await self.wait_for('xmpp_session_close')
 
-        pre_friends = self.friends
-        pre_pending = self.pending_friends
+        pre_friends = dict(self._friends)
+        pre_pending = dict(self._pending_friends)
         await self.wait_for('xmpp_session_establish')
 
         if refresh_caches:
-            await self.refresh_caches()
+            await self._refresh_caches_incremental()
+
+        friends = self._friends
+        pending_friends = self._pending_friends
 
-        for friend in pre_friends:
-            if friend not in self._friends.values():
+        for user_id, friend in pre_friends.items():
+            if user_id not in friends:
                 self.dispatch_event('friend_remove', friend)
 
-        added_friends = []
-        for friend in self._friends.values():
-            if friend not in pre_friends:
-                added_friends.append(friend)
+        for user_id, friend in friends.items():
+            if user_id not in pre_friends:
                 self.dispatch_event('friend_add', friend)
 
-        for pending in pre_pending:
-            if (pending not in self._pending_friends.values()
-                    and pending not in added_friends):
+        for user_id, pending in pre_pending.items():
+            if user_id not in pending_friends and user_id not in friends:
                 self.dispatch_event('friend_request_abort', pending)
 
-        for pending in self._pending_friends.values():
-            if pending not in pre_pending:
+        for user_id, pending in pending_friends.items():
+            if user_id not in pre_pending:
                 self.dispatch_event('friend_request', pending)
 
+    async def _refresh_caches_incremental(self, priority: int = 0) -> None:
+        # Unlike refresh_caches(), this diffs the refetched state against
+        # the current caches so only entries that changed while the stream
+        # was down are touched and only unknown accounts are looked up.
+        tasks = (
+            self.http.friends_get_all(
+                include_pending=True,
+                priority=priority
+            ),
+            self.http.friends_get_summary(priority=priority),
+            self.http.presence_get_last_online(priority=priority),
+        )
+        raw_friends, raw_summary, raw_presences = await asyncio.gather(*tasks)
+
+        accepted = {}
+        incoming = {}
+        outgoing = {}
+        for friend in raw_friends:
+            if friend['status'] == 'ACCEPTED':
+                accepted[friend['accountId']] = friend
+            elif friend['status'] == 'PENDING':
+                if friend['direction'] == 'INBOUND':
+                    incoming[friend['accountId']] = friend
+                else:
+                    outgoing[friend['accountId']] = friend
+
+        blocked = {d['accountId']: d for d in raw_summary['blocklist']}
+
+        friends = self._friends
+        pending_friends = self._pending_friends
+        blocked_users = self._blocked_users
+
+        def is_stale_pending(user_id, pending):
+            if pending.incoming:
+                return user_id not in incoming
+            return user_id not in outgoing
+
+        # Keep the old objects around until the new ones are built so their
+        # user data can be reused instead of refetched.
+        known = {**blocked_users, **pending_friends, **friends}
+
+        for user_id in [u for u in friends if u not in accepted]:
+            del friends[user_id]
+        for user_id in [u for u, p in pending_friends.items()
+                        if is_stale_pending(u, p)]:
+            del pending_friends[user_id]
+        for user_id in [u for u in blocked_users if u not in blocked]:
+            del blocked_users[user_id]
+
+        missing = [
+            *(u for u in accepted if u not in friends),
+            *(u for u in incoming if u not in pending_friends),
+            *(u for u in outgoing if u not in pending_friends),
+            *(u for u in blocked if u not in blocked_users),
+        ]
+
+        users = {}
+        to_fetch = []
+        for user_id in missing:
+            user = known.get(user_id) or self.get_user(user_id)
+            if user is not None:
+                users[user_id] = user.get_raw()
+            else:
+                to_fetch.append(user_id)
+
+        users.update(await self._fetch_accounts_for_caches(
+            to_fetch,
+            priority=priority
+        ))
+
+        def build(raw):
+            try:
+                data = users[raw['accountId']]
+            except KeyError:
+                return None
+            return {**data, **raw}
+
+        for user_id, raw in accepted.items():
+            if user_id not in friends:
+                data = build(raw)
+                if data is not None:
+                    self.store_friend(data, try_cache=False)
+
+        for user_id, raw in incoming.items():
+            if user_id not in pending_friends:
+                data = build(raw)
+                if data is not None:
+                    self.store_incoming_pending_friend(data, try_cache=False)
+
+        for user_id, raw in outgoing.items():
+            if user_id not in pending_friends:
+                data = build(raw)
+                if data is not None:
+                    self.store_outgoing_pending_friend(data, try_cache=False)
+
+        for user_id in blocked:
+            if user_id not in blocked_users:
+                user = users.get(user_id)
+                if user is not None:
+                    self.store_blocked_user(user, try_cache=False)
+
+        for data in raw_summary['friends']:
+            friend = friends.get(data['accountId'])
+            if friend is not None:
+                friend._update_summary(data)
+
+        for user_id, data in raw_presences.items():
+            friend = friends.get(user_id)
+            if friend is not None:
+                try:
+                    value = data[0]['last_online']
+                except (IndexError, KeyError):
+                    value = None
+
+                friend._update_last_logout(
+                    from_iso(value) if value is not None else None
+                )
+
     def construct_party(self, data: dict, *,
                         cls: Optional[ClientParty] = None) -> ClientParty:
         clazz = cls or self.default_party_config.cls
@@ -3036,6 +3660,31 @@ class Client(BasicClient):
 
         await self._create_party(priority=priority)
 
+    async def _fetch_accounts_for_caches(self, user_ids: List[str], *,
+                                         priority: int = 0) -> Dict[str, dict]:
+        users = {}
+        request = functools.partial(
+            self.http.account_get_multiple_by_user_id,
+            priority=priority
+        )
+
+        try:
+            async for _, results in self.http.chunk_executor.run(
+                    'account',
+                    user_ids,
+                    request,
+                    max_chunk_size=100):
+                for user in results:
+                    users[user['id']] = user
+        except ChunkedRequestError as exc:
+            # Entries without account data are skipped rather than
+            # failing the whole refresh.
+            log.warning('Failed to fetch account data for %s users: %r',
+                        sum(len(chunk) for chunk, _ in exc.failed),
+                        exc.failed[0][1])
+
+        return users
+
     async def refresh_caches(self, priority: int = 0) -> None:
         self._friends.clear()
         self._pending_friends.clear()
@@ -3052,24 +3701,7 @@ class Client(BasicClient):
         raw_friends, raw_summary, raw_presences = await asyncio.gather(*tasks)
 
         ids = [r['accountId'] for r in raw_friends + raw_summary['blocklist']]
-        chunks = (ids[i:i + 100] for i in range(0, len(ids), 100))
-
-        users = {}
-        tasks = [
-            self.http.account_get_multiple_by_user_id(
-                chunk,
-                priority=priority
-            )
-            for chunk in chunks
-        ]
-        if tasks:
-            done = await asyncio.gather(*tasks)
-        else:
-            done = []
-
-        for results in done:
-            for user in results:
-                users[user['id']] = user
+        users = await self._fetch_accounts_for_caches(ids, priority=priority)
 
         # TODO: Add method for fetching friends and other stuff
 
@@ -3310,7 +3942,23 @@ class Client(BasicClient):
         Optional[:class:`Presence`]
             The presence if found, else ``None``
         """
-        return self._presences.get(user_id)
+        pres = self._presences.get(user_id)
+
+        # Presences received while nothing was listening for them are
+        # stored raw and only turned into Presence objects when needed.
+        if pres.__class__ is tuple:
+            platform, available, away, data, received_at = pres
+            pres = self._presences[user_id] = Presence(
+                self,
+                user_id,
+                platform,
+                available,
+                away,
+                data,
+                received_at=received_at
+            )
+
+        return pres
 
     def has_friend(self, user_id: str) -> bool:
         """Checks if the client is friends with the given user id.
@@ -3405,18 +4053,38 @@ class Client(BasicClient):
 
         if data['current']:
             party_data = data['current'][0]
+            old_party = self.party
             async with self._join_party_lock:
                 try:
-                    await self._join_party(
+                    party = await self._join_party(
                         party_data,
                         event='party_member_reconnect'
                     )
                 except Exception:
                     await self._create_party(acquire=False)
                     raise
+
+            if old_party is not None and old_party.id == party.id:
+                self._dispatch_missed_member_events(old_party, party)
         else:
             await self._create_party()
 
+    def _dispatch_missed_member_events(self, old_party: ClientParty,
+                                       party: ClientParty) -> None:
+        # Membership notifications sent while the stream was down are
+        # lost, so synthesize them from the difference between the party
+        # we had and the one we just reconnected to.
+        old_members = old_party._members
+        members = party._members
+
+        for user_id, member in old_members.items():
+            if user_id not in members and user_id != self.user.id:
+                self.dispatch_event('party_member_leave', member)
+
+        for user_id, member in members.items():
+            if user_id not in old_members and user_id != self.user.id:
+                self.dispatch_event('party_member_join', member)
+
     async def _create_party(self,
                             config: Optional[dict] = None,
                             acquire: bool = True,
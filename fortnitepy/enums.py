@@ -278,6 +278,12 @@ class VBucksPlatform(Enum):
     SHARED = 'Shared'
 
 
+class RequestPriority(Enum):
+    INTERACTIVE = 0
+    DEFAULT = 1
+    BULK = 2
+
+
 class CosmeticType(Enum):
     OUTFIT = 'AthenaCharacter'
     BACKPACK = 'AthenaBackpack'
@@ -25,7 +25,7 @@ SOFTWARE.
 """
 
 from aiohttp import ClientResponse
-from typing import Union, TYPE_CHECKING
+from typing import Any, Union, TYPE_CHECKING
 
 if TYPE_CHECKING:
     from .http import Route  # noqa
@@ -146,6 +146,31 @@ class InvalidOffer(FortniteException):
     pass
 
 
+class ServiceUnavailable(FortniteException):
+    """This exception is raised when a request is not sent because the
+    circuit breaker of the service it was meant for is open, meaning the
+    service has been failing repeatedly.
+
+    Attributes
+    ----------
+    base: :class:`str`
+        The base url of the unavailable service.
+    retry_after: :class:`float`
+        The amount of seconds until the service will be tried again.
+    """
+
+    def __init__(self, base: str, retry_after: float) -> None:
+        self.base = base
+        self.retry_after = retry_after
+
+        super().__init__(
+            '{0} is unavailable. Retrying in {1:.2f}s.'.format(
+                base,
+                retry_after
+            )
+        )
+
+
 class ValidationFailure(FortniteException):
     """Represents a validation failure returned.
 
@@ -242,3 +267,50 @@ class HTTPException(FortniteException):
         )
 
         super().__init__(self.text)
+
+
+class ChunkedRequestError(HTTPException):
+    """This exception is raised when some, but not all, chunks of a bulk
+    request failed. If every chunk failed, the error of the first failed
+    chunk is raised instead.
+
+    This is a subclass of :exc:`HTTPException`. The attributes inherited
+    from it describe the first chunk that failed with an
+    :exc:`HTTPException`, and are ``None`` if none of the failed chunks
+    received a response.
+
+    Attributes
+    ----------
+    failed: List[Tuple[List[Any], :class:`Exception`]]
+        The items of every chunk that failed mapped to the error it failed
+        with.
+    result: Any
+        What was received from the chunks that succeeded, in the same form
+        the method raising this error would have returned it. ``None`` if
+        raised from an async iterator as those results have already been
+        yielded.
+    """
+
+    def __init__(self, failed: list, result: Any = None) -> None:
+        self.failed = failed
+        self.result = result
+
+        exc = next(
+            (e for _, e in failed if isinstance(e, HTTPException)),
+            None
+        )
+        if exc is not None:
+            super().__init__(exc.response, exc.route, exc.raw,
+                             exc.request_headers)
+        else:
+            self.response = self.status = self.route = self.raw = None
+            self.request_headers = self.message = self.message_code = None
+            self.code = self.originating_service = self.intent = None
+            self.validation_failures = None
+            self.message_vars = []
+
+        self.text = '{0} chunk(s) failed. First error: {1!r}'.format(
+            len(failed),
+            failed[0][1]
+        )
+        self.args = (self.text,)
@@ -98,11 +98,10 @@ class UserConverter(IDConverter):
         match = self._get_id_match(argument)
 
         if match is not None:
-            to_lookup = match.group(1).lower()
+            result = await bot.fetch_user(match.group(1).lower(), cache=True)
         else:
-            to_lookup = argument
-
-        result = await bot.fetch_user(to_lookup, cache=True)
+            result = await bot.fetch_user_by_display_name(argument,
+                                                          cache=True)
 
         if result is None:
             raise BadArgument('User "{}" not found'.format(argument))
@@ -396,12 +396,19 @@ class Friend(FriendBase):
     async def send(self, content: str) -> None:
         """|coro|
 
-        Sends a :class:`FriendMessage` to this friend.
+        Sends a :class:`FriendMessage` to this friend. Returns once the
+        message has been sent.
 
         Parameters
         ----------
         content: :class:`str`
             The content of the message.
+
+        Raises
+        ------
+        XMPPError
+            Too many messages are already waiting to be sent to this
+            destination. See :class:`ChatScheduler`.
         """
         await self.client.xmpp.send_friend_message(self.jid, content)
 
@@ -24,17 +24,28 @@ SOFTWARE.
 
 import aiohttp
 import asyncio
+import contextvars
+import copy
+import heapq
+import itertools
 import logging
 import json
+import random
 import re
 import time
 import functools
 
-from typing import TYPE_CHECKING, Iterable, List, Optional, Any, Union, Tuple, Literal
+from collections import deque, OrderedDict
+from string import Formatter
+from types import MappingProxyType
+
+from typing import (TYPE_CHECKING, Iterable, List, Optional, Any, Union, Tuple,
+                    Literal, Callable, Awaitable, AsyncIterator)
 from urllib.parse import quote as urllibquote
 
-from .utils import MaybeLock
-from .errors import HTTPException
+from .utils import MaybeLock, bounded_as_completed
+from .errors import HTTPException, ServiceUnavailable, ChunkedRequestError
+from .enums import RequestPriority
 
 if TYPE_CHECKING:
     from .client import Client
@@ -53,6 +64,10 @@ def quote(string: str) -> str:
     return string
 
 
+# The same ids are quoted over and over again so we cache the results.
+_quote_param = functools.lru_cache(maxsize=2048)(quote)
+
+
 class HTTPRetryConfig:
     """Config for how HTTPClient should handle retries.
 
@@ -111,6 +126,28 @@ class HTTPRetryConfig:
         The cap for the exponential backoff to avoid having
         unrealistically high wait times. Defaults to ``20``. *Only matters
         when ``handle_capacity_throttling`` is ``True``*
+    jitter: :class:`bool`
+        Whether or not to randomize retry sleeps using decorrelated jitter.
+        This spreads out the retries of many clients hitting the same
+        failing service instead of having them retry in lockstep. If
+        ``False``, server errors are retried with linear sleeps.
+        Defaults to ``True``.
+    retry_backoff_start: :class:`float`
+        The initial seconds to wait before retrying a request that failed
+        due to a server error or disconnect. Defaults to ``0.5``. *Only
+        matters when ``jitter`` is ``True``*
+    retry_backoff_cap: :class:`float`
+        The max amount of seconds to wait before retrying a request that
+        failed due to a server error or disconnect. Defaults to ``10``.
+        *Only matters when ``jitter`` is ``True``*
+    circuit_breaker_threshold: Optional[:class:`int`]
+        The amount of consecutive server errors or disconnects from a
+        service before its :class:`HTTPCircuitBreaker` opens and requests
+        to it fail fast with :exc:`ServiceUnavailable`. ``None`` disables
+        circuit breaking. Defaults to ``10``.
+    circuit_breaker_cooldown: :class:`float`
+        The amount of seconds an open circuit breaker waits before
+        letting a single probe request through. Defaults to ``30``.
     """
 
     def __init__(self, **kwargs):
@@ -126,6 +163,28 @@ class HTTPRetryConfig:
         self.backoff_factor = kwargs.get('backoff_factor', 1.5)
         self.backoff_cap = kwargs.get('backoff_cap', 20)
 
+        self.jitter = kwargs.get('jitter', True)
+        self.retry_backoff_start = kwargs.get('retry_backoff_start', 0.5)
+        self.retry_backoff_cap = kwargs.get('retry_backoff_cap', 10)
+
+        self.circuit_breaker_threshold = kwargs.get('circuit_breaker_threshold', 10)  # noqa
+        self.circuit_breaker_cooldown = kwargs.get('circuit_breaker_cooldown', 30)  # noqa
+
+    @staticmethod
+    def _jitter(previous: float, start: float, cap: float) -> float:
+        # Decorrelated jitter: sleep = min(cap, random(start, previous * 3))
+        return min(cap, random.uniform(start, previous * 3))
+
+    def get_retry_backoff(self, tries: int, previous: float) -> float:
+        if not self.jitter:
+            return 0.5 + (tries - 1) * 2
+
+        return self._jitter(
+            previous,
+            self.retry_backoff_start,
+            self.retry_backoff_cap
+        )
+
 
 class GraphQLRequest:
     def __init__(self, query: str, *,
@@ -162,6 +221,36 @@ class GraphQLRequest:
         return re.search(r'(?:mutation|query) (\w+)', self.query).group(1)
 
 
+class _RouteTemplate:
+    __slots__ = ('url', 'parts')
+
+    _formatter = Formatter()
+
+    def __init__(self, url: str) -> None:
+        self.url = url
+
+        parts = []
+        for literal, field, spec, conversion in self._formatter.parse(url):
+            if field is not None and (spec or conversion
+                                      or not field.isidentifier()):
+                # Leave anything fancier than {name} to str.format().
+                parts = None
+                break
+
+            parts.append((literal, field))
+
+        self.parts = parts
+
+    def format(self, params: dict) -> str:
+        parts = self.parts
+        if parts is None:
+            return self.url.format(**params)
+
+        return ''.join([literal if field is None
+                        else literal + str(params[field])
+                        for literal, field in parts])
+
+
 class Route:
     """Represents a route to use for a http request. This should
     be subclassed by new routes and the class attributes ``BASE`` and
@@ -234,18 +323,33 @@ class Route:
     BASE = ''
     AUTH = None
 
+    # Templates compiled once per (route class, path).
+    _templates = {}
+
     def __init__(self, path: str = '', *,
                  auth: str = None,
                  **params: Any) -> None:
         self.path = path
-        self.params = {k: (quote(v) if isinstance(v, str) else v)
+        self.params = {k: (_quote_param(v) if isinstance(v, str) else v)
                        for k, v in params.items()}
 
-        if self.BASE == '':
-            raise ValueError('Route must have a base')
+        key = (self.__class__, path)
+        try:
+            template = self._templates[key]
+        except KeyError:
+            if self.BASE == '':
+                raise ValueError('Route must have a base')
+
+            # Protect against paths formatted before being passed.
+            if len(self._templates) >= 1024:
+                self._templates.clear()
+
+            template = self._templates[key] = _RouteTemplate(
+                self.BASE + path
+            )
 
-        self.sanitized_url = url = self.BASE + self.path
-        self.url = url.format(**self.params) if self.params else url
+        self.sanitized_url = template.url
+        self.url = template.format(self.params) if self.params else template.url
 
         if auth:
             self.AUTH = auth
@@ -354,6 +458,515 @@ class RankedService(Route):
     AUTH = 'FORTNITE_ACCESS_TOKEN'
 
 
+class _TokenBucket:
+
+    __slots__ = ('rate', 'capacity', 'ceiling', 'max_rate', 'tokens',
+                 'updated_at', 'blocked_until')
+
+    def __init__(self, rate: float, capacity: float, *,
+                 ceiling: Optional[float] = None) -> None:
+        self.rate = rate
+        self.capacity = capacity
+        self.ceiling = ceiling
+        self.max_rate = rate
+        self.tokens = capacity
+        self.updated_at = time.monotonic()
+        self.blocked_until = 0.0
+
+    def reserve(self, now: float) -> float:
+        elapsed = now - self.updated_at
+        self.updated_at = now
+        self.tokens = min(self.capacity, self.tokens + elapsed * self.rate)
+
+        # Tokens are taken even when the bucket is empty so that
+        # concurrent callers are spread out instead of all waking up
+        # at the same time.
+        self.tokens -= 1
+        delay = -self.tokens / self.rate if self.tokens < 0 else 0.0
+        return max(delay, self.blocked_until - now)
+
+
+class HTTPRateLimiter:
+    """Paces requests on the client side so that epic's rate limits
+    are not hit in the first place.
+
+    Requests are paced by token buckets keyed by the method and the
+    sanitized url of a :class:`Route` and optionally by the base url of
+    the service. Endpoints without a configured limit are not paced
+    until a throttled response with a ``Retry-After`` is received, at
+    which point a limit is learned for that endpoint. Learned limits
+    are reduced on every following throttle and slowly raised again
+    while requests succeed, up to ``recovery_factor`` times the limit
+    set by the last throttle.
+
+    Example usage: ::
+
+        limiter = fortnitepy.HTTPRateLimiter(limits={
+            # 20 requests per 10 seconds to the party service.
+            fortnitepy.http.PartyService: (20, 10),
+            # 3 requests per 600 seconds to a single endpoint.
+            ('GET', 'https://account-public-service-prod.ol.epicgames.com'
+                    '/account/api/public/account/email/{email}'): (3, 600),
+        })
+        client = fortnitepy.Client(auth=..., http_rate_limiter=limiter)
+
+    Parameters
+    ----------
+    limits: Optional[Dict[Union[Type[:class:`Route`], :class:`str`, Tuple[:class:`str`, :class:`str`]], Tuple[:class:`int`, :class:`float`]]]
+        A mapping of known limits as ``(requests, per_seconds)``. Keys
+        can either be a :class:`Route` subclass or a base url to limit a
+        whole service, or a ``(method, sanitized_url)`` tuple to limit a
+        single endpoint.
+    learn: :class:`bool`
+        Whether or not limits should be learned from throttled responses.
+        Defaults to ``True``.
+    decrease_factor: :class:`float`
+        The factor a learned limit is multiplied with on every throttled
+        response. Defaults to ``0.5``.
+    increase_step: :class:`float`
+        How many requests per second a learned limit is raised by on every
+        successful request. Defaults to ``0.05``.
+    min_rate: :class:`float`
+        The lowest amount of requests per second a learned limit can be
+        reduced to. Defaults to ``0.05``.
+    recovery_factor: :class:`float`
+        How far a learned limit can be raised again, as a multiple of the
+        limit set by the last throttled response. With the default
+        ``decrease_factor`` the default of ``2`` raises it back to the
+        limit at which the service started throttling at most.
+    """  # noqa
+
+    def __init__(self, limits: Optional[dict] = None, *,
+                 learn: bool = True,
+                 decrease_factor: float = 0.5,
+                 increase_step: float = 0.05,
+                 min_rate: float = 0.05,
+                 recovery_factor: float = 2) -> None:
+        self.learn = learn
+        self.decrease_factor = decrease_factor
+        self.increase_step = increase_step
+        self.min_rate = min_rate
+        self.recovery_factor = recovery_factor
+
+        self._buckets = {}
+        for key, (requests, per) in (limits or {}).items():
+            self.set_limit(key, requests, per)
+
+    @staticmethod
+    def _resolve_key(key: Any) -> Union[str, Tuple[str, str]]:
+        if isinstance(key, type) and issubclass(key, Route):
+            return key.BASE
+        if isinstance(key, tuple):
+            return (key[0].upper(), key[1])
+        return key
+
+    def set_limit(self, key: Any, requests: int, per: float) -> None:
+        """Sets a known limit.
+
+        Parameters
+        ----------
+        key: Union[Type[:class:`Route`], :class:`str`, Tuple[:class:`str`, :class:`str`]]
+            The service or endpoint to limit.
+        requests: :class:`int`
+            The amount of requests allowed within ``per`` seconds.
+        per: :class:`float`
+            The window in seconds.
+        """  # noqa
+        rate = requests / per
+        self._buckets[self._resolve_key(key)] = _TokenBucket(
+            rate,
+            requests,
+            ceiling=rate
+        )
+
+    def get_limit(self, key: Any) -> Optional[float]:
+        """Gets the current limit in requests per second for a service or
+        endpoint. ``None`` if the service or endpoint is not limited.
+        """
+        bucket = self._buckets.get(self._resolve_key(key))
+        return bucket.rate if bucket is not None else None
+
+    def reserve(self, method: str, route: Route) -> float:
+        now = time.monotonic()
+        delay = 0.0
+        for key in ((method, route.sanitized_url), route.BASE):
+            bucket = self._buckets.get(key)
+            if bucket is not None:
+                delay = max(delay, bucket.reserve(now))
+
+        return delay
+
+    async def acquire(self, method: str, route: Route) -> float:
+        delay = self.reserve(method, route)
+        if delay > 0:
+            await asyncio.sleep(delay)
+        return delay
+
+    def on_success(self, method: str, route: Route) -> None:
+        bucket = self._buckets.get((method, route.sanitized_url))
+        if bucket is not None and bucket.ceiling is None:
+            bucket.rate = min(bucket.rate + self.increase_step,
+                              bucket.max_rate)
+
+    def on_throttle(self, method: str,
+                    route: Route,
+                    retry_after: float) -> None:
+        key = (method, route.sanitized_url)
+        now = time.monotonic()
+
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            if not self.learn:
+                return
+
+            # Assume a single request was allowed within the window
+            # the server told us to wait for.
+            rate = max(1 / max(retry_after, 1), self.min_rate)
+            bucket = self._buckets[key] = _TokenBucket(rate, 1)
+            bucket.tokens = 0
+        elif bucket.ceiling is None:
+            bucket.rate = max(bucket.rate * self.decrease_factor,
+                              self.min_rate)
+
+        if bucket.ceiling is None:
+            bucket.max_rate = bucket.rate * self.recovery_factor
+
+        bucket.blocked_until = max(bucket.blocked_until, now + retry_after)
+
+
+class RouteMetrics:
+    """Represents the metrics recorded for a single route.
+
+    Attributes
+    ----------
+    method: :class:`str`
+        The http method of the route.
+    url: :class:`str`
+        The sanitized url of the route.
+    requests: :class:`int`
+        The amount of requests sent.
+    errors: :class:`int`
+        The amount of requests that received a response with a status
+        code of 400 or higher.
+    response_bytes: :class:`int`
+        The total amount of bytes received.
+    retries: Dict[:class:`str`, :class:`int`]
+        The amount of retries mapped to the reason of the retry. Reasons
+        are ``throttle``, ``capacity_throttle``, ``server_error``,
+        ``concurrent_modification``, ``token_refresh`` and ``disconnect``.
+    wait_time: Dict[:class:`str`, :class:`float`]
+        The total seconds spent waiting before requesting mapped to what
+        was waited for. Can be ``endpoint_event``, ``reauth``,
+        ``rate_limit`` or ``retry``.
+    """
+
+    __slots__ = ('method', 'url', 'requests', 'errors', 'response_bytes',
+                 'retries', 'wait_time', '_latencies')
+
+    def __init__(self, method: str, url: str, sample_size: int) -> None:
+        self.method = method
+        self.url = url
+        self.requests = 0
+        self.errors = 0
+        self.response_bytes = 0
+        self.retries = {}
+        self.wait_time = {}
+        self._latencies = deque(maxlen=sample_size)
+
+    def percentile(self, percentile: float) -> Optional[float]:
+        """Gets a latency percentile in seconds from the most recent
+        requests. ``None`` if no requests have been recorded.
+
+        Parameters
+        ----------
+        percentile: :class:`float`
+            The percentile to get, ranging from ``0`` to ``100``.
+        """
+        return self._get_percentile(sorted(self._latencies), percentile)
+
+    @staticmethod
+    def _get_percentile(latencies: List[float],
+                        percentile: float) -> Optional[float]:
+        if not latencies:
+            return None
+        return latencies[round(percentile / 100 * (len(latencies) - 1))]
+
+    def to_dict(self) -> dict:
+        latencies = sorted(self._latencies)
+        get = functools.partial(self._get_percentile, latencies)
+
+        return {
+            'method': self.method,
+            'url': self.url,
+            'requests': self.requests,
+            'errors': self.errors,
+            'response_bytes': self.response_bytes,
+            'latency': {
+                'p50': get(50),
+                'p95': get(95),
+                'p99': get(99),
+                'max': latencies[-1] if latencies else None,
+            },
+            'retries': dict(self.retries),
+            'wait_time': dict(self.wait_time),
+        }
+
+
+class HTTPMetrics:
+    """A registry of per route http metrics. Routes are keyed by their
+    method and :attr:`Route.sanitized_url` so requests to the same
+    endpoint are grouped together regardless of the url params.
+
+    The same registry can be passed to multiple clients to collect
+    metrics for all of them.
+
+    Parameters
+    ----------
+    sample_size: :class:`int`
+        The amount of recent requests per route used to calculate
+        latency percentiles. Defaults to ``1024``.
+    """
+
+    def __init__(self, *, sample_size: int = 1024) -> None:
+        self.sample_size = sample_size
+
+        self._routes = {}
+        self._hooks = []
+
+    def add_hook(self, func: Callable[[str, dict], Any]) -> None:
+        """Adds a hook called whenever something is recorded. The hook is
+        called with the type of the record (``request``, ``retry`` or
+        ``wait``) and a dict with the recorded values. Hooks must be
+        regular functions and should be cheap as they are called on
+        every request.
+
+        Parameters
+        ----------
+        func: Callable[[:class:`str`, :class:`dict`], Any]
+            The hook to add.
+        """
+        if func not in self._hooks:
+            self._hooks.append(func)
+
+    def remove_hook(self, func: Callable[[str, dict], Any]) -> None:
+        """Removes a hook added by :meth:`add_hook()`."""
+        self._hooks = [h for h in self._hooks if h is not func]
+
+    def _get(self, method: str, url: str) -> RouteMetrics:
+        try:
+            return self._routes[(method, url)]
+        except KeyError:
+            metrics = RouteMetrics(method, url, self.sample_size)
+            self._routes[(method, url)] = metrics
+            return metrics
+
+    def _call_hooks(self, type_: str, data: dict) -> None:
+        for hook in self._hooks:
+            try:
+                hook(type_, data)
+            except Exception:
+                log.exception('Ignoring exception in http metrics hook')
+
+    def record_request(self, method: str,
+                       url: str,
+                       status: int,
+                       elapsed: float,
+                       size: int) -> None:
+        metrics = self._get(method, url)
+        metrics.requests += 1
+        metrics.response_bytes += size
+        metrics._latencies.append(elapsed)
+        if status >= 400:
+            metrics.errors += 1
+
+        if self._hooks:
+            self._call_hooks('request', {
+                'method': method,
+                'url': url,
+                'status': status,
+                'elapsed': elapsed,
+                'size': size,
+            })
+
+    def record_retry(self, method: str, url: str, reason: str) -> None:
+        retries = self._get(method, url).retries
+        retries[reason] = retries.get(reason, 0) + 1
+
+        if self._hooks:
+            self._call_hooks('retry', {
+                'method': method,
+                'url': url,
+                'reason': reason,
+            })
+
+    def record_wait(self, method: str,
+                    url: str,
+                    reason: str,
+                    elapsed: float) -> None:
+        wait_time = self._get(method, url).wait_time
+        wait_time[reason] = wait_time.get(reason, 0) + elapsed
+
+        if self._hooks:
+            self._call_hooks('wait', {
+                'method': method,
+                'url': url,
+                'reason': reason,
+                'elapsed': elapsed,
+            })
+
+    def get_route(self, method: str, url: str) -> Optional[RouteMetrics]:
+        """Gets the metrics of a route.
+
+        Parameters
+        ----------
+        method: :class:`str`
+            The http method of the route.
+        url: :class:`str`
+            The sanitized url of the route.
+
+        Returns
+        -------
+        Optional[:class:`RouteMetrics`]
+            The metrics if any requests to the route has been recorded.
+        """
+        return self._routes.get((method, url))
+
+    def snapshot(self) -> List[dict]:
+        """Creates a snapshot of all recorded metrics.
+
+        Returns
+        -------
+        List[:class:`dict`]
+            The metrics of every route, sorted by total time spent on
+            requests to the route in descending order.
+        """
+        routes = sorted(
+            self._routes.values(),
+            key=lambda m: sum(m._latencies) / max(len(m._latencies), 1) * m.requests,  # noqa
+            reverse=True,
+        )
+        return [metrics.to_dict() for metrics in routes]
+
+    def reset(self) -> None:
+        """Clears all recorded metrics."""
+        self._routes.clear()
+
+
+class HTTPCircuitBreaker:
+    """Represents the circuit breaker of a single service, identified by
+    the ``BASE`` of its routes. Breakers are shared by all clients in the
+    process so that one client noticing an outage protects all of them.
+
+    A breaker opens after :attr:`HTTPRetryConfig.circuit_breaker_threshold`
+    consecutive server errors or disconnects. While open, requests to the
+    service fail fast with :exc:`ServiceUnavailable`. After
+    :attr:`HTTPRetryConfig.circuit_breaker_cooldown` seconds a single
+    probe request is let through. If it succeeds the breaker closes,
+    otherwise it opens again.
+
+    Attributes
+    ----------
+    base: :class:`str`
+        The base url of the service.
+    failures: :class:`int`
+        The amount of consecutive failures.
+    """
+
+    _breakers = {}
+
+    def __init__(self, base: str) -> None:
+        self.base = base
+        self.failures = 0
+        self._reopens_at = None
+        self._probing = False
+
+    def __repr__(self) -> str:
+        return ('<HTTPCircuitBreaker base={0.base!r} state={0.state!r} '
+                'failures={0.failures}>'.format(self))
+
+    @classmethod
+    def get(cls, base: str) -> 'HTTPCircuitBreaker':
+        """Gets the circuit breaker of a service. The breaker is created
+        if it does not exist yet.
+
+        Parameters
+        ----------
+        base: :class:`str`
+            The base url of the service.
+
+        Returns
+        -------
+        :class:`HTTPCircuitBreaker`
+            The circuit breaker.
+        """
+        try:
+            return cls._breakers[base]
+        except KeyError:
+            breaker = cls._breakers[base] = cls(base)
+            return breaker
+
+    @classmethod
+    def get_all(cls) -> List['HTTPCircuitBreaker']:
+        """Gets all circuit breakers created in this process.
+
+        Returns
+        -------
+        List[:class:`HTTPCircuitBreaker`]
+            The circuit breakers.
+        """
+        return list(cls._breakers.values())
+
+    @property
+    def state(self) -> str:
+        """:class:`str`: The state of the breaker. Either ``closed``,
+        ``open`` or ``half_open``."""
+        if self._reopens_at is None:
+            return 'closed'
+        if time.monotonic() < self._reopens_at:
+            return 'open'
+        return 'half_open'
+
+    def reset(self) -> None:
+        """Closes the breaker."""
+        self.failures = 0
+        self._reopens_at = None
+        self._probing = False
+
+    def before_request(self) -> bool:
+        if self._reopens_at is None:
+            return False
+
+        retry_after = self._reopens_at - time.monotonic()
+        if retry_after > 0 or self._probing:
+            raise ServiceUnavailable(self.base, max(retry_after, 0))
+
+        self._probing = True
+        return True
+
+    def release_probe(self) -> None:
+        self._probing = False
+
+    def on_success(self) -> None:
+        if self._reopens_at is not None:
+            log.info('Circuit breaker for {0} closed.'.format(self.base))
+
+        self.reset()
+
+    def on_failure(self, threshold: int, cooldown: float) -> None:
+        self.failures += 1
+
+        # A failing probe opens the breaker again right away.
+        if self._reopens_at is not None or self.failures >= threshold:
+            if self._reopens_at is None:
+                log.warning(
+                    'Circuit breaker for {0} opened after {1} consecutive '
+                    'failures.'.format(self.base, self.failures)
+                )
+
+            self._reopens_at = time.monotonic() + cooldown
+            self._probing = False
+
+
 def create_aiohttp_closed_event(session) -> asyncio.Event:
     """Work around aiohttp issue that doesn't properly close transports on exit.
 
@@ -407,24 +1020,675 @@ def create_aiohttp_closed_event(session) -> asyncio.Event:
     return all_is_lost
 
 
+class _CacheEntry:
+
+    __slots__ = ('data', 'expires_at', 'etag', 'last_modified')
+
+    def __init__(self, data: Any,
+                 expires_at: float,
+                 etag: Optional[str],
+                 last_modified: Optional[str]) -> None:
+        self.data = data
+        self.expires_at = expires_at
+        self.etag = etag
+        self.last_modified = last_modified
+
+    def is_fresh(self) -> bool:
+        return time.monotonic() < self.expires_at
+
+    def can_revalidate(self) -> bool:
+        return self.etag is not None or self.last_modified is not None
+
+
+class HTTPResponseCache:
+    """A cache for responses of slow-changing routes like the item shop,
+    news and timeline.
+
+    Every cached route has its own time to live. When an entry has
+    expired but the service sent an ``ETag`` or ``Last-Modified``
+    header with the original response, the entry is revalidated with a
+    conditional request so the body doesn't have to be downloaded again
+    if it hasn't changed.
+
+    The same cache can be passed to multiple clients. Responses that
+    don't depend on the account requesting them are then shared between
+    all of the clients.
+
+    Every caller gets its own copy of a cached response, so the data
+    returned can be mutated without affecting the cache.
+
+    Parameters
+    ----------
+    max_entries: :class:`int`
+        The max amount of responses to keep. The least recently used
+        response is evicted when the cache is full. Defaults to ``128``.
+    """
+
+    def __init__(self, *, max_entries: int = 128) -> None:
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: tuple) -> Optional[_CacheEntry]:
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+        return entry
+
+    def set(self, key: tuple,
+            data: Any,
+            ttl: float,
+            etag: Optional[str] = None,
+            last_modified: Optional[str] = None) -> None:
+        self._entries[key] = _CacheEntry(
+            data,
+            time.monotonic() + ttl,
+            etag,
+            last_modified
+        )
+        self._entries.move_to_end(key)
+
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Removes all cached responses."""
+        self._entries.clear()
+
+
+class RequestScheduler:
+    """Limits the amount of concurrent requests a client can have in
+    flight and hands out free slots to waiting requests by their
+    :class:`RequestPriority`.
+
+    Slots are only held while a request is in flight, not while it
+    waits for a retry or rate limit.
+
+    Parameters
+    ----------
+    max_concurrency: Optional[:class:`int`]
+        The max amount of concurrent requests. ``None`` means no limit.
+        Defaults to ``64``.
+    reserved_slots: :class:`int`
+        The amount of slots only :attr:`RequestPriority.INTERACTIVE`
+        requests can use. Defaults to ``8``.
+    max_bulk: Optional[:class:`int`]
+        The max amount of concurrent :attr:`RequestPriority.BULK`
+        requests. ``None`` means no limit other than the slots available.
+        Defaults to ``32``.
+    """
+
+    def __init__(self, max_concurrency: Optional[int] = 64, *,
+                 reserved_slots: int = 8,
+                 max_bulk: Optional[int] = 32) -> None:
+        self.max_concurrency = max_concurrency
+        self.reserved_slots = reserved_slots
+        self.max_bulk = max_bulk
+
+        self._active = 0
+        self._active_bulk = 0
+        self._waiters = []
+        self._counter = itertools.count()
+
+    @property
+    def active(self) -> int:
+        """:class:`int`: The amount of requests currently in flight."""
+        return self._active
+
+    @property
+    def waiting(self) -> int:
+        """:class:`int`: The amount of requests waiting for a slot."""
+        return sum(1 for *_, f in self._waiters if not f.done())
+
+    def _can_run(self, priority: RequestPriority) -> bool:
+        limit = self.max_concurrency
+        if limit is None:
+            return True
+
+        if priority is not RequestPriority.INTERACTIVE:
+            limit -= self.reserved_slots
+
+        if priority is RequestPriority.BULK and self.max_bulk is not None:
+            if self._active_bulk >= self.max_bulk:
+                return False
+
+        return self._active < limit
+
+    def _take(self, priority: RequestPriority) -> None:
+        self._active += 1
+        if priority is RequestPriority.BULK:
+            self._active_bulk += 1
+
+    def _wakeup(self) -> None:
+        waiters = self._waiters
+        while waiters:
+            value, _, priority, future = waiters[0]
+            if future.done():
+                heapq.heappop(waiters)
+                continue
+
+            # Lower priorities are never less restricted than the
+            # highest priority waiter, so we can stop here.
+            if not self._can_run(priority):
+                break
+
+            heapq.heappop(waiters)
+            self._take(priority)
+            future.set_result(None)
+
+    async def acquire(self, priority: RequestPriority) -> None:
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(
+            self._waiters,
+            (priority.value, next(self._counter), priority, future)
+        )
+        self._wakeup()
+        if future.done():
+            return
+
+        try:
+            await future
+        except asyncio.CancelledError:
+            # A slot might have been handed to us just before we got
+            # cancelled.
+            if future.done() and not future.cancelled():
+                self.release(priority)
+            raise
+
+    def release(self, priority: RequestPriority) -> None:
+        self._active -= 1
+        if priority is RequestPriority.BULK:
+            self._active_bulk -= 1
+
+        self._wakeup()
+
+
+class HTTPConnectionPool:
+    """Represents a http connection pool that can be shared between
+    multiple clients. Every client sharing the pool still gets its own
+    session, meaning cookies and auth headers are kept separate per
+    account, while the underlying connections (and their TLS sessions)
+    to epic's services are reused across all of them.
+
+    The pool is reference counted. The underlying connector is created
+    when the first client starts and closed when the last client using
+    it is closed.
+
+    Example usage: ::
+
+        pool = fortnitepy.HTTPConnectionPool(limit_per_host=20)
+        fortnitepy.run_multiple(clients, http_pool=pool)
+
+    Parameters
+    ----------
+    limit: :class:`int`
+        The max amount of simultaneous connections across all hosts.
+        ``0`` means no limit. Defaults to ``100``.
+    limit_per_host: :class:`int`
+        The max amount of simultaneous connections to the same host.
+        ``0`` means no limit. Defaults to ``0``.
+    keepalive_timeout: :class:`float`
+        The amount of seconds an idle connection is kept alive for
+        reuse. Defaults to ``30``.
+    ttl_dns_cache: Optional[:class:`int`]
+        The amount of seconds resolved dns entries are cached for. If
+        ``None`` entries are cached forever. Defaults to ``300``.
+    """
+
+    def __init__(self, *, limit: int = 100,
+                 limit_per_host: int = 0,
+                 keepalive_timeout: float = 30,
+                 ttl_dns_cache: Optional[int] = 300) -> None:
+        self.limit = limit
+        self.limit_per_host = limit_per_host
+        self.keepalive_timeout = keepalive_timeout
+        self.ttl_dns_cache = ttl_dns_cache
+
+        self._connector = None
+        self._references = 0
+
+    @property
+    def connector(self) -> Optional[aiohttp.BaseConnector]:
+        """Optional[:class:`aiohttp.BaseConnector`]: The connector currently
+        used by the pool. ``None`` if no client is using the pool.
+        """
+        return self._connector
+
+    @property
+    def references(self) -> int:
+        """:class:`int`: The amount of clients currently using the pool."""
+        return self._references
+
+    def acquire(self) -> aiohttp.BaseConnector:
+        if self._connector is None or self._connector.closed:
+            self._connector = aiohttp.TCPConnector(
+                limit=self.limit,
+                limit_per_host=self.limit_per_host,
+                keepalive_timeout=self.keepalive_timeout,
+                ttl_dns_cache=self.ttl_dns_cache,
+            )
+
+        self._references += 1
+        return self._connector
+
+    async def release(self) -> None:
+        self._references = max(self._references - 1, 0)
+        if self._references == 0:
+            await self.close()
+
+    async def close(self) -> None:
+        """|coro|
+
+        Closes the underlying connector regardless of how many clients
+        are still using it.
+        """
+        connector = self._connector
+        self._connector = None
+        self._references = 0
+
+        if connector is not None and not connector.closed:
+            await connector.close()
+
+
+# The slowest time on the wire of the requests sent for the chunk a
+# ChunkedRequestExecutor is running in the current task.
+_chunk_latency = contextvars.ContextVar('chunk_latency', default=None)
+
+
+class ChunkedRequestExecutor:
+    """Runs bulk requests, like fetching the stats or accounts of lots of
+    users, split into chunks with a limited amount of chunks in flight.
+
+    Chunk sizes adapt to how the service copes with the load. The size
+    used for a kind of request is halved when one of its chunks is
+    throttled, times out or is slower than ``target_latency``, and grows
+    back towards the max size of the request after fast chunks. Only the
+    time requests spend on the wire counts, not the time they wait for
+    the client's own rate limiter or scheduler.
+
+    A chunk that fails with a transient error, meaning it was throttled,
+    got a server error or timed out, is retried on its own after a delay
+    without affecting the other chunks. Chunks failing with any other
+    :exc:`HTTPException` are not retried. Once all other chunks are
+    completed, :exc:`ChunkedRequestError` is raised with the partial
+    result.
+
+    Parameters
+    ----------
+    max_concurrency: :class:`int`
+        The max amount of chunks of a single bulk request in flight at
+        the same time. Defaults to ``8``.
+    target_latency: :class:`float`
+        The amount of seconds a request of a chunk should take at most.
+        Defaults to ``2``.
+    max_retries: :class:`int`
+        The max amount of times a chunk failing with a transient error is
+        retried. Defaults to ``2``.
+    retry_delay: :class:`float`
+        The amount of seconds to wait before the first retry of a chunk.
+        The delay is doubled for every following retry. Defaults to ``1``.
+    """
+
+    def __init__(self, *, max_concurrency: int = 8,
+                 target_latency: float = 2,
+                 max_retries: int = 2,
+                 retry_delay: float = 1) -> None:
+        self.max_concurrency = max_concurrency
+        self.target_latency = target_latency
+        self.max_retries = max_retries
+        self.retry_delay = retry_delay
+
+        self._chunk_sizes = {}
+
+    def get_chunk_size(self, key: str, max_size: int) -> int:
+        """Gets the chunk size currently used for a kind of request.
+
+        Parameters
+        ----------
+        key: :class:`str`
+            The kind of request, e.g. ``stats`` or ``account``.
+        max_size: :class:`int`
+            The max chunk size of the request.
+
+        Returns
+        -------
+        :class:`int`
+            The chunk size.
+        """
+        return min(self._chunk_sizes.get(key, max_size), max_size)
+
+    @staticmethod
+    def _is_throttled(exc: Exception) -> bool:
+        if not isinstance(exc, HTTPException):
+            return False
+
+        code = exc.message_code
+        return code == 'errors.com.epicgames.common.throttled' or exc.status == 429  # noqa
+
+    @staticmethod
+    def _is_isolated(exc: Exception) -> bool:
+        # A ChunkedRequestError raised by a nested bulk request is an
+        # HTTPException too, so it only fails the chunk it was raised in.
+        return isinstance(exc, (HTTPException, ServiceUnavailable,
+                                aiohttp.ClientError, asyncio.TimeoutError))
+
+    def _is_transient(self, exc: Exception) -> bool:
+        # The chunks of a nested bulk request have already been retried.
+        if isinstance(exc, ChunkedRequestError):
+            return False
+        if isinstance(exc, HTTPException):
+            return exc.status >= 500 or self._is_throttled(exc)
+        return isinstance(exc, (ServiceUnavailable, aiohttp.ClientError,
+                                asyncio.TimeoutError))
+
+    def _get_retry_delay(self, exc: Exception, attempt: int) -> float:
+        delay = self.retry_delay * 2 ** attempt
+        if isinstance(exc, ServiceUnavailable):
+            delay = max(delay, exc.retry_after)
+        return delay
+
+    def _adapt(self, key: str,
+               max_size: int,
+               elapsed: float,
+               throttled: bool) -> None:
+        size = self.get_chunk_size(key, max_size)
+        if throttled or elapsed > self.target_latency:
+            size = max(size // 2, 1)
+        elif elapsed < self.target_latency / 2:
+            size = min(size + max(max_size // 4, 1), max_size)
+
+        self._chunk_sizes[key] = size
+
+    async def _attempt(self, request: Callable[[List[Any]], Awaitable[Any]],
+                       chunk: List[Any],
+                       attempt: int,
+                       delay: float) -> tuple:
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+        # Only the time the requests of the chunk spent on the wire is
+        # measured. Time spent waiting in local queues like the rate
+        # limiter or scheduler would otherwise shrink the chunks, causing
+        # more requests and even more waiting.
+        latency = [0.0]
+        _chunk_latency.set(latency)
+
+        try:
+            result = await request(chunk)
+        except Exception as exc:
+            if not self._is_isolated(exc):
+                raise
+            return chunk, attempt, latency[0], None, exc
+
+        return chunk, attempt, latency[0], result, None
+
+    async def run(self, key: str,
+                  items: Iterable[Any],
+                  request: Callable[[List[Any]], Awaitable[Any]], *,
+                  max_chunk_size: int,
+                  max_concurrency: Optional[int] = None
+                  ) -> AsyncIterator[Tuple[List[Any], Any]]:
+        source = _ChunkSource(self, key, list(items), request, max_chunk_size)
+        attempts = bounded_as_completed(
+            source,
+            max_concurrency or self.max_concurrency
+        )
+        failed = []
+        succeeded = False
+
+        try:
+            async for chunk, attempt, elapsed, result, exc in attempts:
+                if exc is None:
+                    self._adapt(key, max_chunk_size, elapsed, False)
+                    succeeded = True
+                    yield chunk, result
+                    continue
+
+                # Failed requests might not have been timed, so a
+                # failure can only shrink the chunk size.
+                if (self._is_throttled(exc)
+                        or isinstance(exc, asyncio.TimeoutError)):
+                    self._adapt(key, max_chunk_size, elapsed, True)
+
+                if attempt >= self.max_retries or not self._is_transient(exc):
+                    log.debug('Chunk of %s items for %s failed: %r',
+                              len(chunk), key, exc)
+                    failed.append((chunk, exc))
+                    continue
+
+                source.retry(chunk, attempt + 1,
+                             self._get_retry_delay(exc, attempt))
+        finally:
+            # Cancels the chunks still in flight if we are closed early.
+            await attempts.aclose()
+
+        if failed:
+            if not succeeded:
+                raise failed[0][1]
+            raise ChunkedRequestError(failed)
+
+
+class _ChunkSource:
+    # Hands out the attempts of a single ChunkedRequestExecutor.run()
+    # call. Retries are handed out before new chunks, even after the
+    # source ran dry once.
+
+    def __init__(self, executor: ChunkedRequestExecutor,
+                 key: str,
+                 items: List[Any],
+                 request: Callable[[List[Any]], Awaitable[Any]],
+                 max_chunk_size: int) -> None:
+        self.executor = executor
+        self.key = key
+        self.items = items
+        self.request = request
+        self.max_chunk_size = max_chunk_size
+
+        self._position = 0
+        self._retries = deque()
+
+    def __iter__(self) -> '_ChunkSource':
+        return self
+
+    def __next__(self) -> Callable[[], Awaitable[tuple]]:
+        if self._retries:
+            chunk, attempt, delay = self._retries.popleft()
+        elif self._position < len(self.items):
+            size = self.executor.get_chunk_size(self.key, self.max_chunk_size)
+            chunk = self.items[self._position:self._position + size]
+            self._position += size
+            attempt = 0
+            delay = 0
+        else:
+            raise StopIteration
+
+        return functools.partial(self.executor._attempt, self.request,
+                                 chunk, attempt, delay)
+
+    def retry(self, chunk: List[Any], attempt: int, delay: float) -> None:
+        self._retries.append((chunk, attempt, delay))
+
+
+class GraphQLBatcher:
+    """Merges graphql queries issued at roughly the same time into
+    a single multi-operation request.
+
+    Queries are collected for ``window`` seconds (or until ``max_size``
+    queries are collected) and then sent as one request. The result
+    or error of each operation is handed back to the caller that
+    issued it. Operations that fail with a retryable error are retried
+    separately so a single failing operation does not fail the others.
+
+    Only single queries without any request options other than their
+    priorities are batched. Queries are only merged with queries of the
+    same priorities.
+    Mutations are never batched.
+
+    Parameters
+    ----------
+    http: :class:`HTTPClient`
+        The http client to send the batched requests with.
+    window: :class:`float`
+        The amount of seconds to collect queries for before sending.
+    max_size: :class:`int`
+        The max amount of queries to send in one request.
+    """
+
+    RETRYABLE_CODES = (
+        'errors.com.epicgames.common.oauth.invalid_token',
+        'errors.com.epicgames.common.authentication.token_verification_failed',  # noqa
+        'errors.com.epicgames.common.throttled',
+        'errors.com.epicgames.common.server_error',
+        'error.graphql.401',
+    )
+
+    def __init__(self, http: 'HTTPClient', *,
+                 window: float = 0.01,
+                 max_size: int = 10) -> None:
+        self.http = http
+        self.window = window
+        self.max_size = max_size
+
+        self._pending = {}
+
+    def can_batch(self, graphql: Any, kwargs: dict) -> bool:
+        if not isinstance(graphql, GraphQLRequest):
+            return False
+        if any(k not in ('priority', 'request_priority') for k in kwargs):
+            return False
+        return graphql.query.lstrip().startswith('query')
+
+    async def request(self, graphql: GraphQLRequest,
+                      auth: Optional[str] = None,
+                      priority: int = 0,
+                      request_priority: RequestPriority = RequestPriority.DEFAULT  # noqa
+                      ) -> Any:
+        loop = asyncio.get_running_loop()
+        key = (auth, priority, request_priority)
+
+        batch = self._pending.get(key)
+        if batch is None:
+            batch = self._pending[key] = []
+            loop.call_later(self.window, self._flush, key, batch)
+
+        future = loop.create_future()
+        batch.append((graphql, future))
+        if len(batch) >= self.max_size:
+            self._flush(key, batch)
+
+        return await future
+
+    def _flush(self, key: tuple, batch: list) -> None:
+        # The batch might already have been flushed by reaching max size.
+        if self._pending.get(key) is not batch:
+            return
+
+        del self._pending[key]
+        asyncio.ensure_future(self._send(key, batch))
+
+    async def _send(self, key: tuple, batch: list) -> None:
+        auth, priority, request_priority = key
+        try:
+            results = await self.http.fn_request(
+                'POST',
+                EpicGamesGraphQL(),
+                auth,
+                [graphql for graphql, _ in batch],
+                priority=priority,
+                request_priority=request_priority,
+                graphql_return_exceptions=True
+            )
+        except Exception as exc:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(exc)
+            return
+        except asyncio.CancelledError:
+            for _, future in batch:
+                future.cancel()
+            raise
+
+        for (graphql, future), result in zip(batch, results):
+            if future.done():
+                continue
+
+            if not isinstance(result, HTTPException):
+                future.set_result(result)
+            elif result.message_code in self.RETRYABLE_CODES:
+                asyncio.ensure_future(self._retry(graphql, future, key))
+            else:
+                future.set_exception(result)
+
+    async def _retry(self, graphql: GraphQLRequest,
+                     future: asyncio.Future,
+                     key: tuple) -> None:
+        auth, priority, request_priority = key
+        try:
+            result = await self.http.fn_request(
+                'POST',
+                EpicGamesGraphQL(),
+                auth,
+                graphql,
+                priority=priority,
+                request_priority=request_priority
+            )
+        except Exception as exc:
+            if not future.done():
+                future.set_exception(exc)
+        else:
+            if not future.done():
+                future.set_result(result)
+
+
 class HTTPClient:
     def __init__(self, client: 'Client', *,
                  proxy: Optional[str] = None,
                  proxy_auth: Optional[aiohttp.BasicAuth] = None,
                  proxied_endpoints: List[str] = None,
                  connector: aiohttp.BaseConnector = None,
-                 retry_config: Optional[HTTPRetryConfig] = None) -> None:
+                 pool: Optional[HTTPConnectionPool] = None,
+                 retry_config: Optional[HTTPRetryConfig] = None,
+                 rate_limiter: Optional[HTTPRateLimiter] = None,
+                 graphql_batch_window: Optional[float] = None,
+                 graphql_batch_size: int = 10,
+                 metrics: Optional[HTTPMetrics] = None,
+                 cache: Optional[HTTPResponseCache] = None,
+                 scheduler: Optional[RequestScheduler] = None,
+                 chunk_executor: Optional[ChunkedRequestExecutor] = None
+                 ) -> None:
         self.client = client
         self.proxy: Optional[str] = proxy
         self.proxy_auth: Optional[aiohttp.BasicAuth] = proxy_auth
         self.proxied_endpoints: List[str] = proxied_endpoints
         self.connector = connector
+        self.pool = pool
         self.retry_config = retry_config or HTTPRetryConfig()
+        self.rate_limiter = rate_limiter or HTTPRateLimiter()
+        self.metrics = metrics or HTTPMetrics()
+        self.cache = cache
+        self.scheduler = scheduler
+        self.chunk_executor = chunk_executor or ChunkedRequestExecutor()
+
+        if graphql_batch_window is not None:
+            self.graphql_batcher = GraphQLBatcher(
+                self,
+                window=graphql_batch_window,
+                max_size=graphql_batch_size
+            )
+        else:
+            self.graphql_batcher = None
 
         self._jar = aiohttp.CookieJar()
         self.headers = {}
+        self._base_headers = None
+        self._base_headers_key = None
         self.device_id = self.client.auth.device_id
         self._endpoint_events = {}
+        self._inflight_requests = {}
+        self._pool_acquired = False
+        self._pool_connector = None
         self.__session = None
 
         # How many refreshes (max_refresh_attempts) to attempt in
@@ -432,54 +1696,88 @@ class HTTPClient:
         self.max_refresh_attempts = 3
         self.refresh_attempt_window = 20
 
-    @staticmethod
-    async def json_or_text(response: aiohttp.ClientResponse) -> Union[str,
-    dict]:
-        text = await response.text(encoding='utf-8')
+    async def json_or_text(self, response: aiohttp.ClientResponse
+                           ) -> Union[str, dict]:
+        body = await response.read()
         if 'application/json' in response.headers.get('content-type', ''):
-            return json.loads(text)
-        return text
+            # Decode straight from the bytes to avoid copying the whole
+            # body into a string first.
+            return self.client.json_codec.loads(body)
+        return body.decode('utf-8')
 
     @property
     def user_agent(self) -> str:
         return 'Fortnite/{0.client.build} {0.client.os}'.format(self)
 
+    _auth_getters = {
+        'IOS_BASIC_TOKEN': lambda a: 'basic {0}'.format(a.ios_token),
+        'FORTNITE_BASIC_TOKEN': lambda a: 'basic {0}'.format(a.fortnite_token),  # noqa
+        'IOS_ACCESS_TOKEN': lambda a: a.ios_authorization,
+        'FORTNITE_ACCESS_TOKEN': lambda a: a.authorization,
+    }
+
     def get_auth(self, auth: str) -> str:
-        u_auth = auth.upper()
-
-        if u_auth == 'IOS_BASIC_TOKEN':
-            return 'basic {0}'.format(self.client.auth.ios_token)
-        elif u_auth == 'FORTNITE_BASIC_TOKEN':
-            return 'basic {0}'.format(self.client.auth.fortnite_token)
-        elif u_auth == 'IOS_ACCESS_TOKEN':
-            return self.client.auth.ios_authorization
-        elif u_auth == 'FORTNITE_ACCESS_TOKEN':
-            return self.client.auth.authorization
-        return auth
+        try:
+            getter = self._auth_getters[auth]
+        except KeyError:
+            getter = self._auth_getters.get(auth.upper())
+            if getter is None:
+                return auth
+
+        return getter(self.client.auth)
+
+    def get_base_headers(self) -> MappingProxyType:
+        # The user agent is built from the client's build and os so
+        # rebuild the headers whenever one of them has been changed.
+        key = (self.client.build, self.client.os)
+        if self._base_headers is None or self._base_headers_key != key:
+            self._base_headers = MappingProxyType({
+                **self.headers,
+                'User-Agent': self.user_agent,
+            })
+            self._base_headers_key = key
+
+        return self._base_headers
 
     def add_header(self, key: str, val: Any) -> None:
         self.headers[key] = val
+        self._base_headers = None
 
     def remove_header(self, key: str) -> Any:
+        self._base_headers = None
         return self.headers.pop(key)
 
     async def close(self) -> None:
         self._jar.clear()
         if self.__session:
-            event = create_aiohttp_closed_event(self.__session)
-            await self.__session.close()
-            try:
-                await asyncio.wait_for(event.wait(), timeout=2)
-            except asyncio.TimeoutError:
-                pass
+            if self.__session.connector_owner:
+                event = create_aiohttp_closed_event(self.__session)
+                await self.__session.close()
+                try:
+                    await asyncio.wait_for(event.wait(), timeout=2)
+                except asyncio.TimeoutError:
+                    pass
+            else:
+                await self.__session.close()
+
+        if self._pool_acquired:
+            self._pool_acquired = False
+            await self.pool.release()
 
     def connection_exists(self) -> bool:
         return self.__session is not None
 
     def create_connection(self) -> None:
+        connector = self.connector
+        if connector is None and self.pool is not None:
+            if not self._pool_acquired:
+                self._pool_acquired = True
+                self._pool_connector = self.pool.acquire()
+            connector = self._pool_connector
+
         self.__session = aiohttp.ClientSession(
-            connector=self.connector,
-            connector_owner=self.connector is None,
+            connector=connector,
+            connector_owner=connector is None,
             cookie_jar=self._jar
         )
 
@@ -504,16 +1802,20 @@ class HTTPClient:
             if self.proxy_auth is not None:
                 kwargs['proxy_auth'] = self.proxy_auth
 
+        trace = self.client.wire_trace
         pre_time = time.time()
         async with self.__session.request(method, url, **kwargs) as r:
-            log.debug('{0} {1} {5}has returned {2.status} in {3:.2f}s with response size {4}'.format(
-                method,
-                url,
-                r,
-                time.time() - pre_time,
-                r.headers.get('content-length', 'unknown'),
-                'via proxy ' if 'proxy' in kwargs else ''
-            ))
+            if 'http.request' in trace:
+                trace.trace(
+                    'http.request',
+                    '{0} {1} {5}has returned {2.status} in {3:.2f}s with response size {4}',  # noqa
+                    method,
+                    url,
+                    r,
+                    time.time() - pre_time,
+                    r.headers.get('content-length', 'unknown'),
+                    'via proxy ' if 'proxy' in kwargs else ''
+                )
 
             data = await self.json_or_text(r)
             return r, data
@@ -525,8 +1827,12 @@ class HTTPClient:
                           **kwargs: Any) -> Any:
         url = route.url if not isinstance(route, str) else route
 
-        headers = {**kwargs.get('headers', {}), **self.headers}
-        headers['User-Agent'] = self.user_agent
+        base_headers = self.get_base_headers()
+        extra_headers = kwargs.get('headers')
+        if extra_headers:
+            headers = {**extra_headers, **base_headers}
+        else:
+            headers = base_headers.copy()
 
         auth = auth or route.AUTH
         if auth is not None:
@@ -545,6 +1851,17 @@ class HTTPClient:
             kwargs['json'] = [gql_query.as_multiple_payload()
                               for gql_query in graphql]
 
+        cache_key = kwargs.pop('cache_key', None)
+        cache_ttl = kwargs.pop('cache_ttl', None)
+        cache_entry = None
+        if cache_key is not None:
+            cache_entry = self.cache.get(cache_key)
+            if cache_entry is not None:
+                if cache_entry.etag is not None:
+                    headers['If-None-Match'] = cache_entry.etag
+                if cache_entry.last_modified is not None:
+                    headers['If-Modified-Since'] = cache_entry.last_modified
+
         kwargs['headers'] = headers
 
         try:
@@ -553,7 +1870,22 @@ class HTTPClient:
             pass
 
         raw = kwargs.pop('raw', False)
+        return_exceptions = kwargs.pop('graphql_return_exceptions', False)
+
+        pre_time = time.perf_counter()
         r, data = await self.request(method, url, **kwargs)
+        elapsed = time.perf_counter() - pre_time
+        self.metrics.record_request(
+            method,
+            route.sanitized_url if isinstance(route, Route) else url,
+            r.status,
+            elapsed,
+            r.content_length or 0,
+        )
+
+        latency = _chunk_latency.get()
+        if latency is not None:
+            latency[0] = max(latency[0], elapsed)
 
         if raw:
             return r
@@ -580,6 +1912,20 @@ class HTTPClient:
                                       'message': message
                                   },)
             else:
+                # Return every operations result or error separately
+                # instead of raising the first error found.
+                if return_exceptions:
+                    return [
+                        self._get_graphql_exception(
+                            r,
+                            route,
+                            child_data['errors'],
+                            headers
+                        ) if 'errors' in child_data
+                        else self._get_graphql_payload(child_data)
+                        for child_data in data
+                    ]
+
                 error_data = None
                 for child_data in data:
                     if 'errors' in child_data:
@@ -587,38 +1933,26 @@ class HTTPClient:
                         break
 
             if error_data is not None:
-                selected = error_data[0]
-
-                obj = {'errorMessage': selected['message']}
-                service_response = selected['serviceResponse']
-                if service_response == '':
-                    error_payload = {}
-                else:
-                    error_payload = json.loads(service_response)
-
-                if isinstance(error_payload, str):
-                    m = GRAPHQL_HTML_ERROR_PATTERN.search(error_payload)
-                    message = 'Unknown reason' if m is None else m.group(1)
-                    error_payload = {
-                        'errorMessage': message,
-                    }
-
-                    if m is not None:
-                        error_payload['errorStatus'] = int(m.group(2))
-
-                raise HTTPException(
+                raise self._get_graphql_exception(
                     r,
                     route,
-                    {**obj, **error_payload},
+                    error_data,
                     headers
                 )
 
-            def get_payload(d):
-                return next(iter(d['data'].values()))
-
             if len(data) == 1:
-                return get_payload(data[0])
-            return [get_payload(d) for d in data]
+                return self._get_graphql_payload(data[0])
+            return [self._get_graphql_payload(d) for d in data]
+
+        if cache_entry is not None and r.status == 304:
+            self.cache.set(
+                cache_key,
+                cache_entry.data,
+                cache_ttl,
+                cache_entry.etag,
+                cache_entry.last_modified
+            )
+            return copy.deepcopy(cache_entry.data)
 
         if 'errorCode' in data or r.status >= 400:
             if isinstance(data, str):
@@ -629,8 +1963,51 @@ class HTTPClient:
                 }
             raise HTTPException(r, route, data, headers)
 
+        if cache_key is not None:
+            self.cache.set(
+                cache_key,
+                copy.deepcopy(data),
+                cache_ttl,
+                r.headers.get('ETag'),
+                r.headers.get('Last-Modified')
+            )
+
         return data
 
+    @staticmethod
+    def _get_graphql_payload(data: dict) -> Any:
+        return next(iter(data['data'].values()))
+
+    def _get_graphql_exception(self, r: aiohttp.ClientResponse,
+                               route: Union[Route, str],
+                               error_data: list,
+                               headers: dict) -> HTTPException:
+        selected = error_data[0]
+
+        obj = {'errorMessage': selected['message']}
+        service_response = selected['serviceResponse']
+        if service_response == '':
+            error_payload = {}
+        else:
+            error_payload = self.client.json_codec.loads(service_response)
+
+        if isinstance(error_payload, str):
+            m = GRAPHQL_HTML_ERROR_PATTERN.search(error_payload)
+            message = 'Unknown reason' if m is None else m.group(1)
+            error_payload = {
+                'errorMessage': message,
+            }
+
+            if m is not None:
+                error_payload['errorStatus'] = int(m.group(2))
+
+        return HTTPException(
+            r,
+            route,
+            {**obj, **error_payload},
+            headers
+        )
+
     def get_retry_after(self, exc: HTTPException) -> Optional[int]:
         retry_after = exc.response.headers.get('Retry-After')
         if retry_after is not None:
@@ -644,64 +2021,238 @@ class HTTPClient:
         except (ValueError, IndexError):
             return None
 
+    def _get_coalesce_key(self, method: str,
+                          route: Union[Route, str],
+                          auth: Optional[str],
+                          kwargs: dict) -> Optional[tuple]:
+        # Only plain reads are safe to share between callers.
+        if method != 'GET' or kwargs.get('raw', False):
+            return None
+        if any(k not in ('params', 'headers') for k in kwargs):
+            return None
+
+        params = kwargs.get('params')
+        if isinstance(params, dict):
+            params = tuple(sorted(params.items()))
+        elif params is not None:
+            params = tuple(params)
+
+        headers = kwargs.get('headers')
+        if headers is not None:
+            headers = tuple(sorted(headers.items()))
+
+        if isinstance(route, Route):
+            url = route.url
+            auth = auth or route.AUTH
+        else:
+            url = route
+
+        identity = self.get_auth(auth) if auth is not None else None
+        return (method, url, params, headers, identity)
+
+    def _get_cache_key(self, method: str,
+                       route: Union[Route, str],
+                       shared: bool,
+                       kwargs: dict) -> tuple:
+        params = kwargs.get('params')
+        if isinstance(params, dict):
+            params = tuple(sorted(params.items()))
+        elif params is not None:
+            params = tuple(params)
+
+        payload = kwargs.get('json')
+        if payload is not None:
+            payload = json.dumps(payload, sort_keys=True)
+
+        url = route.url if isinstance(route, Route) else route
+        scope = None if shared else self.client.auth.account_id
+        return (method, url, params, payload, scope)
+
+    async def _coalesced_request(self, key: tuple,
+                                 method: str,
+                                 route: Union[Route, str],
+                                 auth: Optional[str],
+                                 priority: int,
+                                 **kwargs: Any) -> Any:
+        entry = self._inflight_requests.get(key)
+        if entry is not None:
+            future = entry[0]
+            entry[1] += 1
+
+            await asyncio.wait((future,))
+            if future.cancelled():
+                # The request we waited for was cancelled, so we have
+                # to do it ourself.
+                return await self.fn_request(method, route, auth,
+                                             priority=priority,
+                                             coalesce=True,
+                                             **kwargs)
+
+            # Every caller gets its own copy since callers are free to
+            # mutate the data they receive.
+            return copy.deepcopy(future.result())
+
+        future = asyncio.get_running_loop().create_future()
+        entry = self._inflight_requests[key] = [future, 0]
+        try:
+            data = await self.fn_request(method, route, auth,
+                                         priority=priority,
+                                         **kwargs)
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as exc:
+            future.set_exception(exc)
+
+            # Mark the exception as retrieved to avoid warnings if
+            # no other callers were waiting.
+            future.exception()
+            raise
+        else:
+            future.set_result(data)
+            return copy.deepcopy(data) if entry[1] > 0 else data
+        finally:
+            del self._inflight_requests[key]
+
     async def fn_request(self, method: str,
                          route: Union[Route, str],
                          auth: Optional[str] = None,
                          graphql: Union[Route, List[Route]] = None,
                          priority: int = 0,
+                         request_priority: RequestPriority = RequestPriority.DEFAULT,  # noqa
                          **kwargs: Any) -> Any:
         if self.client.is_closed():
             raise RuntimeError('Client is closed.')
 
+        cache_ttl = kwargs.pop('cache_ttl', None)
+        cache_shared = kwargs.pop('cache_shared', True)
+        if (cache_ttl is not None and self.cache is not None
+                and graphql is None and not kwargs.get('raw', False)):
+            key = self._get_cache_key(method, route, cache_shared, kwargs)
+            entry = self.cache.get(key)
+            if entry is not None and entry.is_fresh():
+                return copy.deepcopy(entry.data)
+
+            kwargs['cache_key'] = key
+            kwargs['cache_ttl'] = cache_ttl
+
+        # Identical concurrent reads can share a single request if
+        # the caller opts in.
+        if kwargs.pop('coalesce', False) and graphql is None:
+            key = self._get_coalesce_key(method, route, auth, kwargs)
+            if key is not None:
+                return await self._coalesced_request(
+                    key,
+                    method,
+                    route,
+                    auth,
+                    priority,
+                    request_priority=request_priority,
+                    **kwargs
+                )
+
         cfg = self.retry_config
+        limiter = self.rate_limiter
+        scheduler = self.scheduler
+        metrics = self.metrics
         if isinstance(route, Route):
             url = route.url
             url_key = (method, route.sanitized_url)
+            metrics_url = route.sanitized_url
         else:
             url = route
             url_key = None
+            metrics_url = route
+
+        breaker = None
+        if isinstance(route, Route) and cfg.circuit_breaker_threshold:
+            breaker = HTTPCircuitBreaker.get(route.BASE)
 
         tries = 0
         total_slept = 0
         backoff = cfg.backoff_start
+        capacity_sleep = cfg.backoff_start
+        retry_sleep = cfg.retry_backoff_start
         while True:
             sleep_time = 0
+            retry_reason = None
             tries += 1
 
             endpoint_event = self._endpoint_events.get(url_key)
             if endpoint_event is not None:
-                log.debug('Waiting for {0:.2f}s before requesting {1} {2}.'.format(  # noqa
+                log.debug(
+                    'Waiting for %.2fs before requesting %s %s.',
                     endpoint_event.ends_at - time.time(),
                     method,
                     url,
-                ))
+                )
+                pre_time = time.perf_counter()
                 await endpoint_event.wait()
+                metrics.record_wait(
+                    method,
+                    metrics_url,
+                    'endpoint_event',
+                    time.perf_counter() - pre_time
+                )
 
             endpoint_event = None
 
+            if url_key is not None:
+                delay = await limiter.acquire(method, route)
+                if delay > 0:
+                    metrics.record_wait(method, metrics_url, 'rate_limit',
+                                        delay)
+
             lock = self.client._reauth_lock
             if priority <= 0:
-                await lock.wait()
+                if lock.locked():
+                    pre_time = time.perf_counter()
+                    await lock.wait()
+                    metrics.record_wait(
+                        method,
+                        metrics_url,
+                        'reauth',
+                        time.perf_counter() - pre_time
+                    )
+                else:
+                    await lock.wait()
+
                 if lock.failed:
                     raise asyncio.CancelledError(
                         'Client is shutting down.'
                     )
 
             try:
-                return await self._fn_request(
-                    method,
-                    route,
-                    auth,
-                    graphql,
-                    **kwargs
-                )
+                # Only hold a slot while the request is in flight so
+                # that waiting for retries never blocks other requests.
+                if scheduler is not None:
+                    await scheduler.acquire(request_priority)
+                try:
+                    # Raises ServiceUnavailable if the service is known to
+                    # be down. Checked once a slot is held so that a probe
+                    # is never taken while waiting for one.
+                    probe = breaker is not None and breaker.before_request()
+                    try:
+                        data = await self._fn_request(
+                            method,
+                            route,
+                            auth,
+                            graphql,
+                            **kwargs
+                        )
+                    finally:
+                        if probe:
+                            breaker.release_probe()
+                finally:
+                    if scheduler is not None:
+                        scheduler.release(request_priority)
+
+                if url_key is not None:
+                    limiter.on_success(method, route)
+                if breaker is not None:
+                    breaker.on_success()
+                return data
             except HTTPException as exc:
-                if self.client._closing:
-                    raise
-
-                if tries >= cfg.max_retry_attempts:
-                    raise
-
                 code = exc.message_code
 
                 if graphql:
@@ -709,6 +2260,22 @@ class HTTPClient:
                 else:
                     gql_server_error = False
 
+                if breaker is not None:
+                    if (exc.status >= 500 or gql_server_error
+                            or code == 'errors.com.epicgames.common.server_error'):  # noqa
+                        breaker.on_failure(
+                            cfg.circuit_breaker_threshold,
+                            cfg.circuit_breaker_cooldown
+                        )
+                    else:
+                        breaker.on_success()
+
+                if self.client._closing:
+                    raise
+
+                if tries >= cfg.max_retry_attempts:
+                    raise
+
                 catch = (
                     'errors.com.epicgames.common.oauth.invalid_token',
                     'errors.com.epicgames.common.authentication.token_verification_failed',  # noqa
@@ -717,6 +2284,8 @@ class HTTPClient:
                 if code in catch:
                     _auth = auth or route.AUTH
                     if exc.request_headers['Authorization'] != self.get_auth(_auth):  # noqa
+                        metrics.record_retry(method, metrics_url,
+                                             'token_refresh')
                         continue
 
                     force_attempts = self.max_refresh_attempts
@@ -762,6 +2331,8 @@ class HTTPClient:
                             retry = False
 
                     if retry:
+                        metrics.record_retry(method, metrics_url,
+                                             'token_refresh')
                         continue
                     else:
                         try:
@@ -777,7 +2348,11 @@ class HTTPClient:
 
                 elif code == 'errors.com.epicgames.common.throttled' or exc.status == 429:  # noqa
                     retry_after = self.get_retry_after(exc)
+                    if retry_after is not None and url_key is not None:
+                        limiter.on_throttle(method, route, retry_after)
+
                     if retry_after is not None and cfg.handle_rate_limits:
+                        retry_reason = 'throttle'
                         if retry_after <= cfg.max_retry_after:
                             sleep_time = retry_after + 0.5
                             if cfg.other_requests_wait and url_key is not None:
@@ -786,36 +2361,67 @@ class HTTPClient:
                                     endpoint_event.ends_at = time.time() + sleep_time  # noqa
                                     self._endpoint_events[url_key] = endpoint_event  # noqa
                     else:
+                        retry_reason = 'capacity_throttle'
                         tries -= 1  # backoff tries shouldn't count
                         if cfg.handle_capacity_throttling:
                             backoff *= cfg.backoff_factor
                             if backoff <= cfg.backoff_cap:
-                                sleep_time = backoff
+                                if cfg.jitter:
+                                    capacity_sleep = cfg._jitter(
+                                        capacity_sleep,
+                                        cfg.backoff_start,
+                                        backoff
+                                    )
+                                    sleep_time = capacity_sleep
+                                else:
+                                    sleep_time = backoff
 
                 elif (code == 'errors.com.epicgames.common.concurrent_modification_error'  # noqa
                       or code == 'errors.com.epicgames.common.server_error'
                       or gql_server_error):  # noqa
-                    sleep_time = 0.5 + (tries - 1) * 2
+                    if code == 'errors.com.epicgames.common.concurrent_modification_error':  # noqa
+                        retry_reason = 'concurrent_modification'
+                    else:
+                        retry_reason = 'server_error'
+
+                    retry_sleep = cfg.get_retry_backoff(tries, retry_sleep)
+                    sleep_time = retry_sleep
 
                 if sleep_time > 0:
                     total_slept += sleep_time
                     if cfg.max_wait_time and total_slept > cfg.max_wait_time:
                         raise
 
-                    log.debug('Retrying {0} {1} in {2:.2f}s.'.format(
-                        method,
-                        url,
-                        sleep_time
-                    ))
+                    metrics.record_retry(method, metrics_url, retry_reason)
+                    metrics.record_wait(method, metrics_url, 'retry',
+                                        sleep_time)
+
+                    log.debug('Retrying %s %s in %.2fs.', method, url,
+                              sleep_time)
                     await asyncio.sleep(sleep_time)
                     continue
                 raise
 
             except aiohttp.ServerDisconnectedError:
-                await asyncio.sleep(0.5 + (tries - 1) * 2)
+                if breaker is not None:
+                    breaker.on_failure(
+                        cfg.circuit_breaker_threshold,
+                        cfg.circuit_breaker_cooldown
+                    )
+
+                metrics.record_retry(method, metrics_url, 'disconnect')
+                retry_sleep = cfg.get_retry_backoff(tries, retry_sleep)
+                await asyncio.sleep(retry_sleep)
                 continue
             except OSError as exc:
+                if breaker is not None:
+                    breaker.on_failure(
+                        cfg.circuit_breaker_threshold,
+                        cfg.circuit_breaker_cooldown
+                    )
+
                 if exc.errno in (54, 10054):
+                    metrics.record_retry(method, metrics_url, 'disconnect')
                     continue
                 raise
 
@@ -853,6 +2459,10 @@ class HTTPClient:
     List[GraphQLRequest]],
                               auth: Optional[str] = None,
                               **kwargs: Any) -> Any:
+        batcher = self.graphql_batcher
+        if batcher is not None and batcher.can_batch(graphql, kwargs):
+            return await batcher.request(graphql, auth, **kwargs)
+
         return await self.fn_request('POST', EpicGamesGraphQL(), auth, graphql,
                                      **kwargs)
 
@@ -1033,7 +2643,8 @@ class HTTPClient:
         params = {'serviceId': service_id} if service_id else None
 
         r = LightswitchPublicService('/lightswitch/api/service/bulk/status')
-        return await self.get(r, params=params)
+        return await self.get(r, params=params, cache_ttl=30,
+                              cache_shared=False)
 
     ###################################
     #           User Search           #
@@ -1159,6 +2770,7 @@ class HTTPClient:
             '/account/api/public/account/{user_id}',
             user_id=user_id
         )
+        kwargs.setdefault('coalesce', True)
         return await self.get(r, auth=auth, **kwargs)
 
     async def account_get_by_email(self, email: str) -> dict:
@@ -1181,6 +2793,8 @@ class HTTPClient:
                                               **kwargs: Any) -> list:
         params = [('accountId', user_id) for user_id in user_ids]
         r = AccountPublicService('/account/api/public/account')
+        kwargs.setdefault('coalesce', True)
+        kwargs.setdefault('request_priority', RequestPriority.BULK)
         return await self.get(r, params=params, **kwargs)
 
     async def account_graphql_get_multiple_by_user_id(self,
@@ -1213,9 +2827,9 @@ class HTTPClient:
             }
         ), **kwargs)
 
-    async def account_graphql_get_by_display_name(self,
-                                                  display_name: str) -> dict:
-        return await self.graphql_request(GraphQLRequest(
+    @staticmethod
+    def _account_by_display_name_query(display_name: str) -> GraphQLRequest:
+        return GraphQLRequest(
             query="""
             query AccountQuery($displayName: String!) {
                 Account {
@@ -1235,7 +2849,34 @@ class HTTPClient:
             variables={
                 'displayName': display_name
             }
-        ))
+        )
+
+    async def account_graphql_get_by_display_name(self,
+                                                  display_name: str) -> dict:
+        return await self.graphql_request(
+            self._account_by_display_name_query(display_name)
+        )
+
+    async def account_graphql_get_multiple_by_display_name(
+            self,
+            display_names: List[str],
+            **kwargs: Any) -> List[dict]:
+        # Sent as a single request with one operation per display name.
+        # The result of an operation that failed is None so one bad name
+        # doesn't fail the others.
+        results = await self.graphql_request([
+            self._account_by_display_name_query(display_name)
+            for display_name in display_names
+        ], graphql_return_exceptions=True, **kwargs)
+
+        for result in results:
+            # Transient errors fail the batch so that it can be retried.
+            if (isinstance(result, HTTPException)
+                    and result.message_code in GraphQLBatcher.RETRYABLE_CODES):  # noqa
+                raise result
+
+        return [None if isinstance(r, HTTPException) else r
+                for r in results]
 
     async def account_graphql_get_clients_external_auths(self,
                                                          **kwargs: Any
@@ -1288,7 +2929,8 @@ class HTTPClient:
             '/api/v1/discovery/surface/{client_id}',
             client_id=self.client.user.id,
         )
-        return await self.post(r, json=payload, params=params)
+        return await self.post(r, json=payload, params=params,
+                               cache_ttl=300, cache_shared=False)
 
     async def check_fortnite_access(self) -> dict:
         r = MCPService('/fortnite/api/accesscontrol/status')
@@ -1333,7 +2975,7 @@ class HTTPClient:
 
     async def fortnite_get_store_catalog(self) -> dict:
         r = FortnitePublicService('/fortnite/api/storefront/v2/catalog')
-        return await self.get(r)
+        return await self.get(r, cache_ttl=60)
 
     async def fortnite_check_gift_eligibility(self,
                                               user_id: str,
@@ -1347,7 +2989,7 @@ class HTTPClient:
 
     async def fortnite_get_timeline(self) -> dict:
         r = FortnitePublicService('/fortnite/api/calendar/v1/timeline')
-        return await self.get(r)
+        return await self.get(r, cache_ttl=60)
 
     async def query_profile(self, profile_id: Literal['athena', 'campaign', 'common_core']) -> dict:
         r = FortnitePublicService(
@@ -1468,7 +3110,7 @@ class HTTPClient:
 
     async def fortnitecontent_get(self) -> dict:
         r = FortniteContentWebsite('/content/api/pages/fortnite-game')
-        return await self.get(r)
+        return await self.get(r, cache_ttl=300)
 
     ###################################
     #            Friends              #
@@ -1541,6 +3183,7 @@ class HTTPClient:
     async def friends_get_summary(self, **kwargs) -> dict:
         r = FriendsPublicService('/friends/api/v1/{client_id}/summary',
                                  client_id=self.client.user.id)
+        kwargs.setdefault('coalesce', True)
         return await self.get(r, **kwargs)
 
     async def friends_block(self, user_id: str) -> Any:
@@ -1615,7 +3258,8 @@ class HTTPClient:
             payload['endDate'] = end_time
 
         r = StatsproxyPublicService('/statsproxy/api/statsv2/query')
-        return await self.post(r, json=payload, params=params)
+        return await self.post(r, json=payload, params=params,
+                               request_priority=RequestPriority.BULK)
 
     async def stats_get_leaderboard_v2(self, stat: str) -> dict:
         r = StatsproxyPublicService(
@@ -1634,7 +3278,7 @@ class HTTPClient:
             params['endsAfter'] = ends_after
 
         r = RankedService('/api/v1/games/fortnite/tracks/query')
-        return await self.get(r)
+        return await self.get(r, cache_ttl=3600)
 
     async def get_ranked_stats(self, user_id: str, *, ends_after: Optional[str] = None) -> dict:
         params = {}
@@ -1655,7 +3299,8 @@ class HTTPClient:
         }
 
         r = AvatarService('/v1/avatar/fortnite/ids')
-        return await self.get(r, params=params)
+        return await self.get(r, params=params,
+                              request_priority=RequestPriority.BULK)
 
     ###################################
     #             Party               #
@@ -1690,7 +3335,8 @@ class HTTPClient:
             party_id=party_id,
             user_id=user_id
         )
-        return await self.post(r, json=payload, params=params)
+        return await self.post(r, json=payload, params=params,
+                               request_priority=RequestPriority.INTERACTIVE)
 
     async def party_delete_invite(self, party_id: str, user_id: str) -> Any:
         r = PartyService(
@@ -1735,7 +3381,8 @@ class HTTPClient:
             party_id=party_id,
             user_id=user_id
         )
-        return await self.post(r, json={})
+        return await self.post(r, json={},
+                               request_priority=RequestPriority.INTERACTIVE)
 
     async def party_member_reject(self, party_id: str, user_id: str) -> Any:
         r = PartyService(
@@ -1753,7 +3400,8 @@ class HTTPClient:
             party_id=party_id,
             user_id=user_id
         )
-        return await self.post(r, json={})
+        return await self.post(r, json={},
+                               request_priority=RequestPriority.INTERACTIVE)
 
     async def party_kick_member(self, party_id: str, user_id: str) -> Any:
         r = PartyService(
@@ -1761,10 +3409,12 @@ class HTTPClient:
             party_id=party_id,
             user_id=user_id
         )
-        return await self.delete(r)
+        return await self.delete(r,
+                                 request_priority=RequestPriority.INTERACTIVE)
 
     async def party_leave(self, party_id: str, **kwargs: Any) -> Any:
         conn_type = self.client.default_party_member_config.cls.CONN_TYPE
+        dumps = self.client.json_codec.dumps
         payload = {
             'connection': {
                 'id': self.client.user.jid,
@@ -1777,7 +3427,7 @@ class HTTPClient:
                 'urn:epic:member:dn_s': self.client.user.display_name,
                 'urn:epic:member:type_s': conn_type,
                 'urn:epic:member:platform_s': self.client.platform.value,
-                'urn:epic:member:joinrequest_j': json.dumps({
+                'urn:epic:member:joinrequest_j': dumps({
                     'CrossplayPreference_i': '1'
                 }),
             }
@@ -1793,6 +3443,7 @@ class HTTPClient:
     async def party_join_request(self, party_id: str) -> Any:
         conf = self.client.default_party_member_config
         conn_type = conf.cls.CONN_TYPE
+        dumps = self.client.json_codec.dumps
         payload = {
             'connection': {
                 'id': str(self.client.xmpp.xmpp_client.local_jid),
@@ -1805,13 +3456,13 @@ class HTTPClient:
             },
             'meta': {
                 'urn:epic:member:dn_s': self.client.user.display_name,
-                'urn:epic:member:joinrequestusers_j': json.dumps({
+                'urn:epic:member:joinrequestusers_j': dumps({
                     'users': [
                         {
                             'id': self.client.user.id,
                             'dn': self.client.user.display_name,
                             'plat': self.client.platform.value,
-                            'data': json.dumps({
+                            'data': dumps({
                                 'CrossplayPreference': '1',
                                 'SubGame_u': '1',
                             })
@@ -1827,7 +3478,8 @@ class HTTPClient:
             party_id=party_id,
             client_id=self.client.user.id
         )
-        return await self.post(r, json=payload)
+        return await self.post(r, json=payload,
+                               request_priority=RequestPriority.INTERACTIVE)
 
     async def party_send_intention(self, user_id: str) -> dict:
         payload = {
@@ -1844,6 +3496,7 @@ class HTTPClient:
     async def party_lookup(self, party_id: str, **kwargs: Any) -> dict:
         r = PartyService('/party/api/v1/Fortnite/parties/{party_id}',
                          party_id=party_id)
+        kwargs.setdefault('coalesce', True)
         return await self.get(r, **kwargs)
 
     async def party_lookup_user(self, user_id: str, **kwargs: Any) -> dict:
@@ -1919,6 +3572,7 @@ class HTTPClient:
             party_id=party_id,
             user_id=user_id
         )
+        kwargs.setdefault('request_priority', RequestPriority.INTERACTIVE)
         return await self.patch(r, json=payload, **kwargs)
 
     async def party_update_meta(self, party_id: str,
@@ -1942,4 +3596,5 @@ class HTTPClient:
 
         r = PartyService('/party/api/v1/Fortnite/parties/{party_id}',
                          party_id=party_id)
+        kwargs.setdefault('request_priority', RequestPriority.INTERACTIVE)
         return await self.patch(r, json=payload, **kwargs)
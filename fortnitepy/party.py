@@ -22,7 +22,6 @@ OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 SOFTWARE.
 """
 
-import json
 import asyncio
 import aioxmpp
 import re
@@ -39,7 +38,7 @@ from .user import User
 from .friend import Friend
 from .enums import (PartyPrivacy, PartyDiscoverability, PartyJoinability,
                     DefaultCharactersChapter2, Region, ReadyState, Platform)
-from .utils import MaybeLock, to_iso, from_iso
+from .utils import MaybeLock, JSONCodec, to_iso, from_iso
 
 if TYPE_CHECKING:
     from .client import Client
@@ -504,8 +503,9 @@ class Patchable:
 
 
 class MetaBase:
-    def __init__(self) -> None:
+    def __init__(self, json_codec: Optional[JSONCodec] = None) -> None:
         self.schema = {}
+        self.json_codec = json_codec or JSONCodec()
 
     def set_prop(self, prop: str, value: Any, *,
                  raw: bool = False) -> Any:
@@ -515,7 +515,7 @@ class MetaBase:
 
         _t = prop[-1:]
         if _t == 'j':
-            self.schema[prop] = json.dumps(value)
+            self.schema[prop] = self.json_codec.dumps(value)
         elif _t == 'U':
             self.schema[prop] = int(value)
         else:
@@ -532,7 +532,7 @@ class MetaBase:
             return not (_v is None or (isinstance(_v, str)
                         and _v.lower() == 'false'))
         elif _t == 'j':
-            return {} if _v is None else json.loads(_v)
+            return {} if _v is None else self.json_codec.loads(_v)
         elif _t == 'U':
             return 0 if _v is None else int(_v)
         else:
@@ -568,7 +568,7 @@ class MetaBase:
 class PartyMemberMeta(MetaBase):
     def __init__(self, member: 'PartyMemberBase',
                  meta: Optional[dict] = None) -> None:
-        super().__init__()
+        super().__init__(json_codec=member.client.json_codec)
         self.member = member
 
         self.meta_ready_event = asyncio.Event()
@@ -577,14 +577,14 @@ class PartyMemberMeta(MetaBase):
         self.def_character = DefaultCharactersChapter2.get_random_name()
         self.schema = {
             'Default:Location_s': 'PreLobby',
-            'Default:CampaignHero_j': json.dumps({
+            'Default:CampaignHero_j': self.json_codec.dumps({
                 'CampaignHero': {
                     'heroItemInstanceId': '',
                     'heroType': ("FortHeroType'/Game/Athena/Heroes/{0}.{0}'"
                                  "".format(self.def_character)),
                 },
             }),
-            'Default:CampaignInfo_j': json.dumps({
+            'Default:CampaignInfo_j': self.json_codec.dumps({
                 'CampaignInfo': {
                     'matchmakingLevel': 0,
                     'zoneInstanceId': '',
@@ -594,7 +594,7 @@ class PartyMemberMeta(MetaBase):
             'Default:MatchmakingLevel_U': '0',
             'Default:ZoneInstanceId_s': '',
             'Default:HomeBaseVersion_U': '1',
-            'Default:FrontendEmote_j': json.dumps({
+            'Default:FrontendEmote_j': self.json_codec.dumps({
                 'FrontendEmote': {
                     'emoteItemDef': 'None',
                     'emoteItemDefEncryptionKey': '',
@@ -603,7 +603,7 @@ class PartyMemberMeta(MetaBase):
             }),
             'Default:NumAthenaPlayersLeft_U': '0',
             'Default:UtcTimeStartedMatchAthena_s': '0001-01-01T00:00:00.000Z',
-            'Default:LobbyState_j': json.dumps({
+            'Default:LobbyState_j': self.json_codec.dumps({
                 'LobbyState': {
                     'inGameReadyCheckStatus': None,
                     'gameReadiness': 'NotReady',
@@ -613,7 +613,7 @@ class PartyMemberMeta(MetaBase):
                     'hasPreloadedAthena': False,
                 },
             }),
-            'Default:FrontEndMapMarker_j': json.dumps({
+            'Default:FrontEndMapMarker_j': self.json_codec.dumps({
                 'FrontEndMapMarker': {
                     'markerLocation': {
                         'x': 0,
@@ -622,13 +622,13 @@ class PartyMemberMeta(MetaBase):
                     'bIsSet': False,
                 }
             }),
-            'Default:AssistedChallengeInfo_j': json.dumps({
+            'Default:AssistedChallengeInfo_j': self.json_codec.dumps({
                 'AssistedChallengeInfo': {
                     'questItemDef': 'None',
                     'objectivesCompleted': 0,
                 },
             }),
-            'Default:MemberSquadAssignmentRequest_j': json.dumps({
+            'Default:MemberSquadAssignmentRequest_j': self.json_codec.dumps({
                 'MemberSquadAssignmentRequest': {
                     'startingAbsoluteIdx': -1,
                     'targetAbsoluteIdx': -1,
@@ -636,7 +636,7 @@ class PartyMemberMeta(MetaBase):
                     'version': 0,
                 },
             }),
-            'Default:AthenaCosmeticLoadout_j': json.dumps({
+            'Default:AthenaCosmeticLoadout_j': self.json_codec.dumps({
                 'AthenaCosmeticLoadout': {
                     'characterDef': ("AthenaCharacterItemDefinition'/Game/"
                                      "Athena/Items/Cosmetics/Characters/"
@@ -653,22 +653,22 @@ class PartyMemberMeta(MetaBase):
                     'scratchpad': [],
                 },
             }),
-            'Default:AthenaCosmeticLoadoutVariants_j': json.dumps({
+            'Default:AthenaCosmeticLoadoutVariants_j': self.json_codec.dumps({
                 'AthenaCosmeticLoadoutVariants': {
                     'vL': {}
                 }
             }),
-            'Default:ArbitraryCustomDataStore_j': json.dumps({
+            'Default:ArbitraryCustomDataStore_j': self.json_codec.dumps({
                 'ArbitraryCustomDataStore': []
             }),
-            'Default:AthenaBannerInfo_j': json.dumps({
+            'Default:AthenaBannerInfo_j': self.json_codec.dumps({
                 'AthenaBannerInfo': {
                     'bannerIconId': 'standardbanner15',
                     'bannerColorId': 'defaultcolor15',
                     'seasonLevel': 1,
                 },
             }),
-            'Default:BattlePassInfo_j': json.dumps({
+            'Default:BattlePassInfo_j': self.json_codec.dumps({
                 'BattlePassInfo': {
                     'bHasPurchasedPass': False,
                     'passLevel': 1,
@@ -676,7 +676,7 @@ class PartyMemberMeta(MetaBase):
                     'friendBoostXp': 0,
                 },
             }),
-            'Default:PlatformData_j': json.dumps({
+            'Default:PlatformData_j': self.json_codec.dumps({
                 'PlatformData': {
                     'platform': {
                         'platformDescription': {
@@ -1065,7 +1065,7 @@ class PartyMemberMeta(MetaBase):
 class PartyMeta(MetaBase):
     def __init__(self, party: 'PartyBase',
                  meta: Optional[dict] = None) -> None:
-        super().__init__()
+        super().__init__(json_codec=party.client.json_codec)
         self.party = party
 
         self.meta_ready_event = asyncio.Event()
@@ -1088,12 +1088,12 @@ class PartyMeta(MetaBase):
             'Default:ZoneInstanceId_s': '',
             'Default:SpectateAPartyMemberAvailable_b': 'false',
             'Default:TheaterId_s': '',
-            'Default:TileStates_j': json.dumps({
+            'Default:TileStates_j': self.json_codec.dumps({
                 'TileStates': [],
             }),
             'Default:MatchmakingInfoString_s': '',
             'Default:CustomMatchKey_s': '',
-            'Default:PlaylistData_j': json.dumps({
+            'Default:PlaylistData_j': self.json_codec.dumps({
                 'PlaylistData': {
                     'playlistName': 'Playlist_DefaultDuo',
                     'tournamentId': '',
@@ -1106,16 +1106,16 @@ class PartyMeta(MetaBase):
             'Default:LFGTime_s': '0001-01-01T00:00:00.000Z',
             'Default:PartyIsJoinedInProgress_b': 'false',
             'Default:GameSessionKey_s': '',
-            'Default:RawSquadAssignments_j': json.dumps({
+            'Default:RawSquadAssignments_j': self.json_codec.dumps({
                 'RawSquadAssignments': []
             }),
-            'Default:PrivacySettings_j': json.dumps({
+            'Default:PrivacySettings_j': self.json_codec.dumps({
                 'PrivacySettings': privacy_settings,
             }),
-            'Default:PlatformSessions_j': json.dumps({
+            'Default:PlatformSessions_j': self.json_codec.dumps({
                 'PlatformSessions': [],
             }),
-            'Default:PartyMatchmakingInfo_j': json.dumps({
+            'Default:PartyMatchmakingInfo_j': self.json_codec.dumps({
                 'PartyMatchmakingInfo': {
                     'buildId': -1,
                     'hotfixVersion': -1,
@@ -3167,7 +3167,9 @@ class PartyBase:
 
         if _update_squad_assignments:
             if self.leader.id != self.client.user.id:
-                _assignments = json.loads(_assignments)['RawSquadAssignments']
+                _assignments = self.client.json_codec.loads(
+                    _assignments
+                )['RawSquadAssignments']
                 self._update_squad_assignments(_assignments)
 
     def _update_roles(self, new_leader: PartyMemberBase) -> None:
@@ -3526,12 +3528,19 @@ class ClientParty(PartyBase, Patchable):
     async def send(self, content: str) -> None:
         """|coro|
 
-        Sends a message to this party's chat.
+        Sends a message to this party's chat. Returns once the message
+        has been sent.
 
         Parameters
         ----------
         content: :class:`str`
             The content of the message.
+
+        Raises
+        ------
+        XMPPError
+            Too many messages are already waiting to be sent to this
+            destination. See :class:`ChatScheduler`.
         """
         await self.client.xmpp.send_party_message(content)
 
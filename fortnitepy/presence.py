@@ -27,7 +27,7 @@ SOFTWARE.
 import re
 import datetime
 
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Any, Callable, Optional
 
 from .errors import Forbidden, PartyError
 from .enums import Platform
@@ -38,6 +38,35 @@ if TYPE_CHECKING:
     from .party import ClientParty
 
 
+class _cached_slot:
+    """Computes an attribute on first access and caches it in the slot
+    of the same name prefixed with an underscore."""
+
+    __slots__ = ('func', 'slot')
+
+    def __init__(self, func: Callable) -> None:
+        self.func = func
+        self.slot = None
+
+    def __set_name__(self, owner: type, name: str) -> None:
+        self.slot = owner.__dict__['_' + name]
+
+    def __get__(self, instance: Any, owner: type) -> Any:
+        if instance is None:
+            return self
+
+        try:
+            return self.slot.__get__(instance, owner)
+        except AttributeError:
+            value = self.func(instance)
+            self.slot.__set__(instance, value)
+            return value
+
+
+def _int_or_none(value: Any) -> Optional[int]:
+    return int(value) if value is not None else None
+
+
 class PresenceGameplayStats:
     """Represents gameplaystats received from presence.
 
@@ -275,24 +304,25 @@ class Presence:
 
     __slots__ = ('client', 'available', 'away', 'friend', 'platform',
                  'received_at', 'status', 'playing', 'joinable',
-                 'has_voice_support', 'session_id',
-                 'has_properties', 'homebase_rating', 'lfg',
-                 'sub_game', 'in_unjoinable_match', 'playlist', 'party_size',
-                 'max_party_size', 'game_session_join_key',
-                 'server_player_count', 'gameplay_stats', 'party')
+                 'has_voice_support', 'session_id', '_properties',
+                 '_homebase_rating', '_lfg', '_sub_game',
+                 '_in_unjoinable_match', '_playlist', '_party_size',
+                 '_max_party_size', '_game_session_join_key',
+                 '_server_player_count', '_gameplay_stats', '_party')
 
     def __init__(self, client: 'Client',
                  from_id: str,
                  platform: str,
                  available: bool,
                  away: bool,
-                 data: dict) -> None:
+                 data: dict,
+                 received_at: Optional[datetime.datetime] = None) -> None:
         self.client = client
         self.available = available
         self.away = away
         self.friend = self.client.get_friend(from_id)
         self.platform = Platform(platform)
-        self.received_at = datetime.datetime.utcnow()
+        self.received_at = received_at or datetime.datetime.utcnow()
 
         self.status = data['Status']
         self.playing = data['bIsPlaying']
@@ -301,65 +331,72 @@ class Presence:
         self.session_id = (data['SessionId'] if
                            data['SessionId'] != "" else None)
 
-        raw_properties = data.get('Properties', {})
-        self.has_properties = raw_properties != {}
-
-        # All values below will be "None" if properties is empty.
+        # Everything below is parsed from the properties the first time
+        # it is accessed. All values will be "None" if properties is empty.
+        self._properties = data.get('Properties', {})
 
-        _basic_info = raw_properties.get('FortBasicInfo_j', {})
-        self.homebase_rating = _basic_info.get('homeBaseRating')
+    @property
+    def has_properties(self) -> bool:
+        return self._properties != {}
 
-        if raw_properties.get('FortLFG_I') is None:
-            self.lfg = None
-        else:
-            self.lfg = int(raw_properties.get('FortLFG_I')) == 1
-
-        self.sub_game = raw_properties.get('FortSubGame_i')
-
-        self.in_unjoinable_match = raw_properties.get(
-            'InUnjoinableMatch_b'
+    @_cached_slot
+    def homebase_rating(self) -> Optional[str]:
+        return self._properties.get('FortBasicInfo_j', {}).get(
+            'homeBaseRating'
         )
-        if self.in_unjoinable_match is not None:
-            self.in_unjoinable_match = int(self.in_unjoinable_match)
-
-        self.playlist = raw_properties.get('GamePlaylistName_s')
-
-        players_alive = raw_properties.get('Event_PlayersAlive_s')
-        if players_alive is not None:
-            players_alive = int(players_alive)
 
-        self.party_size = raw_properties.get('Event_PartySize_s')
-        if self.party_size is not None:
-            self.party_size = int(self.party_size)
-
-        self.max_party_size = raw_properties.get('Event_PartyMaxSize_s')
-        if self.max_party_size is not None:
-            self.max_party_size = int(self.max_party_size)
-
-        self.game_session_join_key = raw_properties.get(
-            'GameSessionJoinKey_s'
+    @_cached_slot
+    def lfg(self) -> Optional[bool]:
+        value = self._properties.get('FortLFG_I')
+        return int(value) == 1 if value is not None else None
+
+    @_cached_slot
+    def sub_game(self) -> Optional[str]:
+        return self._properties.get('FortSubGame_i')
+
+    @_cached_slot
+    def in_unjoinable_match(self) -> Optional[int]:
+        return _int_or_none(self._properties.get('InUnjoinableMatch_b'))
+
+    @_cached_slot
+    def playlist(self) -> Optional[str]:
+        return self._properties.get('GamePlaylistName_s')
+
+    @_cached_slot
+    def party_size(self) -> Optional[int]:
+        return _int_or_none(self._properties.get('Event_PartySize_s'))
+
+    @_cached_slot
+    def max_party_size(self) -> Optional[int]:
+        return _int_or_none(self._properties.get('Event_PartyMaxSize_s'))
+
+    @_cached_slot
+    def game_session_join_key(self) -> Optional[str]:
+        return self._properties.get('GameSessionJoinKey_s')
+
+    @_cached_slot
+    def server_player_count(self) -> Optional[int]:
+        return _int_or_none(self._properties.get('ServerPlayerCount_i'))
+
+    @_cached_slot
+    def gameplay_stats(self) -> Optional[PresenceGameplayStats]:
+        properties = self._properties
+        if 'FortGameplayStats_j' not in properties:
+            return None
+
+        return PresenceGameplayStats(
+            self.friend,
+            properties['FortGameplayStats_j'],
+            _int_or_none(properties.get('Event_PlayersAlive_s'))
         )
 
-        self.server_player_count = raw_properties.get(
-            'ServerPlayerCount_i'
-        )
-        if self.server_player_count is not None:
-            self.server_player_count = int(self.server_player_count)
-
-        if 'FortGameplayStats_j' in raw_properties:
-            self.gameplay_stats = PresenceGameplayStats(
-                self.friend,
-                raw_properties['FortGameplayStats_j'],
-                players_alive
-            )
-        else:
-            self.gameplay_stats = None
+    @_cached_slot
+    def party(self) -> Optional[PresenceParty]:
+        data = self._properties.get('party.joininfodata.286331153_j')
+        if data is None:
+            return None
 
-        key = "party.joininfodata.286331153_j"
-        if key is None:
-            self.party = None
-        else:
-            self.party = PresenceParty(self.client, raw_properties[key])
+        return PresenceParty(self.client, data)
 
     def __repr__(self) -> str:
         return ('<Presence friend={0.friend!r} available={0.available} '
@@ -25,9 +25,11 @@ SOFTWARE.
 
 import contextlib
 import logging
+import time
 
 from aioxmpp import JID
-from typing import TYPE_CHECKING, Any, List, Optional
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Any, List, Optional, Iterator
 from .enums import UserSearchPlatform, UserSearchMatchType, StatsCollectionType
 from .typedefs import DatetimeOrTimestamp
 from .errors import Forbidden
@@ -353,6 +355,7 @@ class UserBase:
         )
 
         self._id = data.get('id', data.get('accountId', data.get('account_id')))  # noqa
+        self.client._users._reindex(self)
 
     def _update_external_auths(self, external_auths: List[dict], *,
                                extra_external_auths: Optional[List[dict]] = None  # noqa
@@ -378,6 +381,7 @@ class UserBase:
 
     def _update_epicgames_display_name(self, display_name: str) -> None:
         self._epicgames_display_name = display_name
+        self.client._users._reindex(self)
 
     def get_raw(self) -> dict:
         return {
@@ -626,3 +630,225 @@ class SacSearchEntryUser(User):
                 'id={0.id!r} '
                 'display_name={0.display_name!r} '
                 'epicgames_account={0.epicgames_account!r}>'.format(self))
+
+
+class UserCache:
+    """The cache the client stores :class:`User` objects in.
+
+    Users are indexed by their id and by their case-folded display name
+    so looking them up by either doesn't require scanning the cache.
+
+    A cache must not be shared between clients.
+
+    Parameters
+    ----------
+    max_size: Optional[:class:`int`]
+        The max amount of users to keep. The least recently used user is
+        evicted when the cache is full. ``None`` means no limit.
+        Defaults to ``10000``.
+    ttl: Optional[:class:`float`]
+        The amount of seconds a user is kept after it was stored.
+        ``None`` means users never expire. Defaults to ``None``.
+    index_external_auths: :class:`bool`
+        Whether users should also be indexed by the ids of their external
+        auths so they can be looked up with :meth:`get_by_external_id()`.
+        Defaults to ``False``.
+
+    Attributes
+    ----------
+    hits: :class:`int`
+        The amount of lookups that found a user.
+    misses: :class:`int`
+        The amount of lookups that didn't find a user.
+    evictions: :class:`int`
+        The amount of users evicted because the cache was full or they
+        expired.
+    """
+
+    def __init__(self, *, max_size: Optional[int] = 10000,
+                 ttl: Optional[float] = None,
+                 index_external_auths: bool = False) -> None:
+        self.max_size = max_size
+        self.ttl = ttl
+        self.index_external_auths = index_external_auths
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        self._entries = OrderedDict()
+        self._expires_at = {}
+        self._names = {}
+        self._external_ids = {}
+        self._keys = {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, user_id: str) -> bool:
+        return user_id in self._entries
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(list(self._entries))
+
+    def __getitem__(self, user_id: str) -> 'User':
+        user = self.get(user_id)
+        if user is None:
+            raise KeyError(user_id)
+        return user
+
+    def __setitem__(self, user_id: str, user: 'User') -> None:
+        self.set(user)
+
+    def __repr__(self) -> str:
+        return ('<UserCache size={0} hits={1.hits} misses={1.misses} '
+                'evictions={1.evictions}>'.format(len(self), self))
+
+    @property
+    def hit_ratio(self) -> Optional[float]:
+        """Optional[:class:`float`]: The ratio of lookups that found a user.
+        ``None`` if nothing has been looked up yet."""
+        total = self.hits + self.misses
+        if total == 0:
+            return None
+        return self.hits / total
+
+    def values(self) -> List['User']:
+        return list(self._entries.values())
+
+    def _is_expired(self, user_id: str) -> bool:
+        if self.ttl is None:
+            return False
+        return self._expires_at[user_id] <= time.monotonic()
+
+    def _lookup(self, user_id: Optional[str]) -> Optional['User']:
+        user = self._entries.get(user_id)
+        if user is None:
+            self.misses += 1
+            return None
+
+        if self._is_expired(user_id):
+            self._remove(user_id)
+            self.evictions += 1
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(user_id)
+        self.hits += 1
+        return user
+
+    def get(self, user_id: str, default: Any = None) -> Optional['User']:
+        """Gets a user by its id.
+
+        Parameters
+        ----------
+        user_id: :class:`str`
+            The id of the user.
+
+        Returns
+        -------
+        Optional[:class:`User`]
+            The user if found, else ``None``.
+        """
+        user = self._lookup(user_id)
+        return default if user is None else user
+
+    def get_by_display_name(self, display_name: str) -> Optional['User']:
+        """Gets a user by its display name. Case is ignored.
+
+        Parameters
+        ----------
+        display_name: :class:`str`
+            The display name of the user.
+
+        Returns
+        -------
+        Optional[:class:`User`]
+            The user if found, else ``None``.
+        """
+        return self._lookup(self._names.get(display_name.casefold()))
+
+    def get_by_external_id(self, external_id: str) -> Optional['User']:
+        """Gets a user by the id of one of its external auths. Only works
+        if ``index_external_auths`` is enabled.
+
+        Parameters
+        ----------
+        external_id: :class:`str`
+            The id of the user on the external platform.
+
+        Returns
+        -------
+        Optional[:class:`User`]
+            The user if found, else ``None``.
+        """
+        return self._lookup(self._external_ids.get(external_id))
+
+    def set(self, user: 'User') -> None:
+        user_id = user.id
+        if user_id in self._entries:
+            self._remove(user_id)
+
+        self._entries[user_id] = user
+        if self.ttl is not None:
+            self._expires_at[user_id] = time.monotonic() + self.ttl
+        self._index(user)
+
+        if self.max_size is not None:
+            while len(self._entries) > self.max_size:
+                self._remove(next(iter(self._entries)))
+                self.evictions += 1
+
+    def pop(self, user_id: str, default: Any = None) -> Optional['User']:
+        if user_id not in self._entries:
+            return default
+
+        user = self._entries[user_id]
+        self._remove(user_id)
+        return user
+
+    def clear(self) -> None:
+        """Removes all users from the cache."""
+        self._entries.clear()
+        self._expires_at.clear()
+        self._names.clear()
+        self._external_ids.clear()
+        self._keys.clear()
+
+    def _index(self, user: 'UserBase') -> None:
+        name = user.display_name
+        name_key = name.casefold() if name is not None else None
+        if name_key is not None:
+            self._names[name_key] = user.id
+
+        external_keys = ()
+        if self.index_external_auths:
+            external_keys = tuple(
+                ext.external_id for ext in user._external_auths
+                if ext.external_id is not None
+            )
+            for key in external_keys:
+                self._external_ids[key] = user.id
+
+        self._keys[user.id] = (name_key, external_keys)
+
+    def _unindex(self, user_id: str) -> None:
+        name_key, external_keys = self._keys.pop(user_id, (None, ()))
+        if self._names.get(name_key) == user_id:
+            del self._names[name_key]
+
+        for key in external_keys:
+            if self._external_ids.get(key) == user_id:
+                del self._external_ids[key]
+
+    def _remove(self, user_id: str) -> None:
+        del self._entries[user_id]
+        self._expires_at.pop(user_id, None)
+        self._unindex(user_id)
+
+    def _reindex(self, user: 'UserBase') -> None:
+        # Called whenever a user's data is updated. Only the exact object
+        # cached is reindexed.
+        if self._entries.get(user.id) is user:
+            self._unindex(user.id)
+            self._index(user)
@@ -26,11 +26,207 @@ SOFTWARE.
 
 import asyncio
 import datetime
+import json
+import logging
 import re
+import time
 
-from typing import Optional
+from collections import deque
+from typing import (Optional, Any, Union, Iterable, List, Tuple, Callable,
+                    Awaitable, AsyncIterator)
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 uuid_match_comp = re.compile(r'^[a-f0-9]{32}$')
+_redact_auth_comp = re.compile(
+    r'((?:bearer|basic)\s+|eg1~)[\w.~+/=-]+',
+    re.IGNORECASE
+)
+_redact_json_comp = re.compile(
+    r'(\\?"(?:access_token|refresh_token|exchange_code|secret|'
+    r'password|token)\\?"\s*:\s*\\?")[^"\\]*'
+)
+
+
+class JSONCodec:
+    """The codec used to decode and encode json payloads received and
+    sent by the client. This uses the standard library :mod:`json` module.
+
+    You can subclass this to plug in another json library. Subclasses
+    must override :meth:`loads` and :meth:`dumps`.
+    """
+
+    def loads(self, data: Union[str, bytes]) -> Any:
+        """Decodes a json document.
+
+        Parameters
+        ----------
+        data: Union[:class:`str`, :class:`bytes`]
+            The document to decode. Raw bytes (utf-8) are accepted so
+            response bodies can be decoded without first creating a
+            copy of them as a string.
+
+        Raises
+        ------
+        ValueError
+            The document is not valid json.
+        """
+        return json.loads(data)
+
+    def dumps(self, obj: Any) -> str:
+        """Encodes an object to a json document."""
+        return json.dumps(obj)
+
+
+class OrjsonCodec(JSONCodec):
+    """A :class:`JSONCodec` using the C-backed ``orjson`` library.
+    Requires ``orjson`` to be installed.
+
+    This is not used unless passed to the client explicitly. Unlike
+    :class:`JSONCodec`, documents are encoded without whitespace, which
+    changes the exact text of party meta and presence statuses sent.
+    """
+
+    def __init__(self) -> None:
+        if orjson is None:
+            raise RuntimeError('orjson must be installed to use OrjsonCodec')
+
+    def loads(self, data: Union[str, bytes]) -> Any:
+        return orjson.loads(data)
+
+    def dumps(self, obj: Any) -> str:
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS).decode()
+
+
+class WireTrace:
+    """Lazily evaluated tracing of the traffic a client sends and
+    receives. Messages of a disabled category are never formatted so
+    tracing costs nothing when it is turned off.
+
+    Traced messages are logged at ``DEBUG`` level and optionally kept in
+    a ring buffer that can be dumped after something went wrong.
+
+    Available categories:
+    - ``xmpp.recv``: Frames received from the xmpp websocket.
+    - ``xmpp.send``: Frames sent to the xmpp websocket.
+    - ``http.request``: Finished http requests.
+    - ``events``: Events received through xmpp.
+
+    Parameters
+    ----------
+    categories: Optional[Iterable[:class:`str`]]
+        The categories to enable. If ``None``, all categories are enabled
+        if the logger has ``DEBUG`` enabled when the trace is created,
+        otherwise none are. Defaults to ``None``.
+    buffer_size: :class:`int`
+        The amount of recent messages to keep in memory. ``0`` disables
+        the buffer. Defaults to ``0``.
+    redact: :class:`bool`
+        Whether or not to redact tokens and secrets from traced messages.
+        Defaults to ``True``.
+    logger: Optional[:class:`logging.Logger`]
+        The logger to log traced messages to. Defaults to the
+        ``fortnitepy.trace`` logger.
+
+    Attributes
+    ----------
+    enabled: Set[:class:`str`]
+        The enabled categories.
+    """
+
+    CATEGORIES = ('xmpp.recv', 'xmpp.send', 'http.request', 'events')
+
+    def __init__(self, categories: Optional[Iterable[str]] = None, *,
+                 buffer_size: int = 0,
+                 redact: bool = True,
+                 logger: Optional[logging.Logger] = None) -> None:
+        self.logger = logger or logging.getLogger('fortnitepy.trace')
+        self.redact = redact
+        self._buffer = deque(maxlen=buffer_size) if buffer_size else None
+
+        if categories is None:
+            if self.logger.isEnabledFor(logging.DEBUG):
+                categories = self.CATEGORIES
+            else:
+                categories = ()
+
+        categories = tuple(categories)
+        self._check_categories(categories)
+        self.enabled = set(categories)
+
+    def __contains__(self, category: str) -> bool:
+        return category in self.enabled
+
+    def _check_categories(self, categories: Iterable[str]) -> None:
+        for category in categories:
+            if category not in self.CATEGORIES:
+                raise ValueError(
+                    'Unknown trace category: {0}'.format(category)
+                )
+
+    def enable(self, *categories: str) -> None:
+        """Enables categories. Enables all categories if none are
+        passed.
+
+        Raises
+        ------
+        ValueError
+            An unknown category was passed.
+        """
+        categories = categories or self.CATEGORIES
+        self._check_categories(categories)
+        self.enabled.update(categories)
+
+    def disable(self, *categories: str) -> None:
+        """Disables categories. Disables all categories if none are
+        passed.
+
+        Raises
+        ------
+        ValueError
+            An unknown category was passed.
+        """
+        categories = categories or self.CATEGORIES
+        self._check_categories(categories)
+        self.enabled.difference_update(categories)
+
+    def trace(self, category: str, fmt: str, *args: Any) -> None:
+        """Traces a message. The message is only formatted with
+        ``fmt.format(*args)`` if the category is enabled.
+        """
+        if category not in self.enabled:
+            return
+
+        message = fmt.format(*args)
+        if self.redact:
+            message = _redact_auth_comp.sub(r'\1<redacted>', message)
+            message = _redact_json_comp.sub(r'\1<redacted>', message)
+
+        if self._buffer is not None:
+            self._buffer.append((time.time(), category, message))
+
+        self.logger.debug('[%s] %s', category, message)
+
+    def dump(self) -> List[Tuple[float, str, str]]:
+        """Gets the messages kept in the ring buffer.
+
+        Returns
+        -------
+        List[Tuple[:class:`float`, :class:`str`, :class:`str`]]
+            The buffered messages as ``(timestamp, category, message)``
+            tuples, oldest first.
+        """
+        if self._buffer is None:
+            return []
+        return list(self._buffer)
+
+    def clear(self) -> None:
+        """Clears the ring buffer."""
+        if self._buffer is not None:
+            self._buffer.clear()
 
 
 class MaybeLock:
@@ -63,6 +259,7 @@ class LockEvent(asyncio.Lock):
         self._event = asyncio.Event()
         self._event.set()
         self.wait = self._event.wait
+        self.is_set = self._event.is_set
         self.priority = 0
 
     async def acquire(self) -> None:
@@ -81,6 +278,54 @@ class LockEvent(asyncio.Lock):
             self.priority = 0
 
 
+async def bounded_as_completed(factories: Iterable[Callable[[], Awaitable]],
+                               limit: int) -> AsyncIterator[Any]:
+    """Runs the awaitables created by ``factories`` with at most ``limit``
+    running at once and yields their results in completion order.
+
+    Factories are only taken once there is room for them, so work can be
+    produced lazily. The iterator is asked again after every yielded
+    result, which lets an iterator that ran dry hand out more work based
+    on the results, e.g. to retry something that failed. Exceptions are
+    raised when their result is reached. Closing the generator cancels
+    everything still running.
+    """
+    factories = iter(factories)
+    pending = set()
+    done = []
+
+    def fill() -> None:
+        while len(pending) < limit:
+            try:
+                factory = next(factories)
+            except StopIteration:
+                return
+            pending.add(asyncio.ensure_future(factory()))
+
+    try:
+        fill()
+        while pending:
+            finished, _ = await asyncio.wait(
+                pending,
+                return_when=asyncio.FIRST_COMPLETED
+            )
+            pending.difference_update(finished)
+            fill()
+
+            done = list(finished)
+            while done:
+                yield done.pop().result()
+                fill()
+    finally:
+        for task in pending:
+            task.cancel()
+
+        # Mark exceptions of completed but unconsumed tasks as retrieved.
+        for task in done:
+            if not task.cancelled():
+                task.exception()
+
+
 def from_iso(iso: str) -> datetime.datetime:
     """Converts an iso formatted string to a
     :class:`datetime.datetime` object
@@ -28,17 +28,19 @@ SOFTWARE.
 import aioxmpp
 import asyncio
 import contextlib
-import json
+import functools
 import logging
 import datetime
 import uuid
 import itertools
+import time
 import unicodedata
 import aiohttp
 
-from xml.etree import ElementTree
-from collections import defaultdict
-from typing import TYPE_CHECKING, Optional, Union, Awaitable, Any, Tuple
+from xml.parsers import expat
+from collections import defaultdict, deque
+from typing import (TYPE_CHECKING, Optional, Union, Awaitable, Any, Tuple,
+                    Dict, Callable)
 
 from .errors import XMPPError, PartyError, HTTPException
 from .message import FriendMessage, PartyMessage
@@ -50,6 +52,7 @@ from .utils import to_iso, from_iso
 
 if TYPE_CHECKING:
     from .client import Client
+    from .friend import Friend
 
 log = logging.getLogger(__name__)
 
@@ -84,16 +87,30 @@ class EventContext:
 
 class EventDispatcher:
     listeners = defaultdict(list)
+    checks = {}
     presence_listeners = []
     interactions_enabled = False
+    _version = 0
 
     @classmethod
     def process_presence(cls, client, *args) -> None:
         for coro in cls.presence_listeners:
-            if __name__ == coro.__module__:
-                asyncio.ensure_future(coro(client.xmpp, *args))
-            else:
-                asyncio.ensure_future(coro(*args))
+            # Listeners run inside the websocket reader, so an exception
+            # must never escape from here.
+            try:
+                if __name__ == coro.__module__:
+                    ret = coro(client.xmpp, *args)
+                else:
+                    ret = coro(*args)
+            except Exception:
+                log.exception('Ignoring exception in presence handler %s',
+                              coro)
+                continue
+
+            # Plain functions are called inline which saves us from
+            # creating a task for every single presence.
+            if ret is not None:
+                asyncio.ensure_future(ret)
 
     @classmethod
     def presence(cls) -> Awaitable:
@@ -113,146 +130,616 @@ class EventDispatcher:
             c for c in cls.presence_listeners if c is not coro
         ]
 
+    @classmethod
+    def get_routes(cls, client: 'Client') -> dict:
+        xmpp = client.xmpp
+        if xmpp._event_routes_version != cls._version:
+            xmpp._event_routes = cls.compile_routes(client)
+            xmpp._event_routes_version = cls._version
+        return xmpp._event_routes
+
+    @classmethod
+    def compile_routes(cls, client: 'Client') -> dict:
+        # Handlers are bound to the client once here instead of checking
+        # which module they belong to for every single event.
+        routes = {}
+        for type_, funcs in cls.listeners.items():
+            handlers = []
+            for func in funcs:
+                if __name__ == func.__module__:
+                    bound = functools.partial(func, client.xmpp)
+                else:
+                    bound = func
+
+                handlers.append((bound, cls.checks.get(func)))
+
+            if handlers:
+                routes[type_] = tuple(handlers)
+        return routes
+
     @classmethod
     def process_event(cls, client: 'Client', raw_body: dict) -> None:
-        body = json.loads(raw_body)
+        body = client.json_codec.loads(raw_body)
+        routes = cls.get_routes(client)
 
-        type_ = body.get('type')
-        if type_ is None:
+        if body.get('type') is None:
             if cls.interactions_enabled:
                 for interaction in body['interactions']:
-                    cls.process_event(client, interaction)
+                    if interaction.get('type') is not None:
+                        cls._route_event(client, routes, interaction)
             return
 
-        log.debug(f'Received event `{type_}` with body `{body}`')
+        cls._route_event(client, routes, body)
 
-        coros = cls.listeners.get(type_, [])
-        for coro in coros:
-            ctx = EventContext(client, body)
+    @classmethod
+    def _route_event(cls, client: 'Client', routes: dict, body: dict) -> None:
+        type_ = body['type']
 
-            if __name__ == coro.__module__:
-                asyncio.ensure_future(coro(client.xmpp, ctx))
-            else:
-                asyncio.ensure_future(coro(ctx))
+        trace = client.wire_trace
+        if 'events' in trace:
+            trace.trace('events', 'Received event `{0}` with body `{1}`',
+                        type_, body)
+
+        handlers = routes.get(type_)
+        if handlers is None:
+            return
+
+        for func, check in handlers:
+            # Checks and plain handlers run inside the websocket reader,
+            # so an exception must never escape from here.
+            try:
+                # Drop events the handler would ignore anyway before any
+                # task is created for it.
+                if check is not None and not check(client, body):
+                    continue
+
+                ret = func(EventContext(client, body))
+            except Exception:
+                log.exception('Ignoring exception in handler for %s',
+                              type_)
+                continue
+
+            # Plain functions are called inline, coroutines are
+            # scheduled as tasks.
+            if ret is not None:
+                asyncio.ensure_future(ret)
 
     @classmethod
-    def event(cls, event: str) -> Awaitable:
+    def event(cls, event: str, *,
+              check: Optional[Callable[['Client', dict], bool]] = None
+              ) -> Awaitable:
         def decorator(coro: Awaitable) -> Awaitable:
-            cls.add_event_handler(event, coro)
+            cls.add_event_handler(event, coro, check=check)
             return coro
         return decorator
 
     @classmethod
-    def add_event_handler(cls, event: str, coro: Awaitable) -> None:
+    def add_event_handler(cls, event: str, coro: Awaitable, *,
+                          check: Optional[Callable[['Client', dict], bool]] = None  # noqa
+                          ) -> None:
         cls.listeners[event].append(coro)
-        log.debug('Added handler for {0} to {1}'.format(event, coro))
+        if check is not None:
+            cls.checks[coro] = check
+
+        cls._version += 1
+        log.debug('Added handler for %s to %s', event, coro)
 
     @classmethod
     def remove_event_handler(cls, event: str, coro: Awaitable) -> None:
         handlers = [c for c in cls.listeners[event] if c is not coro]
-        log.debug('Removed {0} handler(s) for {1}'.format(
+        log.debug(
+            'Removed %s handler(s) for %s',
             len(cls.listeners[event]) - len(handlers),
             event
-        ))
+        )
         cls.listeners[event] = handlers
 
+        if not any(coro in funcs for funcs in cls.listeners.values()):
+            cls.checks.pop(coro, None)
+
+        cls._version += 1
+
+
+def _party_event_check(client: 'Client', body: dict) -> bool:
+    # While a party is being joined or created the handlers wait for it
+    # to finish, so the outcome can't be known yet.
+    if not client._join_party_lock.is_set():
+        return True
+
+    party = client.party
+    return party is not None and party.id == body.get('party_id')
+
 
 # Not really used anymore, but it won't get removed as people might rely on it.
 dispatcher = EventDispatcher()
 
 
-class XMLProcessor:
-    def _process_presence(self, raw: str) -> Optional[Union[tuple, bool]]:
-        tree = ElementTree.fromstring(raw)
+class _StanzaAbort(Exception):
+    pass
+
+
+class _StanzaScanner:
+    """Scans a single stanza in one pass without building a tree. Only
+    the root attributes and the text of the wanted direct children are
+    collected. Scanning is aborted as soon as the root element turns
+    out to be uninteresting so that barely anything is parsed before
+    the frame is handed to aioxmpp.
+    """
+
+    __slots__ = ('wanted', 'check_root', 'attrs', 'children', '_depth',
+                 '_current', '_text')
+
+    def __init__(self, wanted: tuple, check_root) -> None:
+        self.wanted = wanted
+        self.check_root = check_root
+        self.attrs = None
+        self.children = {}
+        self._depth = 0
+        self._current = None
+        self._text = []
+
+    def _start(self, name: str, attrs: dict) -> None:
+        depth = self._depth
+        self._depth += 1
+
+        if depth == 0:
+            if not self.check_root(attrs):
+                raise _StanzaAbort()
+            self.attrs = attrs
+        elif depth == 1:
+            local = name.rpartition(':')[2]
+            if local in self.wanted and local not in self.children:
+                self._current = local
+                self._text = []
+
+    def _end(self, name: str) -> None:
+        self._depth -= 1
+        if self._depth == 1 and self._current is not None:
+            self.children[self._current] = ''.join(self._text) or None
+            self._current = None
+
+    def _data(self, data: str) -> None:
+        if self._current is not None and self._depth == 2:
+            self._text.append(data)
+
+    def scan(self, raw: str) -> bool:
+        parser = expat.ParserCreate()
+        parser.buffer_text = True
+        parser.StartElementHandler = self._start
+        parser.EndElementHandler = self._end
+        parser.CharacterDataHandler = self._data
+
+        try:
+            parser.Parse(raw, True)
+        except (_StanzaAbort, expat.ExpatError):
+            return False
+        return True
 
-        type_ = tree.get('type')
 
+class XMLProcessor:
+    @staticmethod
+    def _check_presence(attrs: dict) -> bool:
         # Only intercept presences with either no type attribute
         # (which means available) or unavailable type.
+        type_ = attrs.get('type')
         if type_ is not None and type_ not in ('available', 'unavailable'):
             return False
 
-        from_ = tree.get('from')
-
         # If from is a party, let aioxmpp handle it.
-        if from_ is not None and '-' in from_:
+        from_ = attrs.get('from')
+        return from_ is not None and '-' not in from_
+
+    @staticmethod
+    def _check_message(attrs: dict) -> bool:
+        # Only intercept messages sent by epic
+        if attrs.get('from', '') != 'xmpp-admin@prod.ol.epicgames.com':
             return False
 
-        status = None
-        show = None
-        for elem in tree:
-            if 'status' in elem.tag:
-                status = elem.text
-            if 'show' in elem.tag:
-                show = elem.text
+        # Only intercept messages with either no type attribute
+        # (which means normal) or normal type.
+        type_ = attrs.get('type')
+        return type_ is None or type_ == 'normal'
+
+    def _process_presence(self, raw: str) -> Optional[Union[tuple, bool]]:
+        scanner = _StanzaScanner(('status', 'show'), self._check_presence)
+        if not scanner.scan(raw):
+            return False
 
         # We have no use for the presence if status is None and
         # therefore it's better to just let aioxmpp handle it.
+        status = scanner.children.get('status')
         if status is None:
             return False
 
-        split = from_.split('@')
+        attrs = scanner.attrs
+        split = attrs['from'].split('@')
         user_id = split[0]
         platform = split[1].split(':')[2]
 
-        return 'presence', (user_id, platform, type_, status, show)
+        return 'presence', (user_id, platform, attrs.get('type'), status,
+                            scanner.children.get('show'))
 
     def _process_message(self, raw: str) -> Optional[Union[tuple, bool]]:
-        tree = ElementTree.fromstring(raw)
-
-        # Only intercept messages sent by epic
-        if tree.get('from', '') != 'xmpp-admin@prod.ol.epicgames.com':
-            return False
-
-        type_ = tree.get('type')
-
-        # Only intercept messages with either no type attribute
-        # (which means normal) or  type.
-        if type_ is not None and type_ != 'normal':
+        scanner = _StanzaScanner(('body',), self._check_message)
+        if not scanner.scan(raw):
             return False
 
         # Let aioxmpp handle it if no body tag is found. Also, technically
         # a message can include multiple body tags for different languages
         # but afaik only one body tag is sent from epics servers.
-        body = None
-        for elem in tree:
-            if 'body' in elem.tag:
-                body = elem.text
-                break
-        else:
+        if 'body' not in scanner.children:
             return False
 
-        return 'message', (body,)
+        return 'message', (scanner.children['body'],)
 
     def process(self, raw: str) -> Optional[Union[tuple, bool]]:
-        # Yes, this is a hacky solution but it's better than
-        # using the quite unnecessary slow aioxmpp one.
-        if '<presence' in raw:
-            return self._process_presence(raw)
-        elif '<message' in raw:
-            return self._process_message(raw)
+        # Every frame holds a single stanza so looking at the root tag
+        # is enough to know what we are dealing with.
+        head = raw.lstrip()
+        if head.startswith('<presence'):
+            return self._process_presence(head)
+        elif head.startswith('<message'):
+            return self._process_message(head)
 
         return False
 
 
+class XMPPConnectionHealth:
+    """Represents the health of a client's xmpp connection.
+
+    Attributes
+    ----------
+    connected: :class:`bool`
+        Whether or not the xmpp stream is currently established.
+    last_recv_at: Optional[:class:`float`]
+        The unix timestamp of when data was last received from the
+        websocket. ``None`` if nothing has been received yet.
+    ping_rtt: Optional[:class:`float`]
+        The round trip time in seconds of the last answered keepalive ping.
+        ``None`` if no ping has been answered yet.
+    ping_rtt_avg: Optional[:class:`float`]
+        The exponentially weighted average round trip time in seconds of
+        answered keepalive pings.
+    ping_rtt_min: Optional[:class:`float`]
+        The lowest round trip time in seconds measured.
+    ping_rtt_max: Optional[:class:`float`]
+        The highest round trip time in seconds measured.
+    pings_sent: :class:`int`
+        The amount of keepalive pings sent.
+    pings_missed: :class:`int`
+        The amount of keepalive pings that were not answered in time.
+    reconnect_count: :class:`int`
+        The amount of times the stream has been re-established after
+        being lost.
+    """
+
+    __slots__ = ('connected', 'last_recv_at', 'ping_rtt', 'ping_rtt_avg',
+                 'ping_rtt_min', 'ping_rtt_max', 'pings_sent',
+                 'pings_missed', 'reconnect_count')
+
+    def __init__(self) -> None:
+        self.connected = False
+        self.last_recv_at = None
+        self.ping_rtt = None
+        self.ping_rtt_avg = None
+        self.ping_rtt_min = None
+        self.ping_rtt_max = None
+        self.pings_sent = 0
+        self.pings_missed = 0
+        self.reconnect_count = 0
+
+    def _record_rtt(self, rtt: float) -> None:
+        self.ping_rtt = rtt
+        if self.ping_rtt_avg is None:
+            self.ping_rtt_avg = self.ping_rtt_min = self.ping_rtt_max = rtt
+            return
+
+        self.ping_rtt_avg += (rtt - self.ping_rtt_avg) * 0.2
+        self.ping_rtt_min = min(self.ping_rtt_min, rtt)
+        self.ping_rtt_max = max(self.ping_rtt_max, rtt)
+
+    def __repr__(self) -> str:
+        return ('<XMPPConnectionHealth connected={0.connected} '
+                'ping_rtt={0.ping_rtt} '
+                'reconnect_count={0.reconnect_count}>'.format(self))
+
+    @property
+    def idle_time(self) -> Optional[float]:
+        """Optional[:class:`float`]: The amount of seconds since data
+        was last received. ``None`` if nothing has been received yet."""
+        if self.last_recv_at is None:
+            return None
+        return time.time() - self.last_recv_at
+
+
+class XMPPConnectionSupervisor:
+    """Supervises the xmpp connections of multiple clients running in
+    the same process.
+
+    All websocket connections of the supervised clients share a single
+    :class:`aiohttp.ClientSession` and connector. (Re)connects are
+    staggered so that all clients don't dial the xmpp service at the
+    same time after an outage.
+
+    Pass the same supervisor to multiple clients with the
+    ``xmpp_supervisor`` keyword argument or to :func:`start_multiple()`.
+
+    Parameters
+    ----------
+    stagger: :class:`float`
+        The min amount of seconds between two connection attempts.
+        Defaults to ``0.25``.
+    connector: Optional[:class:`aiohttp.BaseConnector`]
+        The connector to use for the shared session. If not specified, a
+        connector owned by the supervisor is created when the first
+        client connects.
+
+        .. warning::
+
+            Connectors passed will not be closed on shutdown. You must
+            close them yourself if you want a graceful shutdown.
+    """
+
+    def __init__(self, *, stagger: float = 0.25,
+                 connector: Optional[aiohttp.BaseConnector] = None) -> None:
+        self.stagger = stagger
+        self.connector = connector
+
+        self._clients = {}
+        self._session = None
+        self._next_connect_at = 0
+
+    @property
+    def clients(self) -> list:
+        """List[:class:`Client`]: The clients currently supervised."""
+        return list(self._clients)
+
+    def register(self, client: 'Client') -> None:
+        self._clients[client] = client.xmpp.health
+
+    async def unregister(self, client: 'Client') -> None:
+        self._clients.pop(client, None)
+
+        # Close the shared session once the last client is gone.
+        if not self._clients and self._session is not None:
+            session = self._session
+            self._session = None
+            await session.close()
+
+    def get_session(self) -> aiohttp.ClientSession:
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                connector=self.connector,
+                connector_owner=self.connector is None,
+            )
+        return self._session
+
+    async def wait_for_turn(self) -> None:
+        now = time.monotonic()
+        connect_at = max(now, self._next_connect_at)
+        self._next_connect_at = connect_at + self.stagger
+
+        if connect_at > now:
+            await asyncio.sleep(connect_at - now)
+
+    def get_health(self) -> Dict[str, XMPPConnectionHealth]:
+        """Gets the connection health of all supervised clients.
+
+        Returns
+        -------
+        Dict[:class:`str`, :class:`XMPPConnectionHealth`]
+            The connection health mapped to the id of the client's user.
+        """
+        return {client.user.id: health
+                for client, health in self._clients.items()
+                if client.user is not None}
+
+
+class _ChatDestination:
+    __slots__ = ('queue', 'tokens', 'updated_at', 'task')
+
+    def __init__(self, burst: int) -> None:
+        self.queue = deque()
+        self.tokens = burst
+        self.updated_at = time.monotonic()
+        self.task = None
+
+    def take(self, rate: float, burst: int) -> float:
+        # Token bucket. A negative balance is the debt the caller has to
+        # sleep off before sending.
+        now = time.monotonic()
+        tokens = min(burst, self.tokens + (now - self.updated_at) * rate)
+        self.updated_at = now
+        self.tokens = tokens - 1
+
+        if tokens >= 1:
+            return 0
+        return (1 - tokens) / rate
+
+    def is_idle(self, rate: float, burst: int) -> bool:
+        if self.task is not None or self.queue:
+            return False
+
+        elapsed = time.monotonic() - self.updated_at
+        return self.tokens + elapsed * rate >= burst
+
+
+class ChatScheduler:
+    """Paces the chat messages sent by a client.
+
+    Messages are queued per destination, meaning per party chat or
+    friend, and sent in order at the configured rate instead of all at
+    once so the chat service doesn't throttle and silently drop them.
+
+    Pass an instance to a client with the ``chat_scheduler`` keyword
+    argument. A scheduler must not be shared between clients.
+
+    Parameters
+    ----------
+    party_rate: :class:`float`
+        The max amount of messages per second sent to a party chat.
+        Defaults to ``2``.
+    friend_rate: :class:`float`
+        The max amount of messages per second sent to a single friend.
+        Defaults to ``2``.
+    burst: :class:`int`
+        The amount of messages that can be sent to a destination at once
+        before pacing kicks in. Defaults to ``5``.
+    max_queue_size: :class:`int`
+        The max amount of messages waiting to be sent to a single
+        destination. Sending more raises :exc:`XMPPError`.
+        Defaults to ``50``.
+    merge: :class:`bool`
+        Whether consecutive messages waiting to be sent to the same
+        destination should be merged into a single message. Defaults to
+        ``False``.
+    merge_max_length: :class:`int`
+        The max length of a merged message. Defaults to ``256``.
+    merge_separator: :class:`str`
+        The string merged messages are joined with. Defaults to ``\\n``.
+    """
+
+    def __init__(self, *, party_rate: float = 2,
+                 friend_rate: float = 2,
+                 burst: int = 5,
+                 max_queue_size: int = 50,
+                 merge: bool = False,
+                 merge_max_length: int = 256,
+                 merge_separator: str = '\n') -> None:
+        self.party_rate = party_rate
+        self.friend_rate = friend_rate
+        self.burst = burst
+        self.max_queue_size = max_queue_size
+        self.merge = merge
+        self.merge_max_length = merge_max_length
+        self.merge_separator = merge_separator
+
+        self._destinations = {}
+
+    @property
+    def pending(self) -> int:
+        """:class:`int`: The amount of messages waiting to be sent."""
+        return sum(len(d.queue) for d in self._destinations.values())
+
+    def _get_destination(self, key: Any, rate: float) -> _ChatDestination:
+        try:
+            return self._destinations[key]
+        except KeyError:
+            pass
+
+        # Forget destinations that have been quiet long enough for their
+        # bucket to refill as they would start out the same anyway.
+        if len(self._destinations) >= 256:
+            for k, d in list(self._destinations.items()):
+                if d.is_idle(rate, self.burst):
+                    del self._destinations[k]
+
+        dest = self._destinations[key] = _ChatDestination(self.burst)
+        return dest
+
+    def send(self, key: Any,
+             content: str,
+             sender: Callable[[str], Awaitable[None]], *,
+             rate: float) -> asyncio.Future:
+        dest = self._get_destination(key, rate)
+        queue = dest.queue
+        fut = asyncio.get_running_loop().create_future()
+
+        if self.merge and queue:
+            last = queue[-1]
+            length = (len(last[0]) + len(self.merge_separator)
+                      + len(content))
+            if length <= self.merge_max_length:
+                last[0] = last[0] + self.merge_separator + content
+                last[1].append(fut)
+                return fut
+
+        if len(queue) >= self.max_queue_size:
+            raise XMPPError('Chat send queue is full.')
+
+        queue.append([content, [fut], sender])
+        if dest.task is None:
+            dest.task = asyncio.ensure_future(self._run(dest, rate))
+        return fut
+
+    async def _run(self, dest: _ChatDestination, rate: float) -> None:
+        queue = dest.queue
+        try:
+            while queue:
+                delay = dest.take(rate, self.burst)
+                if delay > 0:
+                    await asyncio.sleep(delay)
+
+                content, futures, sender = queue.popleft()
+                if all(f.done() for f in futures):
+                    continue
+
+                try:
+                    await sender(content)
+                except asyncio.CancelledError:
+                    # The message has already been taken off the queue
+                    # so clear() can't cancel its futures.
+                    for fut in futures:
+                        fut.cancel()
+                    raise
+                except Exception as exc:
+                    for fut in futures:
+                        if not fut.done():
+                            fut.set_exception(exc)
+                else:
+                    for fut in futures:
+                        if not fut.done():
+                            fut.set_result(None)
+        finally:
+            dest.task = None
+
+    def clear(self) -> None:
+        """Cancels all messages waiting to be sent."""
+        for dest in self._destinations.values():
+            if dest.task is not None:
+                dest.task.cancel()
+
+            for _, futures, _ in dest.queue:
+                for fut in futures:
+                    fut.cancel()
+        self._destinations.clear()
+
+
 class WebsocketTransport:
+    # Once this many bytes are waiting to be sent, drain() blocks until
+    # the writer has brought it down to the low water mark.
+    write_high_water = 256 * 1024
+    write_low_water = 64 * 1024
+
     def __init__(self, stream: 'WebsocketXMLStream',
                  client: 'Client',
                  logger: logging.Logger,
                  proxy: Optional[str] = None,
                  proxy_auth: Optional[aiohttp.BasicAuth] = None,
-                 ws_connector: Optional[aiohttp.BaseConnector] = None) -> None:
+                 ws_connector: Optional[aiohttp.BaseConnector] = None,
+                 supervisor: Optional[XMPPConnectionSupervisor] = None
+                 ) -> None:
         self.stream = stream
         self.client = client
         self.logger = logger
         self.proxy: Optional[str] = None
         self.proxy_auth: Optional[aiohttp.BasicAuth] = None
         self.ws_connector = ws_connector
+        self.supervisor = supervisor
 
         self.xml_processor = XMLProcessor()
 
         self.connection = None
-        self._buffer = b''
+        self._owns_session = True
+        self._chunks = []
+        self._frames = deque()
+        self._pending_bytes = 0
+        self._writer_task = None
+        self._writer_wakeup = asyncio.Event()
+        self._drained = asyncio.Event()
+        self._drained.set()
+        self._all_sent = asyncio.Event()
+        self._all_sent.set()
         self._reader_task = None
         self._close_event = asyncio.Event()
         self._called_lost = False
@@ -262,15 +749,22 @@ class WebsocketTransport:
                                 **kwargs) -> aiohttp.ClientWebSocketResponse:
         self.logger.debug('Setting up new websocket connection.')
 
-        self.session = aiohttp.ClientSession(
-            connector=self.ws_connector,
-            connector_owner=self.ws_connector is None,
-        )
+        if self.supervisor is not None:
+            self.session = self.supervisor.get_session()
+            self._owns_session = False
+        else:
+            self.session = aiohttp.ClientSession(
+                connector=self.ws_connector,
+                connector_owner=self.ws_connector is None,
+            )
+            self._owns_session = True
+
         self.connection = con = await self.session.ws_connect(
             *args, **kwargs
         )
 
         asyncio.create_task(self.reader())
+        self._writer_task = asyncio.create_task(self.writer())
         self.stream.connection_made(self)
         self._called_lost = False
         self._attempt_reconnect = True
@@ -280,12 +774,16 @@ class WebsocketTransport:
 
     async def reader(self) -> None:
         self.logger.debug('Websocket reader is now running.')
+        trace = self.client.wire_trace
+        health = self.client.xmpp.health
 
         try:
             while True:
                 msg = await self.connection.receive()
+                health.last_recv_at = time.time()
 
-                self.logger.debug('RECV: {0}'.format(msg))
+                if 'xmpp.recv' in trace:
+                    trace.trace('xmpp.recv', 'RECV: {0}', msg)
                 if msg.type == aiohttp.WSMsgType.TEXT:
                     ret = self.xml_processor.process(msg.data)
                     if ret is None:
@@ -333,17 +831,74 @@ class WebsocketTransport:
             self.logger.debug('Websocket reader stopped.')
 
     async def send(self, data: bytes) -> None:
-        self.logger.debug('SEND: {0}'.format(data))
+        trace = self.client.wire_trace
+        if 'xmpp.send' in trace:
+            trace.trace('xmpp.send', 'SEND: {0}', data)
         await self.connection.send_bytes(data)
 
+    async def writer(self) -> None:
+        frames = self._frames
+        wakeup = self._writer_wakeup
+
+        try:
+            while True:
+                while frames:
+                    frame = frames.popleft()
+                    try:
+                        await self.send(frame)
+                    except Exception as exc:
+                        # The reader notices the connection going away
+                        # and handles it so we just stop here.
+                        self.logger.debug(
+                            'Websocket writer stopped due to send error: %s',
+                            exc
+                        )
+                        frames.clear()
+                        return
+                    finally:
+                        self._pending_bytes -= len(frame)
+                        if self._pending_bytes <= self.write_low_water:
+                            self._drained.set()
+                        if not self._pending_bytes:
+                            self._all_sent.set()
+
+                wakeup.clear()
+                await wakeup.wait()
+        finally:
+            self._pending_bytes = 0
+            self._drained.set()
+            self._all_sent.set()
+
     def write(self, data: bytes) -> None:
-        self._buffer += data
+        self._chunks.append(data)
 
     def flush(self) -> None:
-        if self._buffer:
-            asyncio.ensure_future(self.send(self._buffer))
+        if not self._chunks:
+            return
+
+        # Every flush is a complete stanza which is sent as its own frame.
+        frame = b''.join(self._chunks)
+        self._chunks.clear()
 
-        self._buffer = b''
+        # The writer stops after a send error. The connection is gone at
+        # that point so there is nothing left to send the frame to.
+        if self._writer_task is not None and self._writer_task.done():
+            self.logger.debug('Dropping frame written after the websocket '
+                              'writer stopped.')
+            return
+
+        self._frames.append(frame)
+        self._pending_bytes += len(frame)
+        self._all_sent.clear()
+        if self._pending_bytes > self.write_high_water:
+            self._drained.clear()
+
+        self._writer_wakeup.set()
+
+    async def drain(self) -> None:
+        """Waits until the amount of data waiting to be sent is below
+        the low water mark."""
+        await self._drained.wait()
 
     def can_write_eof(self) -> bool:
         return False
@@ -355,7 +910,15 @@ class WebsocketTransport:
         if self._reader_task is not None and not self._reader_task.cancelled():
             self._reader_task.cancel()
 
+    def _stop_writer(self) -> None:
+        if self._writer_task is not None and not self._writer_task.done():
+            self._writer_task.cancel()
+
     def _close_session(self) -> None:
+        # Shared sessions are closed by the supervisor.
+        if not self._owns_session:
+            return None
+
         with contextlib.suppress(AttributeError):
             return asyncio.create_task(self.session.close())
 
@@ -366,6 +929,8 @@ class WebsocketTransport:
         task = self._close_session()
         if task is not None:
             task.add_done_callback(self.close_callback)
+        else:
+            self.close_callback()
 
     def _close(self) -> None:
         if not self.connection:
@@ -373,15 +938,38 @@ class WebsocketTransport:
 
         self.logger.debug('Closing websocket connection.')
 
-        task = asyncio.create_task(self.connection.close())
+        # Let already flushed stanzas like the stream footer go out
+        # before the connection is closed.
+        async def close():
+            if self._writer_task is not None and self._pending_bytes:
+                with contextlib.suppress(asyncio.TimeoutError):
+                    await asyncio.wait_for(self.drain_all(), timeout=2)
+
+            self._stop_writer()
+            await self.connection.close()
+
+        task = asyncio.create_task(close())
         task.add_done_callback(self.on_close)
 
         self._stop_reader()
 
+    async def drain_all(self) -> None:
+        """Waits until everything flushed so far has been sent."""
+        await self._all_sent.wait()
+
     def close(self) -> None:
         self._attempt_reconnect = False
         self._close()
 
+    def fail(self, exc: Exception) -> None:
+        """Tears down a connection that is known to be dead without
+        waiting for the reader to notice."""
+        if not self._called_lost:
+            self._called_lost = True
+            self.stream.connection_lost(exc)
+
+        self._close()
+
     def abort(self) -> None:
         self.logger.debug('Received abort signal.')
         self._close()
@@ -496,14 +1084,20 @@ class XMPPOverWebsocketConnector(aioxmpp.connector.BaseConnector):
                 __name__, type(self).__qualname__,
             ]))
 
+        supervisor = self.client.xmpp.supervisor
+        if supervisor is not None:
+            await supervisor.wait_for_turn()
+
         transport = WebsocketTransport(
             stream,
             self.client,
             logger,
             proxy=self.proxy,
             proxy_auth=self.proxy_auth,
-            ws_connector=self.ws_connector
+            ws_connector=self.ws_connector,
+            supervisor=supervisor
         )
+        self.client.xmpp._transport = transport
         await transport.create_connection(
             'wss://{host}'.format(host=host),
             protocols=('xmpp',),
@@ -591,12 +1185,21 @@ class XMPPClient:
             client: 'Client',
             proxy: Optional[str] = None,
             proxy_auth: Optional[aiohttp.BasicAuth] = None,
-            ws_connector=None
+            ws_connector=None,
+            supervisor: Optional[XMPPConnectionSupervisor] = None,
+            keepalive_interval: float = 30,
+            keepalive_timeout: float = 10,
+            chat_scheduler: Optional[ChatScheduler] = None
     ) -> None:
         self.client = client
+        self.keepalive_interval = keepalive_interval
+        self.keepalive_timeout = keepalive_timeout
         self.proxy: Optional[str] = proxy
         self.proxy_auth: Optional[aiohttp.BasicAuth] = proxy_auth
         self.ws_connector = ws_connector
+        self.supervisor = supervisor
+        self.health = XMPPConnectionHealth()
+        self.chat_scheduler = chat_scheduler or ChatScheduler()
 
         self.xmpp_client = None
         self.stream = None
@@ -608,6 +1211,12 @@ class XMPPClient:
         self._last_disconnected_at = None
         self._last_known_party_id = None
         self._task = None
+        self._pending_presences = {}
+        self._presence_flush_handle = None
+        self._transport = None
+        self._has_established = False
+        self._event_routes = None
+        self._event_routes_version = -1
 
         self.send_presence_on_add = True
 
@@ -647,7 +1256,7 @@ class XMPPClient:
         }
 
         if 'Platform_j' in member_m:
-            meta['Platform_j'] = json.loads(
+            meta['Platform_j'] = self.client.json_codec.loads(
                 member_m['Platform_j']
             )['Platform']['platformStr']
 
@@ -756,7 +1365,7 @@ class XMPPClient:
             self.client.dispatch_event('friend_request', pf)
 
     @EventDispatcher.event('FRIENDSHIP_REMOVE')
-    async def friend_remove_event(self, ctx: EventContext) -> None:
+    def friend_remove_event(self, ctx: EventContext) -> None:
         body = ctx.body
 
         _id = body['to'] if body['from'] == self.client.user.id else body['from']
@@ -870,8 +1479,8 @@ class XMPPClient:
 
         if net_cl != self.client.net_cl and self.client.net_cl != '':
             log.debug(
-                'Could not match the currently set net_cl ({0!r}) to the '
-                'received value ({1!r})'.format(self.client.net_cl, net_cl)
+                'Could not match the currently set net_cl (%r) to the '
+                'received value (%r)', self.client.net_cl, net_cl
             )
 
         new_party = Party(self.client, data)
@@ -888,7 +1497,10 @@ class XMPPClient:
         )
         self.client.dispatch_event('party_invite', invitation)
 
-    @EventDispatcher.event('com.epicgames.social.party.notification.v0.MEMBER_JOINED')  # noqa
+    @EventDispatcher.event(
+        'com.epicgames.social.party.notification.v0.MEMBER_JOINED',
+        check=_party_event_check,
+    )
     async def event_party_member_joined(self,
                                         ctx: EventContext) -> None:
         body = ctx.body
@@ -957,7 +1569,10 @@ class XMPPClient:
 
         self.client.dispatch_event('party_member_join', member)
 
-    @EventDispatcher.event('com.epicgames.social.party.notification.v0.MEMBER_LEFT')  # noqa
+    @EventDispatcher.event(
+        'com.epicgames.social.party.notification.v0.MEMBER_LEFT',
+        check=_party_event_check,
+    )
     async def event_party_member_left(self, ctx: EventContext) -> None:
         body = ctx.body
 
@@ -983,7 +1598,10 @@ class XMPPClient:
                 )
             except asyncio.TimeoutError:
                 pass
-    @EventDispatcher.event('com.epicgames.social.party.notification.v0.MEMBER_KICKED')  # noqa
+    @EventDispatcher.event(
+        'com.epicgames.social.party.notification.v0.MEMBER_KICKED',
+        check=_party_event_check,
+    )
     async def event_party_member_kicked(self, ctx: EventContext) -> None:
         body = ctx.body
 
@@ -1016,7 +1634,10 @@ class XMPPClient:
 
         self.client.dispatch_event('party_member_kick', member)
 
-    @EventDispatcher.event('com.epicgames.social.party.notification.v0.MEMBER_DISCONNECTED')  # noqa
+    @EventDispatcher.event(
+        'com.epicgames.social.party.notification.v0.MEMBER_DISCONNECTED',
+        check=_party_event_check,
+    )
     async def event_party_member_disconnected(self, ctx: EventContext) -> None:
         body = ctx.body
         user_id = body.get('account_id')
@@ -1051,7 +1672,10 @@ class XMPPClient:
         member._update_connection(body.get('connection'))
         self.client.dispatch_event('party_member_zombie', member)
 
-    @EventDispatcher.event('com.epicgames.social.party.notification.v0.MEMBER_EXPIRED')  # noqa
+    @EventDispatcher.event(
+        'com.epicgames.social.party.notification.v0.MEMBER_EXPIRED',
+        check=_party_event_check,
+    )
     async def event_party_member_expired(self, ctx: EventContext) -> None:
         body = ctx.body
 
@@ -1082,7 +1706,10 @@ class XMPPClient:
 
         self.client.dispatch_event('party_member_expire', member)
 
-    @EventDispatcher.event('com.epicgames.social.party.notification.v0.MEMBER_CONNECTED')  # noqa
+    @EventDispatcher.event(
+        'com.epicgames.social.party.notification.v0.MEMBER_CONNECTED',
+        check=_party_event_check,
+    )
     async def event_party_member_connected(self, ctx: EventContext) -> None:
         body = ctx.body
 
@@ -1108,7 +1735,10 @@ class XMPPClient:
 
         self.client.dispatch_event('party_member_reconnect', member)
 
-    @EventDispatcher.event('com.epicgames.social.party.notification.v0.MEMBER_NEW_CAPTAIN')  # noqa
+    @EventDispatcher.event(
+        'com.epicgames.social.party.notification.v0.MEMBER_NEW_CAPTAIN',
+        check=_party_event_check,
+    )
     async def event_party_new_captain(self, ctx: EventContext) -> None:
         body = ctx.body
         party = ctx.party
@@ -1135,7 +1765,10 @@ class XMPPClient:
         party.update_presence()
         self.client.dispatch_event('party_member_promote', old_leader, member)
 
-    @EventDispatcher.event('com.epicgames.social.party.notification.v0.PARTY_UPDATED')  # noqa
+    @EventDispatcher.event(
+        'com.epicgames.social.party.notification.v0.PARTY_UPDATED',
+        check=_party_event_check,
+    )
     async def event_party_updated(self, ctx: EventContext) -> None:
         body = ctx.body
 
@@ -1172,7 +1805,10 @@ class XMPPClient:
                     value
                 )
 
-    @EventDispatcher.event('com.epicgames.social.party.notification.v0.MEMBER_STATE_UPDATED')  # noqa
+    @EventDispatcher.event(
+        'com.epicgames.social.party.notification.v0.MEMBER_STATE_UPDATED',
+        check=_party_event_check,
+    )
     async def event_party_member_state_updated(self,
                                                ctx: EventContext) -> None:
         body = ctx.body
@@ -1244,7 +1880,9 @@ class XMPPClient:
                 'Default:MemberSquadAssignmentRequest_j'
             )
             if req_j is not None:
-                req = json.loads(req_j)['MemberSquadAssignmentRequest']
+                req = self.client.json_codec.loads(
+                    req_j
+                )['MemberSquadAssignmentRequest']
                 version = req.get('version')
 
                 if member.id == self.client.user.id:
@@ -1309,7 +1947,10 @@ class XMPPClient:
             if not compare(pre_value, value):
                 _dispatch(key, member, pre_value, value)
 
-    @EventDispatcher.event('com.epicgames.social.party.notification.v0.MEMBER_REQUIRE_CONFIRMATION')  # noqa
+    @EventDispatcher.event(
+        'com.epicgames.social.party.notification.v0.MEMBER_REQUIRE_CONFIRMATION',
+        check=_party_event_check,
+    )
     async def event_party_member_require_confirmation(self,
                                                       ctx: EventContext
                                                       ) -> None:
@@ -1346,7 +1987,10 @@ class XMPPClient:
 
         self.client.dispatch_event('party_member_confirm', confirmation)
 
-    @EventDispatcher.event('com.epicgames.social.party.notification.v0.INITIAL_INTENTION')  # noqa
+    @EventDispatcher.event(
+        'com.epicgames.social.party.notification.v0.INITIAL_INTENTION',
+        check=_party_event_check,
+    )
     async def event_party_join_request_received(self, ctx: EventContext) -> None:  # noqa
         body = ctx.body
 
@@ -1375,7 +2019,7 @@ class XMPPClient:
         self.client.dispatch_event('party_join_request', request)
 
     @EventDispatcher.event('com.epicgames.social.party.notification.v0.INVITE_DECLINED')  # noqa
-    async def event_party_invite_declined(self, ctx: EventContext) -> None:
+    def event_party_invite_declined(self, ctx: EventContext) -> None:
         body = ctx.body
 
         friend = self.client.get_friend(body['invitee_id'])
@@ -1383,73 +2027,181 @@ class XMPPClient:
             self.client.dispatch_event('party_invite_decline', friend)
 
     @EventDispatcher.presence()
-    async def process_presence(self, user_id: str,
-                               platform: str,
-                               type_: str,
-                               status: str,
-                               show: str) -> None:
+    def process_presence(self, user_id: str,
+                         platform: str,
+                         type_: str,
+                         status: str,
+                         show: str) -> None:
+        # Presences are queued and processed once per loop iteration.
+        # Only the latest presence of every friend is kept as we
+        # receive thousands of presences, often several per friend,
+        # when logging in or reconnecting.
+        pending = self._pending_presences
+        pending.pop(user_id, None)
+        pending[user_id] = (platform, type_, status, show)
+
+        if self._presence_flush_handle is None:
+            self._presence_flush_handle = self.client.loop.call_soon(
+                self._flush_presences
+            )
+
+    def _decode_presence_status(self, status: str) -> Optional[dict]:
         try:
-            data = json.loads(status)
+            data = self.client.json_codec.loads(status)
 
             ch = data.get('Status', '') != ''
 
             is_dict = isinstance(data.get('Properties', {}), dict)
             if (not ch or 'bIsPlaying' not in data or not is_dict):
-                return
+                return None
         except ValueError:
-            return
+            return None
 
-        friend = self.client.get_friend(user_id)
-        if friend is None:
-            try:
-                friend = await self.client.wait_for(
-                    'friend_add',
-                    check=lambda f: f.id == user_id,
-                    timeout=1
-                )
-            except asyncio.TimeoutError:
-                return
+        return data
 
-        is_available = type_ is None or type_ == 'available'
+    def _flush_presences(self) -> None:
+        self._presence_flush_handle = None
+        pending = self._pending_presences
+        self._pending_presences = {}
+
+        # Presence objects are only built if someone is going to receive
+        # them. Otherwise only the presence cache is updated.
+        build = self._presence_has_destination()
+
+        batch = []
+        for user_id, (platform, type_, status, show) in pending.items():
+            data = self._decode_presence_status(status)
+            if data is None:
+                continue
+
+            friend = self.client.get_friend(user_id)
+            if friend is None:
+                self.client.loop.create_task(self._process_late_presence(
+                    user_id,
+                    platform,
+                    type_,
+                    data,
+                    show
+                ))
+                continue
+
+            ret = self._update_presence(
+                friend,
+                user_id,
+                platform,
+                type_,
+                data,
+                show,
+                build=build
+            )
+            if ret is not None:
+                batch.append(ret)
+
+        self._dispatch_presences(batch)
 
+    async def _process_late_presence(self, user_id: str,
+                                     platform: str,
+                                     type_: str,
+                                     data: dict,
+                                     show: str) -> None:
+        # The friend might just have been added.
         try:
-            away = AwayStatus(show)
-        except ValueError:
-            away = AwayStatus.ONLINE
+            friend = await self.client.wait_for(
+                'friend_add',
+                check=lambda f: f.id == user_id,
+                timeout=1
+            )
+        except asyncio.TimeoutError:
+            return
 
-        _pres = Presence(
-            self.client,
+        ret = self._update_presence(
+            friend,
             user_id,
             platform,
-            is_available,
-            away,
-            data
+            type_,
+            data,
+            show,
+            build=self._presence_has_destination()
         )
+        if ret is not None:
+            self._dispatch_presences([ret])
 
-        if _pres.party is not None:
-            try:
-                display_name = _pres.party.raw['sourceDisplayName']
-                if display_name != _pres.friend.display_name:
-                    _pres.friend._update_display_name(display_name)
-            except (KeyError, AttributeError):
-                pass
+    def _presence_has_destination(self) -> bool:
+        client = self.client
+        return (client._event_has_destination('friend_presence')
+                or client._event_has_destination('friend_presence_batch'))
+
+    def _dispatch_presences(self, batch: list) -> None:
+        if not batch:
+            return
 
-        before_pres = friend.last_presence
+        client = self.client
+        if client._event_has_destination('friend_presence'):
+            for before_pres, pres in batch:
+                client.dispatch_event('friend_presence', before_pres, pres)
+
+        if client._event_has_destination('friend_presence_batch'):
+            client.dispatch_event('friend_presence_batch', batch)
+
+    def _update_presence(self, friend: 'Friend',
+                         user_id: str,
+                         platform: str,
+                         type_: str,
+                         data: dict,
+                         show: str,
+                         *,
+                         build: bool = True
+                         ) -> Optional[Tuple[Optional[Presence], Presence]]:
+        is_available = type_ is None or type_ == 'available'
+
+        try:
+            away = AwayStatus(show)
+        except ValueError:
+            away = AwayStatus.ONLINE
 
-        if not is_available and friend.is_online():
+        presences = self.client._presences
+        if build:
+            before_pres = friend.last_presence
+            _pres = Presence(
+                self.client,
+                user_id,
+                platform,
+                is_available,
+                away,
+                data
+            )
+        else:
+            # Store the raw presence which is turned into a Presence
+            # object by Client.get_presence() if it's ever needed.
+            _pres = (platform, is_available, away, data,
+                     datetime.datetime.utcnow())
+
+        before = presences.get(user_id)
+        if before.__class__ is tuple:
+            was_online = before[1]
+        else:
+            was_online = before is not None and before.available
+
+        if not is_available and was_online:
             friend._update_last_logout(datetime.datetime.now(datetime.timezone.utc))
 
             try:
-                del self.client._presences[user_id]
+                del presences[user_id]
             except KeyError:
                 pass
 
         else:
-            self.client._presences[user_id] = _pres
+            presences[user_id] = _pres
 
-        self.client.dispatch_event('friend_presence', before_pres, _pres)
+        if build:
+            return before_pres, _pres
 
     def on_stream_established(self) -> None:
+        if self._has_established:
+            self.health.reconnect_count += 1
+        self._has_established = True
+        self.health.connected = True
+
         self.client.dispatch_event('xmpp_session_establish')
 
         async def on_establish():
@@ -1486,17 +2238,16 @@ class XMPPClient:
         def on_events_recovered(*args):
             self._reconnect_recover_task = None
 
-        self._reconnect_recover_task = task = self.client.loop.create_task(
-            self.client.recover_events(
-                refresh_caches=True,
-                wait_for_close=False
-            )
+        self._reconnect_recover_task = task = self.client.recover_events(
+            refresh_caches=True,
+            wait_for_close=False
         )
         task.add_done_callback(on_events_recovered)
 
         if self.client.party is not None:
             self._last_known_party_id = self.client.party.id
 
+        self.health.connected = False
         self._is_suspended = True
         self.client.dispatch_event('xmpp_session_lost')
 
@@ -1506,6 +2257,7 @@ class XMPPClient:
             if task is not None and not task.cancelled():
                 task.cancel()
 
+        self.health.connected = False
         self._last_disconnected_at = datetime.datetime.now(datetime.timezone.utc)
         self.client.dispatch_event('xmpp_session_close')
 
@@ -1529,21 +2281,81 @@ class XMPPClient:
         client.on_stream_suspended.connect(self.on_stream_suspended)
         client.on_stream_destroyed.connect(self.on_stream_destroyed)
 
+    async def _drain(self) -> None:
+        # Don't pile up more outgoing stanzas while the socket is slow.
+        transport = self._transport
+        if transport is not None:
+            await transport.drain()
+
     async def loop_ping(self) -> None:
+        health = self.health
         while True:
-            await asyncio.sleep(60)
-            iq = aioxmpp.IQ(
-                type_=aioxmpp.IQType.GET,
-                payload=aioxmpp.ping.Ping(),
-                to=None,
+            interval = self.keepalive_interval
+
+            # Any received data proves the connection is alive so we
+            # only ping once the connection has been idle for a while.
+            idle = health.idle_time
+            if idle is not None and idle < interval:
+                await asyncio.sleep(interval - idle)
+                continue
+
+            if self.stream is None or not health.connected:
+                await asyncio.sleep(interval)
+                continue
+
+            if not await self.ping():
+                await asyncio.sleep(interval)
+
+    async def ping(self) -> bool:
+        health = self.health
+        iq = aioxmpp.IQ(
+            type_=aioxmpp.IQType.GET,
+            payload=aioxmpp.ping.Ping(),
+            to=None,
+        )
+
+        sent_at = time.time()
+        pre_time = time.perf_counter()
+        health.pings_sent += 1
+        try:
+            await asyncio.wait_for(
+                self.stream.send(iq),
+                timeout=self.keepalive_timeout
             )
-            await self.stream.send(iq)
+        except asyncio.TimeoutError:
+            health.pings_missed += 1
+
+            # The peer is only considered dead if nothing at all has been
+            # received while waiting for the reply.
+            last_recv_at = health.last_recv_at
+            if last_recv_at is None or last_recv_at < sent_at:
+                log.warning(
+                    'Keepalive ping was not answered within %.2fs. '
+                    'Reconnecting.', self.keepalive_timeout
+                )
+                transport = self._transport
+                if transport is not None:
+                    transport.fail(ConnectionError('keepalive timed out'))
+            return False
+        except (aioxmpp.errors.XMPPError, ConnectionError) as exc:
+            log.debug('Keepalive ping failed: %s', exc)
+            return False
+
+        health._record_rtt(time.perf_counter() - pre_time)
+        return True
 
     async def _run(self, future: asyncio.Future) -> None:
         async with self.xmpp_client.connected() as stream:
             self.stream = stream
-            stream.soft_timeout = datetime.timedelta(minutes=3)
-            stream.round_trip_time = datetime.timedelta(minutes=3)
+
+            # aioxmpp's own liveness check is only a fallback for our
+            # keepalive loop which detects dead connections much faster.
+            stream.soft_timeout = datetime.timedelta(
+                seconds=self.keepalive_interval * 3
+            )
+            stream.round_trip_time = datetime.timedelta(
+                seconds=self.keepalive_timeout * 3
+            )
             future.set_result(None)
 
             # Keep connection alive by awaiting a future that will
@@ -1583,6 +2395,9 @@ class XMPPClient:
         self.muc_service = self.xmpp_client.summon(aioxmpp.MUCClient)
         self.setup_callbacks()
 
+        if self.supervisor is not None:
+            self.supervisor.register(self.client)
+
         future = self.client.loop.create_future()
         self._task = asyncio.ensure_future(self._run(future))
         await future
@@ -1601,11 +2416,21 @@ class XMPPClient:
             self._task.cancel()
         if self._ping_task:
             self._ping_task.cancel()
+        if self._presence_flush_handle is not None:
+            self._presence_flush_handle.cancel()
+            self._presence_flush_handle = None
+        self._pending_presences = {}
+        self.chat_scheduler.clear()
 
         self._ping_task = None
+        self._transport = None
         self.xmpp_client = None
         self.stream = None
         self.muc_service = None
+        self.health.connected = False
+
+        if self.supervisor is not None:
+            await self.supervisor.unregister(self.client)
         log.debug('Successfully closed xmpp client')
 
         # let loop run one iteration for events to be dispatched
@@ -1690,26 +2515,51 @@ class XMPPClient:
                 pass
 
     async def send_party_message(self, content: str) -> None:
-        if self.muc_room is None:
+        room = self.muc_room
+        if room is None:
             raise PartyError('Can\'t send message. Reason: No party found')
 
-        msg = aioxmpp.Message(
-            type_=aioxmpp.MessageType.GROUPCHAT
+        async def sender(content):
+            if self.muc_room is not room:
+                raise PartyError('Can\'t send message. Reason: No party found')
+
+            msg = aioxmpp.Message(
+                type_=aioxmpp.MessageType.GROUPCHAT
+            )
+            msg.body[None] = content
+            await self._drain()
+            room.send_message(msg)
+
+        await self.chat_scheduler.send(
+            room.jid,
+            content,
+            sender,
+            rate=self.chat_scheduler.party_rate
         )
-        msg.body[None] = content
-        self.muc_room.send_message(msg)
 
     async def send_friend_message(self, jid: aioxmpp.JID,
                                   content: str) -> None:
         if self.stream is None:
             raise XMPPError('xmpp is not connected')
 
-        msg = aioxmpp.Message(
-            to=jid,
-            type_=aioxmpp.MessageType.CHAT,
+        async def sender(content):
+            if self.stream is None:
+                raise XMPPError('xmpp is not connected')
+
+            msg = aioxmpp.Message(
+                to=jid,
+                type_=aioxmpp.MessageType.CHAT,
+            )
+            msg.body[None] = content
+            await self._drain()
+            await self.stream.send(msg)
+
+        await self.chat_scheduler.send(
+            jid,
+            content,
+            sender,
+            rate=self.chat_scheduler.friend_rate
         )
-        msg.body[None] = content
-        await self.stream.send(msg)
 
     def set_presence(self, *,
                      status: Optional[Union[str, dict]] = None,
@@ -1723,7 +2573,7 @@ class XMPPClient:
                 available=True,
                 show=show
             ),
-            status=json.dumps(_status)
+            status=self.client.json_codec.dumps(_status)
         )
 
     async def send_presence(self, to: Optional[aioxmpp.JID] = None,
@@ -1746,7 +2596,8 @@ class XMPPClient:
         )
 
         if _status is not None:
-            pres.status[None] = json.dumps(_status)
+            pres.status[None] = self.client.json_codec.dumps(_status)
+        await self._drain()
         await self.stream.send(pres)
 
     async def get_presence(self, jid: aioxmpp.JID) -> Presence:
@@ -1762,4 +2613,5 @@ class XMPPClient:
             type_=aioxmpp.PresenceType.PROBE,
             to=to
         )
+        await self._drain()
         await self.stream.send(presence)
@@ -17,6 +17,9 @@ except FileNotFoundError:
     pass
 
 extras_require = {
+    'speed': [
+        'orjson>=3.0',
+    ],
     'docs': [
         'sphinxcontrib_trio==1.1.2',
         'furo==2021.4.11b34',